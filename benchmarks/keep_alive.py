@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Requests per second against a local stub server with and without persistent connections
+
+Run from the repository root:
+
+    python -m benchmarks.keep_alive --requests 2000
+"""
+import argparse
+import time
+
+from gitlab import Gitlab
+from gitlab_tests.stub_server import StubServer
+
+ROUTES = {
+    ('POST', '/api/v3/session'): (201, {}, {'id': 1, 'username': 'root', 'private_token': 'stub'}),
+    ('GET', '/api/v3/users/1'): (200, {}, {'id': 1, 'username': 'root'}),
+}
+
+
+def run(host, requests, keep_alive):
+    gitlab = Gitlab(host=host, keep_alive=keep_alive)
+    gitlab.login(user='root', password='5iveL!fe', keep_alive=keep_alive)
+
+    start = time.time()
+    for _ in range(requests):
+        gitlab.get('/users/1')
+    elapsed = time.time() - start
+
+    gitlab.transport.close()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per run')
+    args = parser.parse_args()
+
+    with StubServer(ROUTES) as server:
+        close = run(server.url, args.requests, keep_alive=False)
+        persistent = run(server.url, args.requests, keep_alive=True)
+
+    print('connection: close  {0:10.1f} req/s'.format(close))
+    print('keep-alive         {0:10.1f} req/s'.format(persistent))
+    print('speedup            {0:10.2f}x'.format(persistent / close))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Memory held by a listing of issues kept as dictionaries or as compact resources
+
+Run from the repository root:
+
+    python -m benchmarks.models_memory --issues 200000
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+from gitlab.models import Interner, Issue
+
+STATES = ('opened', 'closed', 'reopened')
+LABELS = ('bug', 'feature', 'documentation', 'security', 'performance', 'ux')
+
+
+def page(start, count, users, milestones):
+    """
+    One page of issues as the API encodes it
+
+    :param start: ID of the first issue
+    :param count: Number of issues
+    :param users: Number of distinct authors and assignees
+    :param milestones: Number of distinct milestones
+    :return: JSON bytes
+    """
+    issues = []
+    for number in range(start, start + count):
+        author = random.randrange(users)
+        milestone = random.randrange(milestones)
+        issues.append({
+            'id': number, 'iid': number, 'project_id': 1,
+            'title': 'Issue number {0}'.format(number),
+            'description': 'Steps to reproduce issue {0}'.format(number),
+            'state': random.choice(STATES),
+            'created_at': '2016-01-04T15:31:51.081Z', 'updated_at': '2016-03-04T10:11:12.000Z',
+            'labels': random.sample(LABELS, 2),
+            'milestone': {'id': milestone, 'iid': milestone, 'project_id': 1, 'title': 'v{0}.0'.format(milestone),
+                          'description': None, 'state': 'active', 'due_date': None,
+                          'created_at': '2016-01-04T15:31:39.996Z', 'updated_at': '2016-01-04T15:31:39.996Z'},
+            'author': {'id': author, 'username': 'user{0}'.format(author), 'name': 'User {0}'.format(author),
+                       'state': 'active', 'avatar_url': 'http://example.com/u/{0}.png'.format(author),
+                       'web_url': 'http://example.com/user{0}'.format(author)},
+            'assignee': None, 'user_notes_count': 1, 'upvotes': 0, 'downvotes': 0, 'due_date': None,
+            'confidential': False, 'subscribed': False,
+            'web_url': 'http://example.com/group/project/issues/{0}'.format(number),
+        })
+    return json.dumps(issues).encode('utf-8')
+
+
+def measure(pages, build):
+    """
+    Bytes still allocated once every page is decoded and kept
+
+    :param pages: List of JSON pages
+    :param build: Callable turning a decoded page into the objects to keep
+    :return: Tuple of (bytes, number of objects kept)
+    """
+    gc.collect()
+    tracemalloc.start()
+    kept = []
+    for body in pages:
+        kept.extend(build(json.loads(body.decode('utf-8'))))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--issues', type=int, default=50000, help='Issues kept in memory')
+    parser.add_argument('--users', type=int, default=200, help='Distinct authors')
+    parser.add_argument('--milestones', type=int, default=20, help='Distinct milestones')
+    args = parser.parse_args()
+
+    random.seed(0)
+    pages = [page(start, min(100, args.issues - start), args.users, args.milestones)
+             for start in range(0, args.issues, 100)]
+
+    interner = Interner()
+    dicts, count = measure(pages, lambda issues: issues)
+    models, _ = measure(pages, lambda issues: Issue.from_list(issues, interner))
+
+    print('issues             {0:10d}'.format(count))
+    print('dictionaries       {0:10.1f} MiB'.format(dicts / 1024.0 ** 2))
+    print('resources          {0:10.1f} MiB'.format(models / 1024.0 ** 2))
+    print('reduction          {0:10.2f}x'.format(float(dicts) / models))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,24 @@ pyapi-gitlab, a gitlab python wrapper for the gitlab API
 by Itxaka Serrano Garcia <itxakaserrano@gmail.com>
 Check the license on the LICENSE file
 """
-import requests
+
+import base64
+import fnmatch
+import os
+import tarfile
 
 from . import exceptions
 from .session import Session
 from .users import Users
 from .keys import Keys
+from .repository import Repository
 from .helper import deprecated, format_string
+from .memoize import invalidates, memoized
+from .stream import DEFAULT_CHUNK_SIZE, RawStream, TextContent, content_range_start, content_range_total, \
+    copy_stream, range_validator
 
 
-class Gitlab(Session, Users, Keys):
+class Gitlab(Session, Users, Keys, Repository):
     """
     Gitlab class
 
@@ -26,6 +34,23 @@ class Gitlab(Session, Users, Keys):
     :param timeout: Timeout
     :param suppress_http_error: Use :obj:`False` to unsuppress
         :class:`requests.exceptions.HTTPError` exceptions on failure
+    :param transport: :class:`gitlab.transport.Transport` to share with other clients, a new one is created
+        from the pool arguments when not given
+    :param pool_connections: Number of per host connection pools to keep
+    :param pool_maxsize: Maximum number of connections kept open per host
+    :param pool_block: Wait for a free connection when the host pool is exhausted
+    :param keep_alive: Use :obj:`False` to close the connection after every request
+    :param max_in_flight: Maximum number of concurrent requests over every client sharing the transport
+    :param retry: :class:`gitlab.retry.RetryPolicy` applied to every request, requests are not retried if not given
+    :param rate_limit: :class:`gitlab.ratelimit.RateLimiter` throttling the requests to the host, or a number of
+        requests per second to configure the limiter shared by every client of the host
+    :param cache: :class:`gitlab.cache.MemoryCache` or :class:`gitlab.cache.DiskCache` used to revalidate GET
+        requests with ``ETag`` and ``Last-Modified`` instead of downloading unchanged data again
+    :param memoize: :obj:`True` or a :class:`gitlab.memoize.Memoizer` to keep the results of user, key, project,
+        namespace and group lookups in memory for a while
+    :param blob_cache: :class:`gitlab.blobcache.BlobCache` serving repository blobs addressed by SHA from disk
+    :param json_decoder: Name of the JSON backend decoding responses (``orjson``, ``simdjson``, ``ujson`` or
+        ``json``) or a callable taking bytes, the fastest one installed is used if not given
     :return: None
     """
     def setsudo(self, user=None):
@@ -51,15 +76,16 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/owned'.format(self.projects_url), params=data, headers=self.headers,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @memoized('projects')
     def get_project(self, project):
         """
         Get info for a project identified by id or namespace/project_name
@@ -89,15 +115,16 @@ class Gitlab(Session, Users, Keys):
         :return: False if no project with that id, a dictionary with the events if found
         """
         data = {'page': page, 'per_page': per_page}
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/events'.format(self.projects_url, project_id), params=data,
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @invalidates('projects')
     def createproject(self, name, **kwargs):
         """
         Creates a new project owned by the authenticated user.
@@ -121,12 +148,12 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.post(
+        request = self.session.post(
             self.projects_url, headers=self.headers, data=data,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         elif request.status_code == 403:
             if 'Your own projects limit is 0' in request.text:
                 print(request.text)
@@ -134,6 +161,7 @@ class Gitlab(Session, Users, Keys):
         else:
             return False
 
+    @invalidates('projects')
     def editproject(self, project_id, **kwargs):
         """
         Edit an existing project.
@@ -155,7 +183,7 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}'.format(self.projects_url, project_id), headers=self.headers,
             data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -168,6 +196,7 @@ class Gitlab(Session, Users, Keys):
         else:
             return False
 
+    @invalidates('projects')
     def shareproject(self, project_id, group_id, group_access):
         """
         Allow to share project with group.
@@ -179,12 +208,13 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'id': project_id, 'group_id': group_id, 'group_access': group_access}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/share'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl)
 
         return request.status_code == 201
 
+    @invalidates('projects')
     def delete_project(self, id):
         """
         Delete a project from the Gitlab server
@@ -218,6 +248,7 @@ class Gitlab(Session, Users, Keys):
         self.delete_project(project_id)
         return True
 
+    @invalidates('projects')
     def createprojectuser(self, user_id, name, **kwargs):
         """
         Creates a new project owned by the specified user. Available only for admins.
@@ -241,7 +272,7 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/user/{1}'.format(self.projects_url, user_id), headers=self.headers,
             data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -266,12 +297,12 @@ class Gitlab(Session, Users, Keys):
         if query:
             data['query'] = query
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/members'.format(self.projects_url, project_id),
             params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -295,7 +326,7 @@ class Gitlab(Session, Users, Keys):
 
         data = {'id': project_id, 'user_id': user_id, 'access_level': access_level}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/members'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -322,7 +353,7 @@ class Gitlab(Session, Users, Keys):
             access_level = 10
         data = {'id': project_id, 'user_id': user_id, 'access_level': access_level}
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/members/{2}'.format(self.projects_url, project_id, user_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -338,7 +369,7 @@ class Gitlab(Session, Users, Keys):
         :param user_id: user id
         :return: always true
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/members/{2}'.format(self.projects_url, project_id, user_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -354,12 +385,12 @@ class Gitlab(Session, Users, Keys):
         :return: the hooks
         """
         data = {'page': page, 'per_page': per_page}
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/hooks'.format(self.projects_url, project_id), params=data,
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -370,12 +401,12 @@ class Gitlab(Session, Users, Keys):
         :param hook_id: hook id
         :return: the hook
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/hooks/{2}'.format(self.projects_url, project_id, hook_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -396,12 +427,12 @@ class Gitlab(Session, Users, Keys):
             'tag_push_events': int(bool(tag_push)),
         }
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/hooks'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -424,7 +455,7 @@ class Gitlab(Session, Users, Keys):
             'tag_push_events': int(bool(tag_push)),
         }
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/hooks/{2}'.format(self.projects_url, project_id, hook_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -441,7 +472,7 @@ class Gitlab(Session, Users, Keys):
         :param hook_id: hook id
         :return: True if success
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/hooks/{2}'.format(self.projects_url, project_id, hook_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -460,12 +491,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             self.hook_url, params=data, headers=self.headers,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -478,7 +509,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {"url": url}
 
-        request = requests.post(
+        request = self.session.post(
             self.hook_url, headers=self.headers, data=data,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -496,12 +527,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {"id": hook_id}
 
-        request = requests.get(
+        request = self.session.get(
             self.hook_url, data=data, headers=self.headers,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -514,7 +545,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {"id": hook_id}
 
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}'.format(self.hook_url, hook_id), data=data,
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -530,12 +561,12 @@ class Gitlab(Session, Users, Keys):
         :param project_id: project id
         :return: the branches
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/branches'.format(self.projects_url, project_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -547,14 +578,14 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch id
         :return: the branch
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/branches/{2}'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl,
             auth=self.auth, timeout=self.timeout
         )
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -569,12 +600,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {"id": project_id, "branch_name": branch, "ref": ref}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/repository/branches'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -587,7 +618,7 @@ class Gitlab(Session, Users, Keys):
         :return: True if success, False if not
         """
 
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/repository/branches/{2}'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -604,7 +635,7 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch id
         :return: True if success
         """
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/repository/branches/{2}/protect'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -621,7 +652,7 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch id
         :return: true if success
         """
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/repository/branches/{2}/unprotect'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -642,7 +673,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'id': project_id, 'forked_from_id': from_project_id}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/fork/{2}'.format(self.projects_url, project_id, from_project_id),
             headers=self.headers, data=data, verify=self.verify_ssl,
             auth=self.auth, timeout=self.timeout)
@@ -659,7 +690,7 @@ class Gitlab(Session, Users, Keys):
         :param project_id: project id
         :return: true if success
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/fork'.format(self.projects_url, project_id),
             headers=self.headers, verify=self.verify_ssl,
             auth=self.auth, timeout=self.timeout)
@@ -669,6 +700,7 @@ class Gitlab(Session, Users, Keys):
         else:
             return False
 
+    @invalidates('projects')
     def createfork(self, project_id):
         """
         Forks a project into the user namespace of the authenticated user.
@@ -677,7 +709,7 @@ class Gitlab(Session, Users, Keys):
         :return: True if succeed
         """
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/fork/{1}'.format(self.projects_url, project_id),
             timeout=self.timeout, verify=self.verify_ssl)
 
@@ -696,37 +728,33 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/api/v3/issues'.format(self.host),
             params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
-    def getprojectissues(self, project_id, page=1, per_page=20, **kwargs):
+    def getprojectissues(self, project_id, page=1, per_page=20, stream=False, **kwargs):
         """
         Return a list of issues for project id.
 
         :param: project_id: The id for the project.
         :param page: Page number
         :param per_page: Records per page
+        :param stream: Return a generator decoding each issue as soon as it is received instead of a list
         :param kwargs: Extra data to send
         :return: list of issues
         """
-        kwargs['page'] = page
-        kwargs['per_page'] = per_page
-        data = kwargs
+        url, data = self._project_issues_request(project_id, page, per_page, **kwargs)
 
-        request = requests.get(
-            '{0}/{1}/issues'.format(self.projects_url, project_id),
-            params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
+        request = self.session.get(
+            url, stream=stream, params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth,
+            timeout=self.timeout)
 
-        if request.status_code == 200:
-            return request.json()
-        else:
-            return False
+        return self._listing_result(request, stream)
 
     def getprojectissue(self, project_id, issue_id):
         """
@@ -736,12 +764,12 @@ class Gitlab(Session, Users, Keys):
         :param issue_id: issue id
         :return: the issue
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/issues/{2}'.format(self.projects_url, project_id, issue_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -756,12 +784,12 @@ class Gitlab(Session, Users, Keys):
         data = {'id': id, 'title': title}
         if kwargs:
             data.update(kwargs)
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/issues'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -776,12 +804,12 @@ class Gitlab(Session, Users, Keys):
         data = {'id': project_id, 'issue_id': issue_id}
         if kwargs:
             data.update(kwargs)
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/issues/{2}'.format(self.projects_url, project_id, issue_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -796,12 +824,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/milestones'.format(self.projects_url, project_id), params=data,
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -813,12 +841,12 @@ class Gitlab(Session, Users, Keys):
         :param milestone_id: milestone id
         :return: dict with the new milestone
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/milestones/{2}'.format(self.projects_url, project_id, milestone_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -838,12 +866,12 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/milestones'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -864,12 +892,12 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/milestones/{2}'.format(self.projects_url, project_id, milestone_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -883,12 +911,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/milestones/{2}/issues'.format(self.projects_url, project_id, milestone_id),
             params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -930,13 +958,13 @@ class Gitlab(Session, Users, Keys):
         :param project_id: project id
         :return: the keys in a dictionary if success, false if not
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/keys'.format(self.projects_url, project_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout
         )
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -948,12 +976,12 @@ class Gitlab(Session, Users, Keys):
         :param key_id: key id
         :return: the key in a dict if success, false if not
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/keys/{2}'.format(self.projects_url, project_id, key_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -968,12 +996,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'id': project_id, 'title': title, 'key': key}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/keys'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -985,7 +1013,7 @@ class Gitlab(Session, Users, Keys):
         :param key_id: key id to delete
         :return: true if success, false if not
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/keys/{2}'.format(self.projects_url, project_id, key_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -994,6 +1022,7 @@ class Gitlab(Session, Users, Keys):
         else:
             return False
 
+    @invalidates('groups', 'namespaces')
     def creategroup(self, name, path, **kwargs):
         """
         Creates a new group
@@ -1008,16 +1037,17 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.post(
+        request = self.session.post(
             self.groups_url, data=data, headers=self.headers,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
-            msg = request.json()['message']
+            msg = self.decode_json(request)['message']
             raise exceptions.HttpError(msg)
 
+    @memoized('groups')
     def getgroups(self, group_id=None, page=1, per_page=20):
         """
         Retrieve group information
@@ -1029,15 +1059,16 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}'.format(self.groups_url, group_id if group_id else ''),
             params=data, headers=self.headers, timeout=self.timeout, verify=self.verify_ssl, auth=self.auth)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @invalidates('projects', 'groups')
     def moveproject(self, group_id, project_id):
         """
         Move a given project into a given group
@@ -1046,16 +1077,16 @@ class Gitlab(Session, Users, Keys):
         :param project_id: ID of the project to be moved
         :return: dict of the updated project
         """
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/projects/{2}'.format(self.groups_url, group_id, project_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
-    def getmergerequests(self, project_id, page=1, per_page=20, state=None):
+    def getmergerequests(self, project_id, page=1, per_page=20, state=None, stream=False):
         """
         Get all the merge requests for a project.
 
@@ -1063,18 +1094,16 @@ class Gitlab(Session, Users, Keys):
         :param page: Page Number
         :param per_page: Records per page
         :param state: Passes merge request state to filter them by it
+        :param stream: Return a generator decoding each merge request as soon as it is received instead of a list
         :return: list with all the merge requests
         """
-        data = {'page': page, 'per_page': per_page, 'state': state}
+        url, data = self._merge_requests_request(project_id, page, per_page, state)
 
-        request = requests.get(
-            '{0}/{1}/merge_requests'.format(self.projects_url, project_id),
-            params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
+        request = self.session.get(
+            url, stream=stream, params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth,
+            timeout=self.timeout)
 
-        if request.status_code == 200:
-            return request.json()
-        else:
-            return False
+        return self._listing_result(request, stream)
 
     def getmergerequest(self, project_id, mergerequest_id):
         """
@@ -1084,12 +1113,12 @@ class Gitlab(Session, Users, Keys):
         :param mergerequest_id: ID of the merge request
         :return: dict of the merge request
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/merge_request/{2}'.format(self.projects_url, project_id, mergerequest_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1105,12 +1134,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/merge_request/{2}/comments'.format(self.projects_url, project_id, mergerequest_id),
             params=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1122,12 +1151,12 @@ class Gitlab(Session, Users, Keys):
         :param mergerequest_id: ID of the merge request
         :return: information about the merge request including files and changes
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/merge_request/{2}/changes'.format(self.projects_url, project_id, mergerequest_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1151,12 +1180,12 @@ class Gitlab(Session, Users, Keys):
             'target_project_id': target_project_id
         }
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/merge_requests'.format(self.projects_url, project_id),
             data=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1178,12 +1207,12 @@ class Gitlab(Session, Users, Keys):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/merge_request/{2}'.format(self.projects_url, project_id, mergerequest_id),
             data=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1199,12 +1228,12 @@ class Gitlab(Session, Users, Keys):
 
         data = {'merge_commit_message': merge_commit_message}
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/merge_request/{2}/merge'.format(self.projects_url, project_id, mergerequest_id),
             data=data, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1217,7 +1246,7 @@ class Gitlab(Session, Users, Keys):
         :param note: Text of comment
         :return: True if success
         """
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/merge_request/{2}/comments'.format(self.projects_url, project_id, mergerequest_id),
             data={'note': note}, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1232,12 +1261,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/snippets'.format(self.projects_url, project_id), params=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1249,12 +1278,12 @@ class Gitlab(Session, Users, Keys):
         :param snippet_id: snippet id
         :return: dictionary
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/snippets/{2}'.format(self.projects_url, project_id, snippet_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1265,7 +1294,7 @@ class Gitlab(Session, Users, Keys):
         :param project_id: project id to create the snippet under
         :param title: title of the snippet
         :param file_name: filename for the snippet
-        :param code: content of the snippet
+        :param code: content of the snippet, or a file object or iterator of text or UTF-8 bytes to stream
         :param visibility_level: snippets can be either private (0), internal(10) or public(20)
         :return: True if correct, false if failed
         """
@@ -1273,13 +1302,14 @@ class Gitlab(Session, Users, Keys):
 
         if visibility_level in [0, 10, 20]:
             data['visibility_level'] = visibility_level
+        data, headers = self._upload_body(data, 'code', TextContent)
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/snippets'.format(self.projects_url, project_id),
-            data=data, verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
+            data=data, verify=self.verify_ssl, auth=self.auth, headers=headers, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1291,12 +1321,12 @@ class Gitlab(Session, Users, Keys):
         :param snippet_id: snippet id
         :return: the content of the snippet
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/snippets/{2}/raw'.format(self.projects_url, project_id, snippet_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1307,7 +1337,7 @@ class Gitlab(Session, Users, Keys):
         :param snippet_id: snippet id
         :return: True if success
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/snippets/{2}'.format(self.projects_url, project_id, snippet_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1324,12 +1354,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/branches'.format(self.projects_url, project_id), params=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1341,14 +1371,14 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch
         :return: dict of the branch
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/branches/{2}'.format(self.projects_url, project_id, branch),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         elif request.status_code == 404:
-            if request.json()['message'] == "404 Branch does not exist Not Found":
+            if self.decode_json(request)['message'] == "404 Branch does not exist Not Found":
                 # In the future we should raise an exception here
                 return False
         else:
@@ -1363,12 +1393,12 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch to protect
         :return: dict with the branch
         """
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/repository/branches/{2}/protect'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1381,12 +1411,12 @@ class Gitlab(Session, Users, Keys):
         :param branch: branch to unprotect
         :return: dict with the branch
         """
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/repository/branches/{2}/unprotect'.format(self.projects_url, project_id, branch),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return
 
@@ -1400,12 +1430,12 @@ class Gitlab(Session, Users, Keys):
         :return: list with all the tags
         """
         data = {'page': page, 'per_page': per_page}
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/tags'.format(self.projects_url, project_id), params=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1421,12 +1451,12 @@ class Gitlab(Session, Users, Keys):
         """
 
         data = {'id': project_id, 'tag_name': tag_name, 'ref': ref, 'message': message}
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/repository/tags'.format(self.projects_url, project_id), data=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1463,7 +1493,7 @@ class Gitlab(Session, Users, Keys):
             'line_type': 'new'
         }
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/repository/commits/{2}/comments'.format(self.projects_url, project_id, sha),
             headers=self.headers, data=data, verify=self.verify_ssl)
 
@@ -1472,7 +1502,7 @@ class Gitlab(Session, Users, Keys):
         else:
             return False
 
-    def getrepositorycommits(self, project_id, ref_name=None, page=1, per_page=20):
+    def getrepositorycommits(self, project_id, ref_name=None, page=1, per_page=20, stream=False):
         """
         Get a list of repository commits in a project.
 
@@ -1480,6 +1510,7 @@ class Gitlab(Session, Users, Keys):
         :param ref_name: The name of a repository branch or tag or if not given the default branch
         :param page: Page number
         :param per_page: Records per page
+        :param stream: Return a generator decoding each commit as soon as it is received instead of a list
         :return: list of commits
         """
         data = {'page': page, 'per_page': per_page}
@@ -1487,14 +1518,15 @@ class Gitlab(Session, Users, Keys):
         if ref_name is not None:
             data.update({'ref_name': ref_name})
 
-        request = requests.get(
-            '{0}/{1}/repository/commits'.format(self.projects_url, project_id),
+        request = self.session.get(
+            '{0}/{1}/repository/commits'.format(self.projects_url, project_id), stream=stream,
             verify=self.verify_ssl, auth=self.auth, params=data,
             headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.iter_json(request) if stream else self.decode_json(request)
         else:
+            request.close()
             return False
 
     def getrepositorycommit(self, project_id, sha1):
@@ -1505,12 +1537,12 @@ class Gitlab(Session, Users, Keys):
         :param sha1: The commit hash or name of a repository branch or tag
         :return: dict of commit
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/commits/{2}'.format(self.projects_url, project_id, sha1),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1522,12 +1554,12 @@ class Gitlab(Session, Users, Keys):
         :param sha1: The name of a repository branch or tag or if not given the default branch
         :return: dict with the diff
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/commits/{2}/diff'.format(self.projects_url, project_id, sha1),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1540,58 +1572,104 @@ class Gitlab(Session, Users, Keys):
         :param ref_name: The name of a repository branch or tag or if not given the default branch
         :return: dict with the tree
         """
-        data = {}
+        url, data = self._repository_tree_request(project_id, **kwargs)
 
-        if kwargs:
-            data.update(kwargs)
+        request = self.session.get(
+            url, params=data, verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
-        request = requests.get(
-            '{0}/{1}/repository/tree'.format(self.projects_url, project_id), params=data,
-            verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
-
-        if request.status_code == 200:
-            return request.json()
-        else:
-            return False
+        return self._listing_result(request)
 
     def getrawfile(self, project_id, sha1, filepath):
         """
         Get the raw file contents for a file by commit SHA and path.
 
+        The blob cache of the client is used when `sha1` is a full commit SHA.
+
         :param project_id: The ID of a project
         :param sha1: The commit or branch name
         :param filepath: The path the file
         :return: raw file contents
         """
-        data = {'filepath': filepath}
+        _, content = self._cached_file(sha1, filepath)
+        if content is not None:
+            return content
 
-        request = requests.get(
-            '{0}/{1}/repository/blobs/{2}'.format(self.projects_url, project_id, sha1),
-            params=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout,
+        url, data = self._raw_file_request(project_id, sha1, filepath)
+
+        request = self.session.get(
+            url, params=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout,
             headers=self.headers)
 
-        if request.status_code == 200:
-            return request.content
-        else:
-            return False
+        return self._raw_file_result(request, sha1, filepath)
 
     def getrawblob(self, project_id, sha1):
         """
         Get the raw file contents for a blob by blob SHA.
 
+        The blob cache of the client is used when `sha1` is a full blob SHA.
+
         :param project_id: The ID of a project
         :param sha1: the commit sha
         :return: raw blob
         """
-        request = requests.get(
+        content = self._cached_blob(sha1)
+        if content is not None:
+            return content
+
+        request = self.session.get(
             '{0}/{1}/repository/raw_blobs/{2}'.format(self.projects_url, project_id, sha1),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
+            self._cache_blob(sha1, request.content)
             return request.content
         else:
             return False
 
+    def getrawfile_stream(self, project_id, sha1, filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Stream the raw file contents for a file by commit SHA and path.
+
+        >>> with gitlab.getrawfile_stream(1, 'master', 'assets/video.mp4') as raw:
+        ...     raw.copy_to(open('/tmp/video.mp4', 'wb'))
+
+        :param project_id: The ID of a project
+        :param sha1: The commit or branch name
+        :param filepath: The path the file
+        :param chunk_size: Size of the chunks yielded when iterating over the stream
+        :return: :class:`gitlab.stream.RawStream` over the raw file contents or False
+        """
+        url, data = self._raw_file_request(project_id, sha1, filepath)
+
+        request = self.session.get(
+            url, params=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout,
+            headers=self.headers, stream=True)
+
+        if request.status_code == 200:
+            return RawStream(request, chunk_size=chunk_size)
+        else:
+            request.close()
+            return False
+
+    def getrawblob_stream(self, project_id, sha1, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Stream the raw file contents for a blob by blob SHA.
+
+        :param project_id: The ID of a project
+        :param sha1: the commit sha
+        :param chunk_size: Size of the chunks yielded when iterating over the stream
+        :return: :class:`gitlab.stream.RawStream` over the raw blob or False
+        """
+        request = self.session.get(
+            '{0}/{1}/repository/raw_blobs/{2}'.format(self.projects_url, project_id, sha1),
+            verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout, stream=True)
+
+        if request.status_code == 200:
+            return RawStream(request, chunk_size=chunk_size)
+        else:
+            request.close()
+            return False
+
     def getcontributors(self, project_id, page=1, per_page=20):
         """
         Get repository contributors list
@@ -1603,12 +1681,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/contributors'.format(self.projects_url, project_id), params=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1624,13 +1702,13 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'from': from_id, 'to': to_id}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/compare'.format(self.projects_url, project_id),
             params=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout,
             headers=self.headers)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1644,41 +1722,143 @@ class Gitlab(Session, Users, Keys):
         :return: list of results
         """
         data = {'page': page, 'per_page': per_page}
-        request = requests.get("{0}/{1}".format(self.search_url, search), params=data,
-                               verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
+        request = self.session.get("{0}/{1}".format(self.search_url, search), params=data,
+                                   verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
-    def getfilearchive(self, project_id, filepath=None):
+    def getfilearchive(self, project_id, filepath=None, chunk_size=DEFAULT_CHUNK_SIZE, resume=False, progress=None):
         """
         Get an archive of the repository
 
+        The archive is streamed to the file in chunks, so memory use does not depend on the size of the archive.
+
+        >>> gitlab.getfilearchive(1, '/tmp/repository.tar.gz', resume=True,
+        ...                       progress=lambda done, total: print(done, total))
+
         :param project_id: project id
-        :param filepath: path to save the file to
+        :param filepath: path to save the file to, or a file-like object with a ``write`` method. The name sent by
+            the server is used if not given
+        :param chunk_size: Bytes read from the connection at a time
+        :param resume: Continue a partial download of the same archive at `filepath` with a ``Range`` request. The
+            ``ETag`` or ``Last-Modified`` of the archive is kept in `filepath` + ``.validator`` and sent in
+            ``If-Range``, so the file is written again from the start if the archive changed since, if the server
+            does not support ranges or if there is no validator
+        :param progress: Callable receiving the number of bytes saved so far and the total size, :obj:`None` if
+            unknown, after every chunk
         :return: True if the file was saved to the filepath
         """
+        sink = filepath if hasattr(filepath, 'write') else None
         if not filepath:
             filepath = ''
 
-        request = requests.get(
-            '{0}/{1}/repository/archive'.format(self.projects_url, project_id),
-            verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
+        offset = 0
+        validator = None
+        if resume and sink is None and filepath and os.path.isfile(filepath):
+            try:
+                with open(filepath + '.validator', 'r') as handle:
+                    validator = handle.read().strip()
+            except (IOError, OSError):
+                pass
+            if validator:
+                offset = os.path.getsize(filepath)
+
+        while True:
+            headers = dict(self.headers)
+            if offset:
+                headers['Range'] = 'bytes={0}-'.format(offset)
+                headers['If-Range'] = validator
+
+            request = self.session.get(
+                '{0}/{1}/repository/archive'.format(self.projects_url, project_id), stream=True,
+                verify=self.verify_ssl, auth=self.auth, headers=headers, timeout=self.timeout)
+
+            if request.status_code == 416 and offset:
+                request.close()
+                if content_range_total(request.headers) == offset:
+                    return True
+                offset = 0
+                continue
+            if request.status_code == 206 and offset and content_range_start(request.headers) != offset:
+                request.close()
+                offset = 0
+                continue
+            break
+
+        try:
+            if request.status_code not in (200, 206):
+                msg = self.decode_json(request)['message']
+                raise exceptions.HttpError(msg)
+
+            if request.status_code == 200:
+                offset = 0
+
+            if sink is not None:
+                copy_stream(request, sink, chunk_size=chunk_size, progress=progress)
+                return True
 
-        if request.status_code == 200:
             if filepath == "":
                 filepath = request.headers['content-disposition'].split(';')[1].split('=')[1].strip('"')
-            with open(filepath, 'wb') as filesave:
-                filesave.write(request.content)
+            if resume:
+                if request.status_code == 200 or range_validator(request.headers):
+                    validator = range_validator(request.headers)
+                if validator:
+                    with open(filepath + '.validator', 'w') as handle:
+                        handle.write(validator)
+                elif os.path.isfile(filepath + '.validator'):
+                    os.remove(filepath + '.validator')
+            with open(filepath, 'ab' if offset else 'wb') as filesave:
+                copy_stream(request, filesave, chunk_size=chunk_size, progress=progress, offset=offset)
                 # TODO: Catch oserror exceptions as no permissions and such
                 # TODO: change the filepath to a path and keep always the filename?
             return True
-        else:
-            msg = request.json()['message']
-            raise exceptions.HttpError(msg)
+        finally:
+            request.close()
+
+    def getarchivemembers(self, project_id, patterns=None, sha=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Extract the archive of the repository as it downloads, without writing it to disk
+
+        The response goes straight through the decompressor and files are yielded as soon as they arrive. Members
+        not matching `patterns` are read past without being kept. Each file object is only readable until the
+        next member is requested.
+
+        >>> for path, fileobj in gitlab.getarchivemembers(1, patterns=['*.py', 'setup.cfg']):
+        ...     scan(path, fileobj.read())
+
+        :param project_id: project id
+        :param patterns: Glob patterns of :mod:`fnmatch` the paths must match one of, every file if not given
+        :param sha: The commit SHA or branch name to archive, the default branch if not given
+        :param chunk_size: Bytes read from the connection at a time
+        :return: Generator of (path, file object) tuples, paths are relative to the root of the repository
+        """
+        params = {'sha': sha} if sha else None
+
+        request = self.session.get(
+            '{0}/{1}/repository/archive'.format(self.projects_url, project_id), params=params, stream=True,
+            verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
+        try:
+            if request.status_code != 200:
+                msg = self.decode_json(request)['message']
+                raise exceptions.HttpError(msg)
+
+            with tarfile.open(fileobj=RawStream(request, chunk_size=chunk_size), mode='r|*',
+                              bufsize=chunk_size) as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+                    if patterns and not any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns):
+                        continue
+                    yield path, archive.extractfile(member)
+        finally:
+            request.close()
+
+    @invalidates('groups', 'namespaces')
     def deletegroup(self, group_id):
         """
         Deletes an group by ID
@@ -1686,7 +1866,7 @@ class Gitlab(Session, Users, Keys):
         :param group_id: id of the group to delete
         :return: True if it deleted, False if it couldn't. False could happen for several reasons, but there isn't a good way of differentiating them
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}'.format(self.groups_url, group_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1703,12 +1883,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/members'.format(self.groups_url, group_id), params=data,
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1736,7 +1916,7 @@ class Gitlab(Session, Users, Keys):
 
         data = {'id': group_id, 'user_id': user_id, 'access_level': access_level}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/members'.format(self.groups_url, group_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1767,7 +1947,7 @@ class Gitlab(Session, Users, Keys):
 
         data = {'id': group_id, 'user_id': user_id, 'access_level': access_level}
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/members/{2}'.format(self.groups_url, group_id, user_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1781,7 +1961,7 @@ class Gitlab(Session, Users, Keys):
         :param user_id: user id
         :return: always true
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/members/{2}'.format(self.groups_url, group_id, user_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -1800,7 +1980,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'id': group_id, 'cn': cn, 'group_access': group_access, 'provider': provider}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/ldap_group_links'.format(self.groups_url, group_id),
             headers=self.headers, data=data, verify=self.verify_ssl)
 
@@ -1819,7 +1999,7 @@ class Gitlab(Session, Users, Keys):
             base=self.groups_url, gid=group_id, cn=cn,
             provider=('{0}/'.format(provider) if provider else ''))
 
-        request = requests.delete(url, headers=self.headers, verify=self.verify_ssl)
+        request = self.session.delete(url, headers=self.headers, verify=self.verify_ssl)
 
         return request.status_code == 200
 
@@ -1834,12 +2014,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/issues/{2}/notes'.format(self.projects_url, project_id, issue_id), params=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1852,12 +2032,12 @@ class Gitlab(Session, Users, Keys):
         :param note_id: Note ID
         :return: Json or False
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/issues/{2}/notes/{3}'.format(self.projects_url, project_id, issue_id, note_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1870,12 +2050,12 @@ class Gitlab(Session, Users, Keys):
         :return: Json or False
         """
         data = {'body': content}
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/issues/{2}/notes'.format(self.projects_url, project_id, issue_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, data=data, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1890,12 +2070,12 @@ class Gitlab(Session, Users, Keys):
         :return: Json or False
         """
         data = {'page': page, 'per_page': per_page}
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/snippets/{2}/notes'.format(self.projects_url, project_id, snippet_id),
             params=data, verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1908,12 +2088,12 @@ class Gitlab(Session, Users, Keys):
         :param note_id: Note ID
         :return: Json or False
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/snippets/{2}/notes/{3}'.format(self.projects_url, project_id, snippet_id, note_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1928,12 +2108,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'body': content}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/snippets/{2}/notes'.format(self.projects_url, project_id, snippet_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, data=data, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1949,12 +2129,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'page': page, 'per_page': per_page}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/merge_requests/{2}/notes'.format(self.projects_url, project_id, merge_request_id),
             params=data, verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1967,12 +2147,12 @@ class Gitlab(Session, Users, Keys):
         :param note_id: Note ID
         :return: Json or False
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/merge_requests/{2}/notes/{3}'.format(self.projects_url, project_id, merge_request_id, note_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -1987,12 +2167,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'body': content}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/merge_requests/{2}/notes'.format(self.projects_url, project_id, merge_request_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, data=data, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -2000,10 +2180,13 @@ class Gitlab(Session, Users, Keys):
         """
         Creates a new file in the repository
 
+        A file object or an iterator given as `content` is read while the request is sent and uploaded base64
+        encoded, whatever `encoding` is, so large files are not held in memory.
+
         :param project_id: project id
         :param file_path: Full path to new file. Ex. lib/class.rb
         :param branch_name: The name of branch
-        :param content: File content
+        :param content: File content, or a binary file object or iterator of bytes to stream
         :param commit_message: Commit message
         :return: true if success, false if not
         """
@@ -2014,10 +2197,11 @@ class Gitlab(Session, Users, Keys):
             'content': content,
             'commit_message': commit_message
         }
+        data, headers = self._upload_body(data)
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/repository/files'.format(self.projects_url, project_id),
-            verify=self.verify_ssl, auth=self.auth, headers=self.headers, data=data, timeout=self.timeout)
+            verify=self.verify_ssl, auth=self.auth, headers=headers, data=data, timeout=self.timeout)
 
         return request.status_code == 201
 
@@ -2025,10 +2209,13 @@ class Gitlab(Session, Users, Keys):
         """
         Updates an existing file in the repository
 
+        A file object or an iterator given as `content` is read while the request is sent and uploaded base64
+        encoded, so large files are not held in memory.
+
         :param project_id: project id
         :param file_path: Full path to new file. Ex. lib/class.rb
         :param branch_name: The name of branch
-        :param content: File content
+        :param content: File content, or a binary file object or iterator of bytes to stream
         :param commit_message: Commit message
         :return: true if success, false if not
         """
@@ -2038,10 +2225,11 @@ class Gitlab(Session, Users, Keys):
             'content': content,
             'commit_message': commit_message
         }
+        data, headers = self._upload_body(data)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/repository/files'.format(self.projects_url, project_id),
-            headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
+            headers=headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         return request.status_code == 200
 
@@ -2050,19 +2238,29 @@ class Gitlab(Session, Users, Keys):
         Allows you to receive information about file in repository like name, size, content.
         Note that file content is Base64 encoded.
 
+        The blob cache of the client is used when `ref` is a full commit SHA.
+
         :param project_id: project_id
         :param file_path: Full path to file. Ex. lib/class.rb
         :param ref: The name of branch, tag or commit
         :return:
         """
+        info, content = self._cached_file(ref, file_path)
+        if info is not None and 'file_name' in info:
+            return dict(info, content=base64.b64encode(content).decode('ascii'), encoding='base64')
+
         data = {'file_path': file_path, 'ref': ref}
 
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/repository/files'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            result = self.decode_json(request)
+            if self.blob_cache is not None and result.get('encoding') == 'base64':
+                info = dict((key, value) for key, value in result.items() if key not in ('content', 'encoding'))
+                self._cache_file(ref, file_path, base64.b64decode(result['content']), info)
+            return result
         else:
             return False
 
@@ -2082,7 +2280,7 @@ class Gitlab(Session, Users, Keys):
             'commit_message': commit_message
         }
 
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/repository/files'.format(self.projects_url, project_id),
             headers=self.headers, data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -2099,7 +2297,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'token': token, 'project_url': project_url}
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/services/gitlab-ci'.format(self.projects_url, project_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, data=data, timeout=self.timeout)
 
@@ -2114,7 +2312,7 @@ class Gitlab(Session, Users, Keys):
         :param project_url: Project URL
         :return: true if success, false if not
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/services/gitlab-ci'.format(self.projects_url, project_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -2127,12 +2325,12 @@ class Gitlab(Session, Users, Keys):
         :param project_id: The ID of a project
         :return: list of the labels
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}/labels'.format(self.projects_url, project_id),
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -2147,12 +2345,12 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'name': name, 'color': color}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/labels'.format(self.projects_url, project_id), data=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -2166,7 +2364,7 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'name': name}
 
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}/labels'.format(self.projects_url, project_id), data=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
@@ -2183,15 +2381,16 @@ class Gitlab(Session, Users, Keys):
         """
         data = {'name': name, 'new_name': new_name, 'color': color}
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/labels'.format(self.projects_url, project_id), data=data,
             verify=self.verify_ssl, auth=self.auth, headers=self.headers, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @memoized('namespaces')
     def getnamespaces(self, search=None, page=1, per_page=20):
         """
         Return a namespace list
@@ -2206,10 +2405,10 @@ class Gitlab(Session, Users, Keys):
         if search:
             data['search'] = search
 
-        request = requests.get(
+        request = self.session.get(
             self.namespaces_url, params=data, headers=self.headers, verify=self.verify_ssl)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio client for the Gitlab API, requires Python 3.7+ and the ``aiohttp`` package
+(``pip install pyapi-gitlab[async]``)
+
+:class:`AsyncGitlab` shares its URL construction and error handling with :class:`gitlab.Gitlab`: responses are
+checked by the same :func:`gitlab.base.Base.success_or_raise`, so ``suppress_http_error``, ``default_response`` and
+``return_meta`` behave identically.
+
+>>> async with AsyncGitlab(host='http://localhost:10080', token='secret') as gitlab:
+...     project = await gitlab.get_project('group/project')
+...     async for issue in AsyncGitlab.getall(gitlab.getprojectissues, project_id=project['id']):
+...         print(issue['title'])
+"""
+import asyncio
+import contextvars
+from contextlib import contextmanager
+
+import aiohttp
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+from requests.models import Response as RequestsResponse
+from requests.structures import CaseInsensitiveDict
+from six.moves.urllib.parse import urlencode
+
+from .base import Base
+from .cache import cache_key, entry_from_response, revalidated
+from .helper import format_string
+from .meta import Meta
+from .ratelimit import host_key
+from .retry import current_policy
+
+_last_headers = contextvars.ContextVar('last_headers', default=None)
+_retry_policy = contextvars.ContextVar('retry_policy')
+
+
+class AsyncTransport(object):
+    """
+    Pooled keep-alive transport of :class:`AsyncGitlab`, built on :class:`aiohttp.ClientSession`
+
+    The session is only opened on the first request because aiohttp expects it to be created inside the running
+    event loop. aiohttp always waits for a free connection once the pool is exhausted, so ``pool_block`` is only
+    accepted for parity with :class:`gitlab.transport.Transport`.
+
+    :param pool_connections: Number of hosts to keep connections to
+    :param pool_maxsize: Maximum number of connections kept open per host
+    :param pool_block: Ignored
+    :param keep_alive: Use :obj:`False` to close the connection after every request
+    :param max_in_flight: Maximum number of concurrent requests, defaults to ``pool_connections`` times
+        ``pool_maxsize``
+    :param retry: :class:`gitlab.retry.RetryPolicy` applied to every request, requests are not retried if not
+        given
+    :param cache: Cache backend of :mod:`gitlab.cache` used to revalidate GET requests, nothing is cached if not
+        given
+    :return: None
+    """
+    def __init__(self, pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE,
+                 pool_block=DEFAULT_POOLBLOCK, keep_alive=True, max_in_flight=None, retry=None, cache=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_in_flight = max_in_flight
+        self.retry = retry
+        self.cache = cache
+        self.rate_limiters = {}
+        self.session = None
+
+    def client(self):
+        """
+        Get the :class:`aiohttp.ClientSession`, opening it if needed
+
+        :return: :class:`aiohttp.ClientSession`
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_in_flight or self.pool_connections * self.pool_maxsize,
+                limit_per_host=self.pool_maxsize,
+                force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    def limit(self, host, limiter):
+        """
+        Throttle the requests sent to a host, see :func:`gitlab.transport.Transport.limit`
+
+        :param host: Host or URL of the Gitlab server
+        :param limiter: :class:`gitlab.ratelimit.RateLimiter`, or :obj:`None` to stop throttling
+        :return: None
+        """
+        if limiter is None:
+            self.rate_limiters.pop(host_key(host), None)
+        else:
+            self.rate_limiters[host_key(host)] = limiter
+
+    async def close(self):
+        """
+        Close every pooled connection
+
+        :return: None
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncGitlab(Base):
+    """
+    asyncio Gitlab class
+
+    Takes the same arguments as :class:`gitlab.Gitlab`, a :class:`AsyncTransport` can be shared between clients
+    through ``transport``.
+
+    :param host: host of gitlab
+    :param token: token
+    :param verify_ssl: Weather or not to verify the SSL cert
+    :param auth: Authentication
+    :param timeout: Timeout
+    :param suppress_http_error: Use :obj:`False` to unsuppress
+        :class:`requests.exceptions.HTTPError` exceptions on failure
+    :return: None
+    """
+    transport_class = AsyncTransport
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connections of the transport
+
+        :return: None
+        """
+        await self.transport.close()
+
+    async def request(self, method, url, params=None, data=None):
+        """
+        Send a request through the transport, revalidated against its cache, throttled by the rate limiter of
+        the host and retried as told by the retry policy of :func:`retrying`, or else of the transport
+
+        :param method: HTTP verb
+        :param url: Full URL
+        :param params: Query string arguments
+        :param data: Form data
+        :return: :class:`requests.Response` so the sync response handling can be reused
+        """
+        headers = dict(self.headers)
+        kwargs = {'params': _pairs(params)}
+
+        if data is not None:
+            kwargs['data'] = urlencode(_pairs(data))
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.auth:
+            kwargs['auth'] = aiohttp.BasicAuth(*self.auth)
+        if not self.verify_ssl:
+            kwargs['ssl'] = False
+        if self.timeout is not None:
+            kwargs['timeout'] = _client_timeout(self.timeout)
+
+        policy = _retry_policy.get(current_policy(self.transport.retry))
+        if policy is not None:
+            policy.count('requests')
+        limiter = self.transport.rate_limiters.get(host_key(url))
+
+        cache = self.transport.cache if method == 'GET' else None
+        if cache is not None:
+            key = cache_key(method, _full_url(url, kwargs['params']), headers)
+            cached = cache.get(key)
+            if cached is not None:
+                headers.update(cached.conditional_headers())
+
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await asyncio.sleep(limiter.reserve())
+            try:
+                async with self.transport.client().request(method, url, headers=headers, **kwargs) as response:
+                    body = await response.read()
+                if limiter is not None:
+                    limiter.update(response.headers)
+            except aiohttp.ClientConnectionError as error:
+                if policy is None or not policy.is_retryable(method, attempt, error=error):
+                    raise
+                await asyncio.sleep(policy.record(attempt, error=error))
+            else:
+                result = _as_requests_response(response, body)
+                if policy is None or not policy.is_retryable(method, attempt, response=result):
+                    break
+                await asyncio.sleep(policy.record(attempt, response=result))
+            attempt += 1
+
+        if cache is not None:
+            if result.status_code == 304 and cached is not None:
+                result = revalidated(result, cached)
+            else:
+                entry = entry_from_response(result)
+                if entry is not None:
+                    cache.set(key, entry)
+                    result.cache_entry = entry
+
+        _last_headers.set(result.headers)
+        return result
+
+    def retrying(self, policy):
+        """
+        Use another retry policy for the requests awaited by the current task inside the block, see
+        :func:`gitlab.base.Base.retrying`
+
+        >>> with gitlab.retrying(RetryPolicy(total=10, backoff_factor=2)):
+        ...     await gitlab.getprojectissues(1)
+
+        :param policy: :class:`gitlab.retry.RetryPolicy`, or :obj:`None` to disable retries
+        :return: Context manager
+        """
+        return _override(policy)
+
+    async def map(self, fn, iterable, concurrency=None):
+        """
+        Await a coroutine method once per item of `iterable`, see :func:`gitlab.base.Base.map`
+
+        >>> trees = await gitlab.map(gitlab.getrepositorytree, project_ids, concurrency=16)
+
+        :param fn: Coroutine method or name of the method to call
+        :param iterable: Arguments of each call
+        :param concurrency: Optional, number of calls running at once, defaults to the `pool_maxsize` of the
+            transport
+        :return: List of the results in the order of `iterable`, holding the raised exception for failed calls
+        """
+        if not callable(fn):
+            fn = getattr(self, fn)
+        semaphore = asyncio.Semaphore(concurrency or self.transport.pool_maxsize)
+
+        async def call(item):
+            async with semaphore:
+                try:
+                    if isinstance(item, dict):
+                        return await fn(**item)
+                    if isinstance(item, tuple):
+                        return await fn(*item)
+                    return await fn(item)
+                except Exception as error:
+                    return error
+
+        return list(await asyncio.gather(*[call(item) for item in iterable]))
+
+    async def get(self, uri, default_response=None, return_meta=False, **kwargs):
+        """
+        Call GET on the Gitlab server, see :func:`gitlab.base.Base.get`
+
+        :param uri: String with the URI for the endpoint to GET from
+        :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the pagination and rate limit headers
+            along with the data
+        :param kwargs: Key word arguments to use as GET arguments
+        :return: Dictionary containing response data
+        :raise: HttpError: If invalid response returned
+        """
+        response = await self.request('GET', self.api_url + uri, params=kwargs)
+
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
+
+    async def post(self, uri, default_response=None, return_meta=False, **kwargs):
+        """
+        Call POST on the Gitlab server, see :func:`gitlab.base.Base.post`
+
+        :param uri: String with the URI for the endpoint to POST to
+        :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the rate limit headers along with
+            the data
+        :param kwargs: Key word arguments representing the data to use in the POST
+        :return: Dictionary containing response data
+        :raise: HttpError: If invalid response returned
+        """
+        response = await self.request('POST', self.api_url + uri, data=kwargs)
+
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
+
+    async def delete(self, uri, default_response=None, return_meta=False):
+        """
+        Call DELETE on the Gitlab server, see :func:`gitlab.base.Base.delete`
+
+        :param uri: String with the URI you wish to delete
+        :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the rate limit headers along with
+            the data
+        :return: Dictionary containing response data
+        :raise: HttpError: If invalid response returned
+        """
+        response = await self.request('DELETE', self.api_url + uri)
+
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
+
+    @staticmethod
+    async def getall(fn, page=None, *args, **kwargs):
+        """
+        Auto-iterate over the paginated results of a coroutine method, see :func:`gitlab.base.Base.getall`
+
+        >>> async for issue in AsyncGitlab.getall(gitlab.getprojectissues, project_id=1, per_page=100):
+        ...     print(issue['title'])
+
+        :param fn: Actual coroutine method to call
+        :param page: Optional, page number to start at, defaults to 1
+        :param args: Positional arguments to actual method
+        :param kwargs: Keyword arguments to actual method
+        :return: Yields each item in the result until exhausted; or no elements if error
+        """
+        if not page:
+            page = 1
+
+        while True:
+            _last_headers.set(None)
+            results = await fn(*args, page=page, **kwargs)
+
+            if not results:
+                break
+            meta = Meta(_last_headers.get())
+            for x in results:
+                yield x
+
+            if meta.is_last_page:
+                break
+            page += 1
+
+    async def get_project(self, project):
+        """
+        Get info for a project identified by id or namespace/project_name
+
+        :param project: The ID or URL-encoded path of the project
+        :return: Dictionary containing the Project
+        :raise: HttpError: If invalid response returned
+        """
+        project = format_string(project)
+
+        return await self.get(
+            '/projects/{project}'.format(project=project))
+
+    async def getprojectissues(self, project_id, page=1, per_page=20, **kwargs):
+        """
+        Return a list of issues for project id.
+
+        :param: project_id: The id for the project.
+        :param page: Page number
+        :param per_page: Records per page
+        :param kwargs: Extra data to send
+        :return: list of issues
+        """
+        url, data = self._project_issues_request(project_id, page, per_page, **kwargs)
+
+        return self._listing_result(await self.request('GET', url, params=data))
+
+    async def getmergerequests(self, project_id, page=1, per_page=20, state=None):
+        """
+        Get all the merge requests for a project.
+
+        :param project_id: ID of the project to retrieve merge requests for
+        :param page: Page Number
+        :param per_page: Records per page
+        :param state: Passes merge request state to filter them by it
+        :return: list with all the merge requests
+        """
+        url, data = self._merge_requests_request(project_id, page, per_page, state)
+
+        return self._listing_result(await self.request('GET', url, params=data))
+
+    async def getrepositorytree(self, project_id, **kwargs):
+        """
+        Get a list of repository files and directories in a project.
+
+        :param project_id: The ID of a project
+        :param path: The path inside repository. Used to get contend of subdirectories
+        :param ref_name: The name of a repository branch or tag or if not given the default branch
+        :return: dict with the tree
+        """
+        url, data = self._repository_tree_request(project_id, **kwargs)
+
+        return self._listing_result(await self.request('GET', url, params=data))
+
+    async def getrawfile(self, project_id, sha1, filepath):
+        """
+        Get the raw file contents for a file by commit SHA and path.
+
+        The blob cache of the client is used when `sha1` is a full commit SHA.
+
+        :param project_id: The ID of a project
+        :param sha1: The commit or branch name
+        :param filepath: The path the file
+        :return: raw file contents
+        """
+        _, content = self._cached_file(sha1, filepath)
+        if content is not None:
+            return content
+
+        url, data = self._raw_file_request(project_id, sha1, filepath)
+
+        return self._raw_file_result(await self.request('GET', url, params=data), sha1, filepath)
+
+
+@contextmanager
+def _override(policy):
+    """
+    Apply another retry policy to the requests of the current task inside the block, tasks started meanwhile
+    inherit it
+
+    :param policy: :class:`gitlab.retry.RetryPolicy`, or :obj:`None` to disable retries
+    :return: Context manager
+    """
+    token = _retry_policy.set(policy)
+    try:
+        yield
+    finally:
+        _retry_policy.reset(token)
+
+
+def _pairs(data):
+    """
+    Flatten query or form arguments the way requests does: :obj:`None` values are dropped and lists repeat the key
+
+    :param data: Dictionary of arguments or :obj:`None`
+    :return: List of (key, value) string tuples
+    """
+    pairs = []
+    for key, value in (data or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                pairs.append((key, item if isinstance(item, str) else str(item)))
+    return pairs
+
+
+def _full_url(url, pairs):
+    """
+    URL with its query string, as used for cache keys
+
+    :param url: URL without query string
+    :param pairs: Query string arguments from :func:`_pairs`
+    :return: URL
+    """
+    if not pairs:
+        return url
+    return '{0}?{1}'.format(url, urlencode(pairs))
+
+
+def _client_timeout(timeout):
+    """
+    Translate a requests timeout into an :class:`aiohttp.ClientTimeout`
+
+    :param timeout: Seconds or a (connect, read) tuple
+    :return: :class:`aiohttp.ClientTimeout`
+    """
+    if isinstance(timeout, tuple):
+        return aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+def _as_requests_response(response, body):
+    """
+    Copy an aiohttp response into a :class:`requests.Response`
+
+    :param response: :class:`aiohttp.ClientResponse`
+    :param body: Body already read from the response
+    :return: :class:`requests.Response`
+    """
+    result = RequestsResponse()
+    result.status_code = response.status
+    result.reason = response.reason
+    result.url = str(response.url)
+    result.headers = CaseInsensitiveDict(response.headers)
+    result._content = body
+    result._content_consumed = True
+    return result
@@ -1,5 +1,16 @@
 # -*- coding: utf-8 -*-
-import requests
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+
+from .blobcache import git_blob_sha, is_sha, sha_algorithm
+from .jsondecode import load_backend
+from .memoize import Memoizer
+from .meta import Meta, Response
+from .ratelimit import RateLimiter
+from .retry import override
+from .stream import DEFAULT_CHUNK_SIZE, iter_json_array
+from .transport import Transport, last_response_headers, reset_last_response_headers
 
 
 class Base(object):
@@ -15,12 +26,48 @@ class Base(object):
     :param timeout: Timeout
     :param suppress_http_error: Use :obj:`False` to unsuppress
         :class:`requests.exceptions.HTTPError` exceptions on failure
+    :param transport: :class:`gitlab.transport.Transport` to share with other clients, a new one is created
+        from the pool arguments when not given
+    :param pool_connections: Number of per host connection pools to keep
+    :param pool_maxsize: Maximum number of connections kept open per host
+    :param pool_block: Wait for a free connection when the host pool is exhausted
+    :param keep_alive: Use :obj:`False` to close the connection after every request
+    :param max_in_flight: Maximum number of concurrent requests over every client sharing the transport
+    :param retry: :class:`gitlab.retry.RetryPolicy` applied to every request, requests are not retried if not given
+    :param rate_limit: :class:`gitlab.ratelimit.RateLimiter` throttling the requests to the host, or a number of
+        requests per second to configure the limiter shared by every client of the host
+    :param cache: :class:`gitlab.cache.MemoryCache` or :class:`gitlab.cache.DiskCache` used to revalidate GET
+        requests with ``ETag`` and ``Last-Modified`` instead of downloading unchanged data again
+    :param memoize: :obj:`True` or a :class:`gitlab.memoize.Memoizer` to keep the results of user, key, project,
+        namespace and group lookups in memory for a while
+    :param blob_cache: :class:`gitlab.blobcache.BlobCache` serving repository blobs addressed by SHA from disk
+    :param json_decoder: Name of the JSON backend decoding responses (``orjson``, ``simdjson``, ``ujson`` or
+        ``json``) or a callable taking bytes, the fastest one installed is used if not given
     :return: None
     """
+    transport_class = Transport
+
     def __init__(self, host, token=None, oauth_token=None, verify_ssl=True, auth=None, timeout=None,
-                 suppress_http_error=True):
+                 suppress_http_error=True, transport=None, pool_connections=DEFAULT_POOLSIZE,
+                 pool_maxsize=DEFAULT_POOLSIZE, pool_block=DEFAULT_POOLBLOCK, keep_alive=True, max_in_flight=None,
+                 retry=None, rate_limit=None, cache=None, memoize=None, blob_cache=None,
+                 json_decoder=None):
         self.suppress_http_error = suppress_http_error
 
+        if transport is None:
+            transport = self.transport_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                             pool_block=pool_block, keep_alive=keep_alive,
+                                             max_in_flight=max_in_flight, retry=retry, cache=cache)
+
+        self.transport = transport
+        self.session = transport.session
+
+        if memoize is True:
+            memoize = Memoizer()
+        self.memo = memoize if memoize is not False else None
+        self.blob_cache = blob_cache
+        self.json_loads = load_backend(json_decoder)
+
         if token:
             self.token = token
             self.headers = {'PRIVATE-TOKEN': self.token}
@@ -52,7 +99,13 @@ class Base(object):
         self.verify_ssl = verify_ssl
         self.timeout = timeout
 
-    def get(self, uri, default_response=None, **kwargs):
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter.for_host(self.host, rate=rate_limit)
+        if rate_limit is not None:
+            self.transport.limit(self.host, rate_limit)
+        self.rate_limiter = rate_limit
+
+    def get(self, uri, default_response=None, return_meta=False, **kwargs):
         """
         Call GET on the Gitlab server
 
@@ -62,18 +115,20 @@ class Base(object):
 
         :param uri: String with the URI for the endpoint to GET from
         :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the pagination and rate limit headers
+            along with the data
         :param kwargs: Key word arguments to use as GET arguments
         :return: Dictionary containing response data
         :raise: HttpError: If invalid response returned
         """
         url = self.api_url + uri
-        response = requests.get(url, params=kwargs, headers=self.headers,
-                                verify=self.verify_ssl, auth=self.auth,
-                                timeout=self.timeout)
+        response = self.session.get(url, params=kwargs, headers=self.headers,
+                                    verify=self.verify_ssl, auth=self.auth,
+                                    timeout=self.timeout)
 
-        return self.success_or_raise(response, default_response=default_response)
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
 
-    def post(self, uri, default_response=None, **kwargs):
+    def post(self, uri, default_response=None, return_meta=False, **kwargs):
         """
         Call POST on the Gitlab server
 
@@ -86,19 +141,21 @@ class Base(object):
 
         :param uri: String with the URI for the endpoint to POST to
         :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the rate limit headers along with
+            the data
         :param kwargs: Key word arguments representing the data to use in the POST
         :return: Dictionary containing response data
         :raise: HttpError: If invalid response returned
         """
         url = self.api_url + uri
 
-        response = requests.post(
+        response = self.session.post(
             url, headers=self.headers, data=kwargs,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
-        return self.success_or_raise(response, default_response=default_response)
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
 
-    def delete(self, uri, default_response=None):
+    def delete(self, uri, default_response=None, return_meta=False):
         """
         Call DELETE on the Gitlab server
 
@@ -108,26 +165,36 @@ class Base(object):
 
         :param uri: String with the URI you wish to delete
         :param default_response: Return value if JSONDecodeError
+        :param return_meta: Return a :class:`gitlab.meta.Response` carrying the rate limit headers along with
+            the data
         :return: Dictionary containing response data
         :raise: HttpError: If invalid response returned
         """
         url = self.api_url + uri
-        response = requests.delete(
+        response = self.session.delete(
             url, headers=self.headers, verify=self.verify_ssl,
             auth=self.auth, timeout=self.timeout)
 
-        return self.success_or_raise(response, default_response=default_response)
+        return self.success_or_raise(response, default_response=default_response, return_meta=return_meta)
 
-    def success_or_raise(self, response, default_response=None):
+    def success_or_raise(self, response, default_response=None, return_meta=False):
         """
         Check if request was successful or raises an HttpError
 
         :param response: Response Object to check
         :param default_response: Return value if JSONDecodeError
-        :returns dict: Dictionary containing response data
+        :param return_meta: Wrap the result in a :class:`gitlab.meta.Response` along with the
+            :class:`gitlab.meta.Meta` read from the response headers
+        :returns dict: Dictionary containing response data, shared with the cache when the transport revalidated
+            it so it should not be modified
         :returns bool: :obj:`False` on failure when exceptions are suppressed
+        :returns gitlab.meta.Response: When `return_meta` is used
         :raises requests.exceptions.HTTPError: If invalid response returned
         """
+        if return_meta:
+            return Response(self.success_or_raise(response, default_response=default_response),
+                            Meta(response.headers))
+
         if self.suppress_http_error and not response.ok:
             return False
 
@@ -137,13 +204,233 @@ class Base(object):
 
         response.raise_for_status()
 
+        entry = getattr(response, 'cache_entry', None)
+        if entry is not None and entry.decoded is not None:
+            return entry.decoded
+
         try:
-            response_json = response.json()
+            response_json = self.decode_json(response)
         except ValueError:
             pass
+        else:
+            if entry is not None:
+                entry.decoded = response_json
 
         return response_json
 
+    def decode_json(self, response):
+        """
+        Decode the JSON body of a response from its raw bytes with the JSON backend of the client
+
+        :param response: :class:`requests.Response`
+        :return: Decoded body
+        :raise: ValueError: If the body is not valid JSON
+        """
+        return self.json_loads(response.content)
+
+    def iter_json(self, response, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Decode the elements of the JSON array of a response requested with ``stream=True`` as they arrive
+
+        :param response: :class:`requests.Response`
+        :param chunk_size: Bytes read from the connection at a time
+        :return: Generator of the decoded elements
+        :raise: ValueError: If the body is not a JSON array
+        """
+        try:
+            for element in iter_json_array(response.iter_content(chunk_size=chunk_size), self.json_loads):
+                yield element
+        finally:
+            response.close()
+
+    def _cached_blob(self, sha):
+        """
+        Content of a blob from the blob cache
+
+        :param sha: Blob SHA
+        :return: Raw content or :obj:`None` if not cached
+        """
+        if self.blob_cache is None or not is_sha(sha):
+            return None
+        return self.blob_cache.get(sha)
+
+    def _cache_blob(self, sha, content):
+        """
+        Store a blob in the blob cache, unless its content does not match its SHA
+
+        :param sha: Blob SHA
+        :param content: Raw content
+        :return: None
+        """
+        if self.blob_cache is None or not is_sha(sha):
+            return
+        if git_blob_sha(content, sha_algorithm(sha)) == sha:
+            self.blob_cache.set(sha, content)
+
+    def _cached_file(self, ref, path):
+        """
+        A file at a commit from the blob cache
+
+        :param ref: Commit SHA, nothing is cached for branch or tag names
+        :param path: Path of the file
+        :return: Tuple of (metadata, raw content), or of :obj:`None` if not cached
+        """
+        if self.blob_cache is None or not is_sha(ref):
+            return None, None
+        info = self.blob_cache.get_ref(ref, path)
+        content = self._cached_blob(info['blob_id']) if info else None
+        if content is None:
+            return None, None
+        return info, content
+
+    def _cache_file(self, ref, path, content, info=None):
+        """
+        Store a file at a commit in the blob cache
+
+        :param ref: Commit SHA, nothing is cached for branch or tag names
+        :param path: Path of the file
+        :param content: Raw content
+        :param info: Metadata of the file without its content, the blob SHA is computed if not given
+        :return: None
+        """
+        if self.blob_cache is None or not is_sha(ref):
+            return
+        blob_id = (info or {}).get('blob_id') or git_blob_sha(content, sha_algorithm(ref))
+        self._cache_blob(blob_id, content)
+        if info or self.blob_cache.get_ref(ref, path) is None:
+            self.blob_cache.set_ref(ref, path, dict(info or {}, blob_id=blob_id))
+
+    def _project_issues_request(self, project_id, page=1, per_page=20, **kwargs):
+        """
+        URL and query string of :func:`gitlab.Gitlab.getprojectissues`
+
+        The request and result helpers are shared by :class:`gitlab.Gitlab` and :class:`gitlab.aio.AsyncGitlab`,
+        so both clients only differ by how the request is sent.
+
+        :param project_id: The id for the project
+        :param page: Page number
+        :param per_page: Records per page
+        :param kwargs: Extra data to send
+        :return: Tuple of (url, params)
+        """
+        kwargs['page'] = page
+        kwargs['per_page'] = per_page
+        return '{0}/{1}/issues'.format(self.projects_url, project_id), kwargs
+
+    def _merge_requests_request(self, project_id, page=1, per_page=20, state=None):
+        """
+        URL and query string of :func:`gitlab.Gitlab.getmergerequests`
+
+        :param project_id: ID of the project to retrieve merge requests for
+        :param page: Page Number
+        :param per_page: Records per page
+        :param state: Passes merge request state to filter them by it
+        :return: Tuple of (url, params)
+        """
+        data = {'page': page, 'per_page': per_page, 'state': state}
+        return '{0}/{1}/merge_requests'.format(self.projects_url, project_id), data
+
+    def _repository_tree_request(self, project_id, **kwargs):
+        """
+        URL and query string of :func:`gitlab.Gitlab.getrepositorytree`
+
+        :param project_id: The ID of a project
+        :param kwargs: ``path`` and ``ref_name`` of the listing
+        :return: Tuple of (url, params)
+        """
+        return '{0}/{1}/repository/tree'.format(self.projects_url, project_id), kwargs
+
+    def _raw_file_request(self, project_id, sha1, filepath):
+        """
+        URL and query string of :func:`gitlab.Gitlab.getrawfile`
+
+        :param project_id: The ID of a project
+        :param sha1: The commit or branch name
+        :param filepath: The path the file
+        :return: Tuple of (url, params)
+        """
+        return '{0}/{1}/repository/blobs/{2}'.format(self.projects_url, project_id, sha1), {'filepath': filepath}
+
+    def _listing_result(self, request, stream=False):
+        """
+        Result of a list method: the decoded items, or False if the request failed
+
+        :param request: :class:`requests.Response`
+        :param stream: Decode the items as they arrive, the response was requested with ``stream=True``
+        :return: List or generator of the items, False on failure
+        """
+        if request.status_code == 200:
+            return self.iter_json(request) if stream else self.decode_json(request)
+        else:
+            request.close()
+            return False
+
+    def _raw_file_result(self, request, sha1, filepath):
+        """
+        Result of :func:`gitlab.Gitlab.getrawfile`, stored in the blob cache
+
+        :param request: :class:`requests.Response`
+        :param sha1: The commit or branch name
+        :param filepath: The path the file
+        :return: Raw file contents, False on failure
+        """
+        if request.status_code == 200:
+            self._cache_file(sha1, filepath, request.content)
+            return request.content
+        else:
+            return False
+
+    def retrying(self, policy):
+        """
+        Use another retry policy for the calls made by the current thread inside the block
+
+        >>> with gitlab.retrying(RetryPolicy(total=10, backoff_factor=2)):
+        ...     gitlab.getprojectissues(1)
+        >>> with gitlab.retrying(None):
+        ...     gitlab.getprojectissues(1)
+
+        :param policy: :class:`gitlab.retry.RetryPolicy`, or :obj:`None` to disable retries
+        :return: Context manager
+        """
+        return override(policy)
+
+    def map(self, fn, iterable, concurrency=None):
+        """
+        Call a method once per item of `iterable` on a thread pool sharing the connection pool of the client
+
+        Each item is a tuple of positional arguments, a dictionary of keyword arguments or a single argument. A
+        failing call does not abort the others, its exception is put in the results instead.
+
+        >>> members = gitlab.map(gitlab.getprojectmembers, project_ids, concurrency=16)
+        >>> hooks = gitlab.map('getprojecthooks', [{'project_id': 1, 'per_page': 100}, (2, 1, 100)])
+
+        :param fn: Method or name of the method to call
+        :param iterable: Arguments of each call
+        :param concurrency: Optional, number of calls running at once, defaults to the `pool_maxsize` of the
+            transport. Use `max_in_flight` on the client to also cap the requests of other threads and clients
+        :return: List of the results in the order of `iterable`, holding the raised exception for failed calls
+        """
+        if not callable(fn):
+            fn = getattr(self, fn)
+        if not concurrency:
+            concurrency = self.transport.pool_maxsize
+
+        def call(item):
+            try:
+                if isinstance(item, dict):
+                    return fn(**item)
+                if isinstance(item, tuple):
+                    return fn(*item)
+                return fn(item)
+            except Exception as error:
+                return error
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            return list(executor.map(call, iterable))
+        finally:
+            executor.shutdown(wait=True)
+
     @staticmethod
     def getall(fn, page=None, *args, **kwargs):
         """
@@ -152,21 +439,141 @@ class Base(object):
         other parameters as normal. Include `page` to determine first page to poll.
         Remaining kwargs are passed on to the called method, including `per_page`.
 
+        Iteration stops once the pagination headers tell the last page was reached, or on the first empty page
+        when the server sends none. Methods called with ``stream=True`` have the items of each page yielded as they
+        are parsed, except with `workers` where the other pages are parsed in the worker threads.
+
+        Pass `workers` to fetch the remaining pages concurrently once the first page is in. The number of pages
+        is read from the `X-Total-Pages` header of the first response; when the server leaves it out, pages are
+        requested ahead until an empty one comes back.
+
+        >>> for issue in Gitlab.getall(gitlab.getprojectissues, project_id=1, per_page=100, workers=8):
+        ...     print(issue['title'])
+
         :param fn: Actual method to call
         :param page: Optional, page number to start at, defaults to 1
+        :param workers: Optional, number of pages to fetch concurrently, pages are fetched one by one if not given
+        :param ordered: Optional, use :obj:`False` to yield the items of each page as soon as it arrives instead
+            of in page order
+        :param max_buffered: Optional, maximum number of pages in flight or waiting to be yielded, defaults to
+            twice `workers`
+        :param model: Optional, :class:`gitlab.models.Resource` subclass to yield compact resources instead of
+            dictionaries
         :param args: Positional arguments to actual method
         :param kwargs: Keyword arguments to actual method
         :return: Yields each item in the result until exhausted, and then implicit StopIteration; or no elements if error
         """
+        workers = kwargs.pop('workers', None)
+        ordered = kwargs.pop('ordered', True)
+        max_buffered = kwargs.pop('max_buffered', None)
+        model = kwargs.pop('model', None)
+
+        if model is not None:
+            for x in model.from_list(Base.getall(fn, page, *args, **kwargs)):
+                yield x
+            return
+
         if not page:
             page = 1
 
+        if workers:
+            for x in Base._getall_parallel(fn, page, workers, ordered, max_buffered, args, kwargs):
+                yield x
+            return
+
         while True:
+            reset_last_response_headers()
             results = fn(*args, page=page, **kwargs)
 
             if not results:
                 break
+            meta = Meta(last_response_headers())
+            count = 0
             for x in results:
+                count += 1
                 yield x
 
+            if not count or meta.is_last_page:
+                break
             page += 1
+
+    @staticmethod
+    def _getall_parallel(fn, page, workers, ordered, max_buffered, args, kwargs):
+        """
+        Parallel implementation of :func:`getall`
+
+        :param fn: Actual method to call
+        :param page: Page number to start at
+        :param workers: Number of pages to fetch concurrently
+        :param ordered: Yield items in page order
+        :param max_buffered: Maximum number of pages in flight or waiting to be yielded
+        :param args: Positional arguments to actual method
+        :param kwargs: Keyword arguments to actual method
+        :return: Yields each item in the result
+        """
+        reset_last_response_headers()
+        results = fn(*args, page=page, **kwargs)
+        if not results:
+            return
+
+        meta = Meta(last_response_headers())
+        for x in results:
+            yield x
+
+        if meta.is_last_page:
+            return
+        last_page = meta.total_pages
+
+        if max_buffered is None:
+            max_buffered = workers * 2
+        max_buffered = max(max_buffered, 1)
+
+        def fetch(number):
+            results = fn(*args, page=number, **kwargs)
+            if results and not isinstance(results, (list, tuple)):
+                results = list(results)
+            return number, results
+
+        next_page = expected = page + 1
+        pending = {}
+        done = {}
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            while True:
+                while len(pending) + len(done) < max_buffered and (last_page is None or next_page <= last_page):
+                    pending[next_page] = executor.submit(fetch, next_page)
+                    next_page += 1
+
+                if not pending:
+                    break
+
+                finished, _ = wait(list(pending.values()), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    number, results = future.result()
+                    del pending[number]
+
+                    if not results:
+                        if last_page is None or number - 1 < last_page:
+                            last_page = number - 1
+                    elif last_page is not None and number > last_page:
+                        continue
+                    elif ordered:
+                        done[number] = results
+                    else:
+                        for x in results:
+                            yield x
+
+                if last_page is not None:
+                    for number in [n for n in pending if n > last_page]:
+                        pending.pop(number).cancel()
+                    for number in [n for n in done if n > last_page]:
+                        del done[number]
+
+                while expected in done:
+                    for x in done.pop(expected):
+                        yield x
+                    expected += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+
+SHA_PATTERN = re.compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+
+class BlobCache(object):
+    """
+    On-disk content-addressed cache of repository blobs
+
+    Blobs never change once addressed by their SHA, so a cached blob is served without asking the server.
+    :func:`gitlab.Gitlab.getrawblob` uses the cache for full blob SHAs, :func:`gitlab.Gitlab.getrawfile` and
+    :func:`gitlab.Gitlab.getfile` when the ref is a full commit SHA. The least recently used files are removed once
+    the cache grows over `max_bytes`; several processes can share the directory.
+
+    Blobs of at least `mmap_threshold` bytes are returned as read-only :class:`mmap.mmap` objects instead of
+    :obj:`bytes`, so reading them again does not copy them into memory. They support :func:`len`, slicing and the
+    buffer protocol (hashing, writing to files) but do not compare equal to :obj:`bytes`.
+
+    >>> cache = BlobCache('/var/cache/gitlab-blobs', max_bytes=10 * 1024 ** 3, mmap_threshold=1024 ** 2)
+    >>> gitlab = Gitlab(host='http://localhost:10080', token='secret', blob_cache=cache)
+
+    :param path: Directory holding the cache, created if missing
+    :param max_bytes: Maximum total size of the cached files
+    :param mmap_threshold: Size from which blobs are memory mapped, never if :obj:`None`
+    :return: None
+    """
+    def __init__(self, path, max_bytes=1024 ** 3, mmap_threshold=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self._lock = threading.Lock()
+        self._total = None
+
+        for directory in ('objects', 'refs'):
+            if not os.path.isdir(os.path.join(path, directory)):
+                os.makedirs(os.path.join(path, directory))
+
+    def get(self, sha):
+        """
+        Read a cached blob
+
+        :param sha: Full blob SHA
+        :return: bytes, :class:`mmap.mmap` for large blobs, or :obj:`None` if not cached
+        """
+        filename = self._object(sha)
+        try:
+            with open(filename, 'rb') as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if self.mmap_threshold is not None and size and size >= self.mmap_threshold:
+                    content = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    content = handle.read()
+            os.utime(filename, None)
+        except (IOError, OSError):
+            return None
+        return content
+
+    def set(self, sha, content):
+        """
+        Store a blob
+
+        :param sha: Full blob SHA
+        :param content: Raw content of the blob
+        :return: None
+        """
+        filename = self._object(sha)
+        if not os.path.isdir(os.path.dirname(filename)):
+            try:
+                os.makedirs(os.path.dirname(filename))
+            except OSError:
+                pass
+        self._write(filename, content)
+        self._grow(len(content))
+
+    def get_ref(self, commit, path):
+        """
+        Look up what is known of a file at a commit
+
+        :param commit: Full commit SHA
+        :param path: Path of the file
+        :return: Dictionary holding at least the ``blob_id``, :obj:`None` if unknown
+        """
+        try:
+            with open(self._ref(commit, path), 'rb') as handle:
+                return json.loads(handle.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set_ref(self, commit, path, info):
+        """
+        Remember the blob of a file at a commit
+
+        :param commit: Full commit SHA
+        :param path: Path of the file
+        :param info: Dictionary holding at least the ``blob_id``
+        :return: None
+        """
+        content = json.dumps(info).encode('utf-8')
+        self._write(self._ref(commit, path), content)
+        self._grow(len(content))
+
+    def clear(self):
+        """
+        Remove every cached file
+
+        :return: None
+        """
+        for filename, _, _ in self._files():
+            _remove(filename)
+        with self._lock:
+            self._total = 0
+
+    def _object(self, sha):
+        return os.path.join(self.path, 'objects', sha[:2], sha[2:])
+
+    def _ref(self, commit, path):
+        key = hashlib.sha256('{0}\0{1}'.format(commit, path).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, 'refs', key)
+
+    def _write(self, filename, content):
+        temporary = '{0}.{1}.{2}.tmp'.format(filename, os.getpid(), threading.current_thread().ident)
+        with open(temporary, 'wb') as handle:
+            handle.write(content)
+        getattr(os, 'replace', os.rename)(temporary, filename)
+
+    def _files(self):
+        for directory, _, names in os.walk(self.path):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                filename = os.path.join(directory, name)
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    continue
+                yield filename, stat.st_mtime, stat.st_size
+
+    def _grow(self, size):
+        """
+        Account for a new file and evict the least recently used ones once over `max_bytes`
+
+        The total is only counted again from the directory when it goes over the limit.
+
+        :param size: Size of the new file
+        :return: None
+        """
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, _, size in self._files())
+            else:
+                self._total += size
+            if self._total <= self.max_bytes:
+                return
+
+            files = sorted(self._files(), key=lambda item: item[1])
+            total = sum(size for _, _, size in files)
+            for filename, _, size in files:
+                if total <= self.max_bytes:
+                    break
+                _remove(filename)
+                total -= size
+            self._total = total
+
+
+def is_sha(value):
+    """
+    Whether a ref is a full SHA-1 or SHA-256 object name
+
+    :param value: Ref
+    :return: bool
+    """
+    return isinstance(value, (str, type(u''))) and SHA_PATTERN.match(value) is not None
+
+
+def sha_algorithm(sha):
+    """
+    Hash algorithm of an object name
+
+    :param sha: Full SHA
+    :return: ``sha256`` for 64 character names, ``sha1`` otherwise
+    """
+    return 'sha256' if len(sha) == 64 else 'sha1'
+
+
+def git_blob_sha(content, algorithm='sha1'):
+    """
+    Object name git gives to a blob
+
+    :param content: Raw content of the blob
+    :param algorithm: ``sha1`` or ``sha256`` for repositories using SHA-256 object names
+    :return: Hexadecimal SHA
+    """
+    digest = hashlib.new(algorithm)
+    digest.update('blob {0}\0'.format(len(content)).encode('ascii'))
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from requests.structures import CaseInsensitiveDict
+
+IDENTITY_HEADERS = ('PRIVATE-TOKEN', 'Authorization', 'SUDO')
+BODY_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class CacheEntry(object):
+    """
+    Validators and body of a cached GET response
+
+    :param etag: ``ETag`` header of the response
+    :param last_modified: ``Last-Modified`` header of the response
+    :param headers: Response headers
+    :param content: Raw response body
+    :return: None
+    """
+    def __init__(self, etag, last_modified, headers, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = dict((name, value) for name, value in headers.items() if name.lower() not in BODY_HEADERS)
+        self.content = content
+        self.stored_at = time.time()
+        self.decoded = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['decoded'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def conditional_headers(self):
+        """
+        Headers turning a request into a conditional one
+
+        :return: Dictionary of headers
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    @property
+    def size(self):
+        return len(self.content)
+
+
+class MemoryCache(object):
+    """
+    In-memory LRU cache backend
+
+    The least recently used entries are dropped once there are more than `maxsize` of them or their bodies take
+    more than `max_bytes`. A body larger than `max_bytes` is not cached at all.
+
+    :param maxsize: Maximum number of entries
+    :param ttl: Seconds after which an entry is dropped instead of revalidated, never if :obj:`None`
+    :param max_bytes: Maximum total size of the cached bodies
+    :return: None
+    """
+    def __init__(self, maxsize=1024, ttl=None, max_bytes=64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            if _expired(entry, self.ttl):
+                self._bytes -= entry.size
+                return None
+            self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._discard(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def delete(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache(object):
+    """
+    On-disk cache backend storing one file per entry
+
+    The least recently used entries are removed once the total size of the directory goes over `max_bytes`.
+    Decoded bodies are not stored, a response served from disk is decoded again once per process.
+
+    :param path: Directory holding the cache, created if missing
+    :param max_bytes: Maximum total size of the cached files
+    :param ttl: Seconds after which an entry is dropped instead of revalidated, never if :obj:`None`
+    :return: None
+    """
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttl=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = MemoryCache(maxsize=256)
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + '.entry')
+
+    def get(self, key):
+        entry = self._memory.get(key)
+        filename = self._file(key)
+
+        if entry is None:
+            try:
+                with open(filename, 'rb') as handle:
+                    entry = pickle.load(handle)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                return None
+
+        if _expired(entry, self.ttl):
+            self.delete(key)
+            return None
+
+        try:
+            os.utime(filename, None)
+        except OSError:
+            return None
+        self._memory.set(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        filename = self._file(key)
+        temporary = '{0}.{1}.tmp'.format(filename, threading.current_thread().ident)
+        with open(temporary, 'wb') as handle:
+            pickle.dump(entry, handle, pickle.HIGHEST_PROTOCOL)
+        getattr(os, 'replace', os.rename)(temporary, filename)
+        self._memory.set(key, entry)
+        self._evict()
+
+    def delete(self, key):
+        self._memory.delete(key)
+        try:
+            os.remove(self._file(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        self._memory.clear()
+        for name in os.listdir(self.path):
+            if name.endswith('.entry'):
+                self.delete(name[:-len('.entry')])
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            total = 0
+            for name in os.listdir(self.path):
+                if not name.endswith('.entry'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.path, name))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+                total += stat.st_size
+
+            for _, size, name in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                self.delete(name[:-len('.entry')])
+                total -= size
+
+
+def cache_key(method, url, headers):
+    """
+    Key of a request in the cache, distinct per URL with its query string and per identity (token and sudo user)
+
+    :param method: HTTP verb
+    :param url: Full URL including the query string
+    :param headers: Request headers
+    :return: Hexadecimal digest
+    """
+    headers = CaseInsensitiveDict(headers)
+    parts = [method.upper(), url] + ['{0}={1}'.format(name, headers.get(name, '')) for name in IDENTITY_HEADERS]
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def entry_from_response(response):
+    """
+    Build a cache entry from a successful response carrying validators
+
+    :param response: :class:`requests.Response`
+    :return: :class:`CacheEntry` or :obj:`None` if the response cannot be revalidated
+    """
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if response.status_code != 200 or not (etag or last_modified):
+        return None
+    return CacheEntry(etag, last_modified, response.headers, response.content)
+
+
+def revalidated(response, entry):
+    """
+    Turn a ``304 Not Modified`` response into the cached ``200 OK`` one
+
+    :param response: :class:`requests.Response` with status 304
+    :param entry: :class:`CacheEntry` that was revalidated
+    :return: The same response, updated
+    """
+    headers = CaseInsensitiveDict(entry.headers)
+    for name, value in response.headers.items():
+        if name.lower() not in BODY_HEADERS:
+            headers[name] = value
+    response.status_code = 200
+    response.reason = 'OK'
+    response.headers = headers
+    response._content = entry.content
+    response._content_consumed = True
+    response.from_cache = True
+    response.cache_entry = entry
+    return response
+
+
+def _expired(entry, ttl):
+    return ttl is not None and time.time() - entry.stored_at > ttl
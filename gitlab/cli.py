@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Command line export of list endpoints as newline-delimited JSON
+
+Items are written as the pages arrive, to stdout or to a file compressed with gzip when its name ends with ``.gz``.
+With ``--checkpoint``, the last complete page is saved after every page, and ``--resume`` continues an
+interrupted export from there, dropping whatever was written of the incomplete page.
+
+    python -m gitlab export issues --project group/project --host https://gitlab.example.com \\
+        --output issues.ndjson.gz --workers 8 --checkpoint issues.checkpoint --resume
+
+The host and token default to the ``GITLAB_HOST`` and ``GITLAB_TOKEN`` environment variables.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+
+from requests.exceptions import RequestException
+
+from . import Gitlab
+from .base import Base
+from .exceptions import HttpError
+from .helper import format_string
+from .retry import RetryPolicy
+
+RESOURCES = {
+    'issues': ('getprojectissues', True, {'stream': True}),
+    'merge_requests': ('getmergerequests', True, {'stream': True}),
+    'commits': ('getrepositorycommits', True, {'stream': True}),
+    'members': ('getprojectmembers', True, {}),
+    'users': ('get_users', False, {}),
+    'groups': ('getgroups', False, {}),
+}
+_PAGE_END = object()
+
+
+class NdjsonWriter(object):
+    """
+    Writes items as newline-delimited JSON
+
+    Compressed output is made of one gzip member per :func:`commit`, so a file cut at a committed offset is still
+    valid and can be appended to.
+
+    :param fileobj: Binary file object to write to
+    :param compress: Compress the output with gzip
+    :return: None
+    """
+    def __init__(self, fileobj, compress=False):
+        self.fileobj = fileobj
+        self.compress = compress
+        self._member = None
+
+    def write(self, item):
+        """
+        Write an item on its own line
+
+        :param item: JSON serializable item
+        :return: None
+        """
+        line = json.dumps(item, separators=(',', ':')).encode('utf-8') + b'\n'
+        if self.compress:
+            if self._member is None:
+                self._member = gzip.GzipFile(filename='', mode='wb', fileobj=self.fileobj)
+            self._member.write(line)
+        else:
+            self.fileobj.write(line)
+
+    def commit(self):
+        """
+        Flush what was written so far
+
+        :return: Offset of the end of the output, :obj:`None` if the output cannot tell it
+        """
+        if self._member is not None:
+            self._member.close()
+            self._member = None
+        self.fileobj.flush()
+        try:
+            return self.fileobj.tell()
+        except (AttributeError, IOError, OSError, ValueError):
+            return None
+
+    def rollback(self, offset):
+        """
+        Drop what was written since the commit that returned `offset`
+
+        :param offset: Offset returned by :func:`commit`
+        :return: None
+        """
+        self.commit()
+        self.fileobj.seek(offset)
+        self.fileobj.truncate()
+
+
+def export(fn, writer, page=1, workers=None, on_page=None, **kwargs):
+    """
+    Write every item of a paginated listing, page after page
+
+    :param fn: List method of the client, called through :func:`gitlab.base.Base.getall`
+    :param writer: :class:`NdjsonWriter`
+    :param page: Page number to start at
+    :param workers: Number of pages to fetch concurrently, pages are still written in order
+    :param on_page: Called with the number of each page once all of its items are written
+    :param kwargs: Keyword arguments to `fn`, including `per_page`
+    :return: Number of items written
+    :raise: HttpError: If a page could not be fetched, instead of ending the export early
+    """
+    def numbered(**kwargs):
+        number = kwargs['page']
+        results = fn(**kwargs)
+        if results is False:
+            raise HttpError('Could not fetch page {0}'.format(number))
+        return _numbered(number, results)
+
+    count = 0
+    for number, item in Base.getall(numbered, page, workers=workers, **kwargs):
+        if item is _PAGE_END:
+            if on_page is not None:
+                on_page(number)
+        else:
+            writer.write(item)
+            count += 1
+    return count
+
+
+def _numbered(number, results):
+    """
+    Tag the items of a page with its number, followed by :data:`_PAGE_END` unless the page is empty
+
+    :param number: Page number
+    :param results: Items of the page
+    :return: Generator of ``(number, item)`` tuples
+    """
+    empty = True
+    for item in results:
+        empty = False
+        yield number, item
+    if not empty:
+        yield number, _PAGE_END
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint
+
+    :param path: Path of the checkpoint
+    :return: Dictionary, :obj:`None` if there is no checkpoint
+    """
+    try:
+        with open(path, 'rb') as handle:
+            return json.loads(handle.read().decode('utf-8'))
+    except (IOError, OSError):
+        return None
+
+
+def save_checkpoint(path, state):
+    """
+    Replace a checkpoint atomically
+
+    :param path: Path of the checkpoint
+    :param state: JSON serializable dictionary
+    :return: None
+    """
+    temporary = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as handle:
+        handle.write(json.dumps(state, sort_keys=True).encode('utf-8'))
+    getattr(os, 'replace', os.rename)(temporary, path)
+
+
+def build_parser():
+    """
+    Parser of the command line
+
+    :return: :class:`argparse.ArgumentParser`
+    """
+    parser = argparse.ArgumentParser(prog='python -m gitlab', description='Gitlab API command line')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('export', help='write a list endpoint as newline-delimited JSON')
+    command.add_argument('resource', choices=sorted(RESOURCES),
+                         type=lambda value: value.replace('-', '_'))
+    command.add_argument('--project', help='id or path of the project, for project resources')
+    command.add_argument('--state', help='state of the merge requests, such as opened or merged')
+    command.add_argument('--ref', help='branch or tag of the commits')
+    command.add_argument('--search', help='filter of the users or members')
+    command.add_argument('--host', default=os.environ.get('GITLAB_HOST'), help='defaults to $GITLAB_HOST')
+    command.add_argument('--token', default=os.environ.get('GITLAB_TOKEN'), help='defaults to $GITLAB_TOKEN')
+    command.add_argument('--no-verify-ssl', dest='verify_ssl', action='store_false')
+    command.add_argument('--output', '-o', help='file to write to, gzip compressed if ending with .gz, '
+                                                'stdout if not given')
+    command.add_argument('--gzip', action='store_true', help='compress the output whatever its name')
+    command.add_argument('--per-page', type=int, default=100)
+    command.add_argument('--workers', type=int, default=None, help='number of pages to fetch concurrently')
+    command.add_argument('--retries', type=int, default=3, help='retries of a request on transient errors')
+    command.add_argument('--checkpoint', help='file saving the progress after every page')
+    command.add_argument('--resume', action='store_true', help='continue from the checkpoint')
+    return parser
+
+
+def _arguments(options):
+    arguments = {}
+    if options.project is not None:
+        arguments['project_id'] = int(options.project) if options.project.isdigit() else format_string(options.project)
+    if options.resource == 'merge_requests' and options.state:
+        arguments['state'] = options.state
+    if options.resource == 'commits' and options.ref:
+        arguments['ref_name'] = options.ref
+    if options.resource == 'users' and options.search:
+        arguments['search'] = options.search
+    if options.resource == 'members' and options.search:
+        arguments['query'] = options.search
+    return arguments
+
+
+def main(argv=None):
+    """
+    Entry point of ``python -m gitlab``
+
+    :param argv: Arguments, defaults to the command line
+    :return: Exit status
+    """
+    parser = build_parser()
+    options = parser.parse_args(argv)
+
+    method, needs_project, defaults = RESOURCES[options.resource]
+    if needs_project and options.project is None:
+        parser.error('{0} requires --project'.format(options.resource))
+    if options.host is None:
+        parser.error('--host or GITLAB_HOST is required')
+    if options.resume and options.checkpoint is None:
+        parser.error('--resume requires --checkpoint')
+
+    arguments = _arguments(options)
+    identity = {'resource': options.resource, 'arguments': arguments, 'per_page': options.per_page}
+
+    page = 1
+    offset = None
+    if options.resume:
+        state = load_checkpoint(options.checkpoint)
+        if state is not None:
+            if state.get('identity') != identity:
+                parser.error('the checkpoint {0} belongs to another export'.format(options.checkpoint))
+            if state.get('done'):
+                sys.stderr.write('Export already complete\n')
+                return 0
+            page = state['page'] + 1
+            offset = state.get('offset')
+
+    retry = RetryPolicy(total=options.retries) if options.retries else None
+    gitlab = Gitlab(options.host, token=options.token, verify_ssl=options.verify_ssl, retry=retry)
+    compress = options.gzip or (options.output or '').endswith('.gz')
+
+    if options.output is None:
+        output = getattr(sys.stdout, 'buffer', sys.stdout)
+    elif offset is not None and os.path.exists(options.output):
+        output = open(options.output, 'r+b')
+        output.truncate(offset)
+        output.seek(offset)
+    else:
+        output = open(options.output, 'wb')
+    writer = NdjsonWriter(output, compress)
+
+    progress = {'identity': identity, 'page': page - 1, 'offset': writer.commit(), 'done': False}
+
+    def on_page(number):
+        progress.update(page=number, offset=writer.commit())
+        if options.checkpoint is not None:
+            save_checkpoint(options.checkpoint, progress)
+
+    try:
+        count = export(getattr(gitlab, method), writer, page, options.workers, on_page,
+                       per_page=options.per_page, **dict(defaults, **arguments))
+        progress.update(done=True, offset=writer.commit())
+        if options.checkpoint is not None:
+            save_checkpoint(options.checkpoint, progress)
+    except (HttpError, RequestException) as error:
+        if progress['offset'] is not None:
+            writer.rollback(progress['offset'])
+        sys.stderr.write('Export interrupted: {0}\n'.format(error))
+        return 1
+    finally:
+        if output is not getattr(sys.stdout, 'buffer', sys.stdout):
+            output.close()
+
+    sys.stderr.write('Exported {0} {1}\n'.format(count, options.resource))
+    return 0
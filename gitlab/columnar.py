@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+Column-oriented export of paginated listings
+
+Items are read one by one from any iterable, typically :func:`gitlab.base.Base.getall`, and gathered into
+batches of columns following a declared :class:`Schema`. Nested objects are flattened by the schema, so
+``author.username`` becomes the ``author_username`` column. Only the current batch is held in memory, never the
+whole listing of dictionaries.
+
+Batches can be written to Parquet or Arrow IPC files, which requires the ``pyarrow`` package
+(``pip install pyapi-gitlab[arrow]``), or gathered into NumPy arrays, which requires ``numpy``
+(``pip install pyapi-gitlab[numpy]``).
+
+>>> issues = Gitlab.getall(gitlab.getprojectissues, project_id=1, per_page=100, stream=True)
+>>> write_parquet(issues, 'issues.parquet', ISSUE_SCHEMA)
+"""
+import collections
+import datetime
+import importlib
+import re
+
+from .models import Resource
+
+DEFAULT_BATCH_SIZE = 10000
+TYPES = ('int64', 'float64', 'bool', 'string', 'timestamp', 'date', 'list<string>')
+
+_TIMESTAMP = re.compile(r'^(\d{4})-(\d\d)-(\d\d)(?:[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?'
+                        r'(?:(Z)|([+-])(\d\d):?(\d\d))?)?$')
+
+
+class Column(object):
+    """
+    Column of a :class:`Schema`
+
+    :param name: Name of the column
+    :param type: One of :data:`TYPES`, timestamps are in UTC
+    :param path: Dotted path of the value in each item, such as ``author.username``, defaults to `name`
+    :return: None
+    """
+    __slots__ = ('name', 'type', 'path')
+
+    def __init__(self, name, type, path=None):
+        if type not in TYPES:
+            raise ValueError('Unknown column type {0}, use one of {1}'.format(type, ', '.join(TYPES)))
+        self.name = name
+        self.type = type
+        self.path = tuple((path or name).split('.'))
+
+    def extract(self, item):
+        """
+        Value of the column for an item
+
+        :param item: Dictionary or :class:`gitlab.models.Resource`
+        :return: Value converted to the type of the column, :obj:`None` if missing
+        """
+        value = item
+        for key in self.path:
+            if value is None:
+                return None
+            if isinstance(value, Resource):
+                value = getattr(value, key, None)
+            else:
+                value = value.get(key)
+
+        if value is None:
+            return None
+        if self.type == 'timestamp':
+            return parse_timestamp(value)
+        if self.type == 'date':
+            return parse_date(value)
+        if self.type == 'list<string>':
+            return list(value)
+        return value
+
+    def __repr__(self):
+        return 'Column({0!r}, {1!r}, {2!r})'.format(self.name, self.type, '.'.join(self.path))
+
+
+class Schema(object):
+    """
+    Ordered columns of an export
+
+    >>> schema = Schema([Column('id', 'int64'), Column('author', 'string', 'author.username')])
+
+    :param columns: Iterable of :class:`Column`
+    :return: None
+    """
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.names = tuple(column.name for column in self.columns)
+
+    def batches(self, items, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Gather items into batches of columns
+
+        :param items: Iterable of dictionaries or resources
+        :param batch_size: Maximum number of rows per batch
+        :return: Generator of ordered dictionaries mapping each column name to a list of values
+        """
+        columns = self.columns
+        batch = self._empty()
+        values = list(batch.values())
+        size = 0
+
+        for item in items:
+            for column, column_values in zip(columns, values):
+                column_values.append(column.extract(item))
+            size += 1
+            if size == batch_size:
+                yield batch
+                batch = self._empty()
+                values = list(batch.values())
+                size = 0
+
+        if size:
+            yield batch
+
+    def select(self, *names):
+        """
+        Schema holding only some of the columns
+
+        :param names: Names of the columns to keep
+        :return: :class:`Schema`
+        """
+        unknown = set(names) - set(self.names)
+        if unknown:
+            raise ValueError('Unknown columns: {0}'.format(', '.join(sorted(unknown))))
+        return Schema(column for column in self.columns if column.name in names)
+
+    def _empty(self):
+        return collections.OrderedDict((name, []) for name in self.names)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+
+def _person(prefix):
+    return [Column(prefix + '_id', 'int64', prefix + '.id'),
+            Column(prefix + '_username', 'string', prefix + '.username'),
+            Column(prefix + '_name', 'string', prefix + '.name')]
+
+
+def _milestone():
+    return [Column('milestone_id', 'int64', 'milestone.id'),
+            Column('milestone_title', 'string', 'milestone.title'),
+            Column('milestone_due_date', 'date', 'milestone.due_date')]
+
+
+ISSUE_SCHEMA = Schema([
+    Column('id', 'int64'), Column('iid', 'int64'), Column('project_id', 'int64'), Column('title', 'string'),
+    Column('state', 'string'), Column('created_at', 'timestamp'), Column('updated_at', 'timestamp'),
+    Column('labels', 'list<string>'), Column('user_notes_count', 'int64'), Column('upvotes', 'int64'),
+    Column('downvotes', 'int64'), Column('due_date', 'date'), Column('confidential', 'bool'),
+] + _person('author') + _person('assignee') + _milestone())
+
+MERGE_REQUEST_SCHEMA = Schema([
+    Column('id', 'int64'), Column('iid', 'int64'), Column('project_id', 'int64'), Column('title', 'string'),
+    Column('state', 'string'), Column('created_at', 'timestamp'), Column('updated_at', 'timestamp'),
+    Column('source_branch', 'string'), Column('target_branch', 'string'), Column('source_project_id', 'int64'),
+    Column('target_project_id', 'int64'), Column('labels', 'list<string>'), Column('work_in_progress', 'bool'),
+    Column('merge_status', 'string'), Column('sha', 'string'), Column('user_notes_count', 'int64'),
+    Column('upvotes', 'int64'), Column('downvotes', 'int64'),
+] + _person('author') + _person('assignee') + _milestone())
+
+COMMIT_SCHEMA = Schema([
+    Column('id', 'string'), Column('short_id', 'string'), Column('title', 'string'),
+    Column('author_name', 'string'), Column('author_email', 'string'), Column('authored_date', 'timestamp'),
+    Column('committer_name', 'string'), Column('committer_email', 'string'),
+    Column('committed_date', 'timestamp'), Column('created_at', 'timestamp'), Column('parent_ids', 'list<string>'),
+])
+
+
+def parse_timestamp(value):
+    """
+    Naive UTC datetime of an ISO 8601 timestamp as sent by the API
+
+    :param value: String such as ``2016-01-04T15:31:51.081Z``, or a datetime returned unchanged
+    :return: :class:`datetime.datetime`
+    :raise: ValueError: If the string is not a timestamp
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    match = _TIMESTAMP.match(value)
+    if match is None:
+        raise ValueError('Invalid timestamp: {0}'.format(value))
+
+    year, month, day, hour, minute, second, fraction, _, sign, offset_hours, offset_minutes = match.groups()
+    timestamp = datetime.datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                                  int(second or 0), int((fraction or '0').ljust(6, '0')))
+    if sign:
+        offset = datetime.timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        timestamp = timestamp - offset if sign == '+' else timestamp + offset
+    return timestamp
+
+
+def parse_date(value):
+    """
+    Date of an ISO 8601 string such as ``2016-01-04``
+
+    :param value: String, or a date returned unchanged
+    :return: :class:`datetime.date`
+    :raise: ValueError: If the string is not a date
+    """
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(value[:10], '%Y-%m-%d').date()
+
+
+def arrow_schema(schema):
+    """
+    Arrow schema of a :class:`Schema`
+
+    :param schema: :class:`Schema`
+    :return: :class:`pyarrow.Schema`
+    """
+    pa = importlib.import_module('pyarrow')
+    types = {
+        'int64': pa.int64(), 'float64': pa.float64(), 'bool': pa.bool_(), 'string': pa.string(),
+        'timestamp': pa.timestamp('us', tz='UTC'), 'date': pa.date32(), 'list<string>': pa.list_(pa.string()),
+    }
+    return pa.schema([pa.field(column.name, types[column.type]) for column in schema])
+
+
+def record_batches(items, schema, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Gather items into Arrow record batches
+
+    :param items: Iterable of dictionaries or resources
+    :param schema: :class:`Schema`
+    :param batch_size: Maximum number of rows per batch
+    :return: Generator of :class:`pyarrow.RecordBatch`
+    """
+    pa = importlib.import_module('pyarrow')
+    target = arrow_schema(schema)
+    for batch in schema.batches(items, batch_size):
+        arrays = [pa.array(values, type=field.type) for values, field in zip(batch.values(), target)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=target)
+
+
+def write_parquet(items, path, schema, batch_size=DEFAULT_BATCH_SIZE, **options):
+    """
+    Write items to a Parquet file, one row group per batch
+
+    :param items: Iterable of dictionaries or resources
+    :param path: Path or file object to write to
+    :param schema: :class:`Schema`
+    :param batch_size: Maximum number of rows per batch
+    :param options: Passed on to :class:`pyarrow.parquet.ParquetWriter`, such as ``compression``
+    :return: Number of rows written
+    """
+    parquet = importlib.import_module('pyarrow.parquet')
+    rows = 0
+    with parquet.ParquetWriter(path, arrow_schema(schema), **options) as writer:
+        for batch in record_batches(items, schema, batch_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def write_ipc(items, sink, schema, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write items to an Arrow IPC file
+
+    :param items: Iterable of dictionaries or resources
+    :param sink: Path or file object to write to
+    :param schema: :class:`Schema`
+    :param batch_size: Maximum number of rows per batch
+    :return: Number of rows written
+    """
+    ipc = importlib.import_module('pyarrow.ipc')
+    rows = 0
+    with ipc.new_file(sink, arrow_schema(schema)) as writer:
+        for batch in record_batches(items, schema, batch_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def to_numpy(items, schema, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Gather items into one NumPy array per column
+
+    Every column is a :class:`numpy.ma.MaskedArray` whose mask flags missing values. Strings and lists of strings
+    are object arrays, timestamps ``datetime64[us]`` in UTC and dates ``datetime64[D]``.
+
+    :param items: Iterable of dictionaries or resources
+    :param schema: :class:`Schema`
+    :param batch_size: Maximum number of rows per batch
+    :return: Ordered dictionary mapping each column name to its array
+    """
+    numpy = importlib.import_module('numpy')
+    chunks = collections.OrderedDict((column.name, []) for column in schema)
+    for batch in schema.batches(items, batch_size):
+        for column, values in zip(schema, batch.values()):
+            chunks[column.name].append(_numpy_array(numpy, column.type, values))
+
+    return collections.OrderedDict(
+        (column.name, numpy.ma.concatenate(chunks[column.name]) if chunks[column.name]
+         else _numpy_array(numpy, column.type, []))
+        for column in schema)
+
+
+_NUMPY_TYPES = {
+    'int64': ('int64', 0), 'float64': ('float64', float('nan')), 'bool': ('bool', False),
+    'timestamp': ('datetime64[us]', None), 'date': ('datetime64[D]', None),
+}
+
+
+def _numpy_array(numpy, type, values):
+    mask = numpy.array([value is None for value in values], dtype=bool)
+    if type in _NUMPY_TYPES:
+        dtype, fill = _NUMPY_TYPES[type]
+        data = numpy.array([fill if value is None else value for value in values], dtype=dtype)
+    else:
+        data = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            data[index] = value
+    return numpy.ma.MaskedArray(data, mask=mask)
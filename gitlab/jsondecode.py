@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import importlib
+import sys
+
+BACKENDS = ('orjson', 'simdjson', 'ujson', 'json')
+
+
+def load_backend(backend=None):
+    """
+    Function decoding JSON from bytes, for ``Gitlab(json_decoder=...)``
+
+    Without a backend, the fastest one installed is picked among :data:`BACKENDS`, the standard library being
+    always available. Every backend reads the raw response bytes, the body is never decoded to text first.
+
+    >>> gitlab = Gitlab(host='http://localhost:10080', token='secret', json_decoder='ujson')
+
+    :param backend: Name of a module of :data:`BACKENDS`, or a callable taking bytes
+    :return: Callable taking bytes and raising :class:`ValueError` on invalid documents
+    :raise: ImportError: If the named backend is not installed
+    """
+    if callable(backend):
+        return backend
+
+    if backend is not None and backend not in BACKENDS:
+        raise ValueError('Unknown JSON backend {0}, use one of {1}'.format(backend, ', '.join(BACKENDS)))
+
+    for name in [backend] if backend else BACKENDS:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            if backend:
+                raise
+            continue
+        if name == 'json' and (3,) <= sys.version_info < (3, 6):
+            return _decoding(module.loads)
+        return module.loads
+
+
+def _decoding(loads):
+    """
+    Wrap a decoder that only takes text, such as :func:`json.loads` before Python 3.6
+
+    :param loads: Callable taking text
+    :return: Callable taking bytes
+    """
+    def decode(raw):
+        return loads(raw.decode('utf-8'))
+    return decode
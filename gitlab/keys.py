@@ -1,8 +1,10 @@
 from gitlab.base import Base
 from gitlab.helper import deprecated
+from gitlab.memoize import memoized
 
 
 class Keys(Base):
+    @memoized('keys')
     def keys(self, key_id):
         """
         Get SSH key with user by ID of an SSH key. Note only administrators can lookup SSH key with user by ID of an
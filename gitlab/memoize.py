@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from .cache import IDENTITY_HEADERS
+
+DEFAULT_TTLS = {
+    'users': 300,
+    'keys': 600,
+    'projects': 60,
+    'namespaces': 300,
+    'groups': 300,
+}
+
+
+class Memoizer(object):
+    """
+    In-process memoization of read-mostly lookups, enabled with ``Gitlab(memoize=True)``
+
+    Results are grouped per resource (``users``, ``projects``...). Each resource or method can have its own TTL,
+    the least recently used results are dropped once `maxsize` is reached and writes made through the same client
+    invalidate the results of the resource they touch. Every caller gets its own copy of a result, so modifying it
+    does not change what later callers get. Failed and empty lookups are never memoized, and neither are calls
+    passing `page`, such as those made by :func:`gitlab.base.Base.getall`, which need the pagination headers of a
+    fresh response.
+
+    >>> gitlab = Gitlab(host='http://localhost:10080', token='secret',
+    ...                 memoize=Memoizer(ttls={'users': 3600, 'get_project': 30}))
+    >>> gitlab.memo.stats()
+
+    :param ttl: Seconds a result is kept when neither its method nor its resource has a TTL in `ttls`
+    :param ttls: TTLs in seconds by method name or resource, merged over :data:`DEFAULT_TTLS`
+    :param maxsize: Maximum number of memoized results
+    :return: None
+    """
+    def __init__(self, ttl=60, ttls=None, maxsize=4096):
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.maxsize = maxsize
+
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, resource, key):
+        """
+        Look up a memoized result
+
+        :param resource: Resource name
+        :param key: Key of the call
+        :return: Tuple of (found, result)
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[0] < time.time():
+                entry = None
+
+            if entry is None:
+                self._count(resource, 'misses')
+                return False, None
+
+            self._entries[key] = entry
+            self._count(resource, 'hits')
+            return True, entry[1]
+
+    def set(self, resource, key, method, result, ident=None):
+        """
+        Memoize a result
+
+        :param resource: Resource name
+        :param key: Key of the call
+        :param method: Name of the memoized method, used to find the TTL
+        :param result: Result of the call
+        :param ident: ID of the resource looked up, :obj:`None` for listings
+        :return: None
+        """
+        ttl = self.ttls.get(method, self.ttls.get(resource, self.ttl))
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, result, resource, ident)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, resource=None, ident=None):
+        """
+        Drop memoized results
+
+        With `ident`, only the lookups of that ID and the listings of the resource are dropped.
+
+        :param resource: Resource name, every result is dropped if :obj:`None`
+        :param ident: ID of the resource that changed
+        :return: Number of results dropped
+        """
+        with self._lock:
+            if resource is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+
+            keys = [key for key, entry in self._entries.items()
+                    if entry[2] == resource and (ident is None or entry[3] is None or str(entry[3]) == str(ident))]
+            for key in keys:
+                del self._entries[key]
+            self._count(resource, 'invalidations', len(keys))
+            return len(keys)
+
+    def stats(self):
+        """
+        Hits, misses and invalidations per resource
+
+        :return: Dictionary of dictionaries
+        """
+        with self._lock:
+            return dict((resource, dict(counters)) for resource, counters in self._stats.items())
+
+    def _count(self, resource, name, value=1):
+        counters = self._stats.setdefault(resource, {'hits': 0, 'misses': 0, 'invalidations': 0})
+        counters[name] += value
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def memoized(resource):
+    """
+    Decorator memoizing a lookup method of the client when memoization is enabled
+
+    The first positional argument is taken as the ID of the resource, calls without one are listings. Calls passing
+    `page` as a keyword argument always reach the server, so paginators see the headers of the page they asked for.
+
+    :param resource: Resource name
+    :return: Decorator
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            memo = getattr(self, 'memo', None)
+            if memo is None or 'page' in kwargs:
+                return func(self, *args, **kwargs)
+
+            key = (func.__name__, args, tuple(sorted(kwargs.items())), _identity(self))
+            try:
+                hash(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+
+            found, result = memo.get(resource, key)
+            if found:
+                return copy.deepcopy(result)
+
+            result = func(self, *args, **kwargs)
+            if result:
+                memo.set(resource, key, func.__name__, copy.deepcopy(result), ident=args[0] if args else None)
+            return result
+        return wrapper
+    return decorator
+
+
+def invalidates(*resources):
+    """
+    Decorator dropping the memoized results of resources after a write method of the client ran
+
+    Every result of the resources is dropped, a resource can be looked up by ID or by path so a narrower
+    invalidation could keep stale results.
+
+    :param resources: Resource names
+    :return: Decorator
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                memo = getattr(self, 'memo', None)
+                if memo is not None:
+                    for resource in resources:
+                        memo.invalidate(resource)
+        return wrapper
+    return decorator
+
+
+def _identity(client):
+    headers = getattr(client, 'headers', None) or {}
+    return tuple(headers.get(name) for name in IDENTITY_HEADERS)
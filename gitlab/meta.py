@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+
+from requests.utils import parse_header_links
+
+
+class Response(namedtuple('Response', ['data', 'meta'])):
+    """
+    Decoded body of a response together with its :class:`Meta`, returned when ``return_meta=True`` is used
+
+    >>> users, meta = gitlab.get('/users', per_page=100, return_meta=True)
+    >>> meta.total
+    """
+    __slots__ = ()
+
+
+class Meta(object):
+    """
+    Pagination and rate limit information read from the headers of a response
+
+    Values missing from the response are :obj:`None`.
+
+    :param headers: Response headers
+    :return: None
+    """
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+
+        self.total = _header_int(self.headers, 'X-Total')
+        self.total_pages = _header_int(self.headers, 'X-Total-Pages')
+        self.per_page = _header_int(self.headers, 'X-Per-Page')
+        self.page = _header_int(self.headers, 'X-Page')
+        self.next_page = _header_int(self.headers, 'X-Next-Page')
+        self.prev_page = _header_int(self.headers, 'X-Prev-Page')
+
+        self.ratelimit_limit = _header_int(self.headers, 'RateLimit-Limit')
+        self.ratelimit_remaining = _header_int(self.headers, 'RateLimit-Remaining')
+        self.ratelimit_reset = _header_int(self.headers, 'RateLimit-Reset')
+
+        self.links = {}
+        if self.headers.get('Link'):
+            for link in parse_header_links(self.headers['Link']):
+                if link.get('rel'):
+                    self.links[link['rel']] = link['url']
+
+    @property
+    def is_last_page(self):
+        """
+        Whether the headers tell there is no page after this one
+
+        An empty ``X-Next-Page`` header, the page number reaching ``X-Total-Pages`` or a ``Link`` header without a
+        ``next`` relation all mean the last page was reached. Without any pagination header this is :obj:`False`.
+
+        :return: bool
+        """
+        if 'X-Next-Page' in self.headers:
+            return self.next_page is None
+        if self.page is not None and self.total_pages is not None:
+            return self.page >= self.total_pages
+        if self.links:
+            return 'next' not in self.links
+        return False
+
+    @property
+    def is_paginated(self):
+        """
+        Whether the response carries any pagination header
+
+        :return: bool
+        """
+        return 'X-Next-Page' in self.headers or self.page is not None or self.total_pages is not None or \
+            bool(self.links)
+
+    def __repr__(self):
+        return '<Meta page={0} total_pages={1} total={2} next_page={3}>'.format(
+            self.page, self.total_pages, self.total, self.next_page)
+
+
+def _header_int(headers, name):
+    """
+    Read an integer response header
+
+    :param headers: Response headers
+    :param name: Header name
+    :return: Integer value or :obj:`None` if missing or empty
+    """
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
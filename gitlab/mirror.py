@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Local SQLite mirror of projects, groups, users and namespaces
+
+:class:`Mirror` copies the listings of :func:`gitlab.Gitlab.getprojectsowned`, :func:`gitlab.Gitlab.getgroups`,
+:func:`gitlab.Gitlab.get_users` and :func:`gitlab.Gitlab.getnamespaces` into an indexed SQLite database, so
+ownership lookups are answered locally instead of walking every page of the API.
+
+>>> mirror = Mirror(gitlab, '/var/lib/portal/gitlab.sqlite')
+>>> mirror.refresh(max_age=600)
+>>> [project['path_with_namespace'] for project in mirror.projects(owner='jdoe', visibility='public')]
+"""
+import datetime
+import json
+import sqlite3
+import threading
+import time
+
+from .base import Base
+from .columnar import parse_timestamp
+from .exceptions import HttpError
+
+RESOURCES = ('projects', 'groups', 'users', 'namespaces')
+VISIBILITY_LEVELS = {0: 'private', 10: 'internal', 20: 'public'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY, path TEXT, path_with_namespace TEXT, name TEXT, namespace_id INTEGER,
+    namespace_path TEXT, owner_id INTEGER, owner_username TEXT, visibility TEXT, archived INTEGER,
+    last_activity_at TEXT, data TEXT NOT NULL, generation INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS projects_path_with_namespace ON projects (path_with_namespace);
+CREATE INDEX IF NOT EXISTS projects_namespace_id ON projects (namespace_id, last_activity_at);
+CREATE INDEX IF NOT EXISTS projects_namespace_path ON projects (namespace_path, last_activity_at);
+CREATE INDEX IF NOT EXISTS projects_owner_username ON projects (owner_username, last_activity_at);
+CREATE INDEX IF NOT EXISTS projects_visibility ON projects (visibility, last_activity_at);
+CREATE INDEX IF NOT EXISTS projects_last_activity_at ON projects (last_activity_at);
+
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY, path TEXT, name TEXT, visibility TEXT, data TEXT NOT NULL, generation INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS groups_path ON groups (path);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY, username TEXT, name TEXT, email TEXT, state TEXT, data TEXT NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+
+CREATE TABLE IF NOT EXISTS namespaces (
+    id INTEGER PRIMARY KEY, path TEXT, name TEXT, kind TEXT, owner_id INTEGER, data TEXT NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS namespaces_path ON namespaces (path);
+CREATE INDEX IF NOT EXISTS namespaces_kind ON namespaces (kind);
+
+CREATE TABLE IF NOT EXISTS refreshes (
+    resource TEXT PRIMARY KEY, generation INTEGER NOT NULL, refreshed_at REAL NOT NULL
+);
+"""
+
+
+class Mirror(object):
+    """
+    SQLite copy of the projects, groups, users and namespaces visible to a client
+
+    :func:`refresh` lists every resource again but only writes the rows whose content changed, and removes the
+    rows that are gone once a listing completed; a listing that fails leaves the mirror untouched. Giving the
+    client a ``cache`` makes unchanged pages cheap to list again, as they are only revalidated.
+
+    Lookups return the dictionaries sent by the API, in the same form as the live methods.
+
+    :param gitlab: :class:`gitlab.Gitlab` client to refresh from
+    :param path: Path of the database, created if missing, in memory if not given
+    :param per_page: Number of items per page when refreshing
+    :param workers: Number of pages to fetch concurrently when refreshing, one by one if not given
+    :return: None
+    """
+    def __init__(self, gitlab, path=':memory:', per_page=100, workers=None):
+        self.gitlab = gitlab
+        self.path = path
+        self.per_page = per_page
+        self.workers = workers
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+
+    def refresh(self, resources=RESOURCES, max_age=None):
+        """
+        Bring the mirror up to date
+
+        :param resources: Names of the resources to refresh among :data:`RESOURCES`
+        :param max_age: Seconds during which a refreshed resource is not refreshed again, always refresh if not given
+        :return: Dictionary of ``{resource: {'added': n, 'updated': n, 'removed': n, 'unchanged': n}}`` for each
+            refreshed resource
+        :raise: HttpError: If a listing could not be fetched
+        """
+        unknown = set(resources) - set(RESOURCES)
+        if unknown:
+            raise ValueError('Unknown resources: {0}'.format(', '.join(sorted(unknown))))
+
+        report = {}
+        for resource in resources:
+            if max_age is not None:
+                refreshed_at = self.refreshed_at(resource)
+                if refreshed_at is not None and time.time() - refreshed_at < max_age:
+                    continue
+            report[resource] = self._refresh(resource)
+        return report
+
+    def refreshed_at(self, resource):
+        """
+        Time of the last complete refresh of a resource
+
+        :param resource: Name of the resource
+        :return: Seconds since the epoch, :obj:`None` if never refreshed
+        """
+        row = self._one('SELECT refreshed_at FROM refreshes WHERE resource = ?', (resource,))
+        return row['refreshed_at'] if row is not None else None
+
+    def project(self, project):
+        """
+        Look up a project
+
+        :param project: ID or ``namespace/path`` of the project
+        :return: Dictionary, :obj:`None` if not mirrored
+        """
+        column = 'id' if _is_id(project) else 'path_with_namespace'
+        return _data(self._one('SELECT data FROM projects WHERE {0} = ?'.format(column), (project,)))
+
+    def projects(self, owner=None, namespace=None, visibility=None, active_since=None, active_before=None,
+                 archived=None, limit=None):
+        """
+        Projects matching every given filter, most recently active first
+
+        :param owner: Username of the owner of the projects
+        :param namespace: ID or path of the namespace of the projects
+        :param visibility: ``private``, ``internal`` or ``public``
+        :param active_since: Datetime or ISO 8601 string, only projects with activity since then
+        :param active_before: Datetime or ISO 8601 string, only projects without activity since then
+        :param archived: :obj:`True` or :obj:`False` to only keep archived or unarchived projects
+        :param limit: Maximum number of projects
+        :return: List of dictionaries
+        """
+        conditions = []
+        parameters = []
+        if owner is not None:
+            conditions.append('owner_username = ?')
+            parameters.append(owner)
+        if namespace is not None:
+            conditions.append('namespace_id = ?' if _is_id(namespace) else 'namespace_path = ?')
+            parameters.append(namespace)
+        if visibility is not None:
+            conditions.append('visibility = ?')
+            parameters.append(visibility)
+        if active_since is not None:
+            conditions.append('last_activity_at >= ?')
+            parameters.append(_timestamp(active_since))
+        if active_before is not None:
+            conditions.append('last_activity_at < ?')
+            parameters.append(_timestamp(active_before))
+        if archived is not None:
+            conditions.append('archived = ?')
+            parameters.append(int(archived))
+
+        query = 'SELECT data FROM projects'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY last_activity_at DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            parameters.append(limit)
+        return [_data(row) for row in self._all(query, parameters)]
+
+    def group(self, group):
+        """
+        Look up a group
+
+        :param group: ID or path of the group
+        :return: Dictionary, :obj:`None` if not mirrored
+        """
+        column = 'id' if _is_id(group) else 'path'
+        return _data(self._one('SELECT data FROM groups WHERE {0} = ?'.format(column), (group,)))
+
+    def user(self, user):
+        """
+        Look up a user
+
+        :param user: ID or username of the user
+        :return: Dictionary, :obj:`None` if not mirrored
+        """
+        column = 'id' if _is_id(user) else 'username'
+        return _data(self._one('SELECT data FROM users WHERE {0} = ?'.format(column), (user,)))
+
+    def namespace(self, namespace):
+        """
+        Look up a namespace
+
+        :param namespace: ID or path of the namespace
+        :return: Dictionary, :obj:`None` if not mirrored
+        """
+        column = 'id' if _is_id(namespace) else 'path'
+        return _data(self._one('SELECT data FROM namespaces WHERE {0} = ?'.format(column), (namespace,)))
+
+    def close(self):
+        """
+        Close the database
+
+        :return: None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _refresh(self, resource):
+        """
+        List a resource and apply the differences to its table in a single transaction
+
+        The listing is complete before the table is locked, so lookups are not held up by the requests. The
+        statistics of the table are gathered again when it changed, so the query planner picks the most selective
+        index when several filters are combined.
+
+        :param resource: Name of the resource
+        :return: Counts of added, updated, removed and unchanged rows
+        """
+        methods = {
+            'projects': self.gitlab.getprojectsowned, 'groups': self.gitlab.getgroups,
+            'users': self.gitlab.get_users, 'namespaces': self.gitlab.getnamespaces,
+        }
+        items = list(Base.getall(_strict(methods[resource]), per_page=self.per_page, workers=self.workers))
+        columns = _COLUMNS[resource]
+        counts = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        with self._lock:
+            connection = self._connection
+            row = connection.execute('SELECT generation FROM refreshes WHERE resource = ?', (resource,)).fetchone()
+            generation = row['generation'] + 1 if row is not None else 1
+            select = 'SELECT data FROM {0} WHERE id = ?'.format(resource)
+            touch = 'UPDATE {0} SET generation = ? WHERE id = ?'.format(resource)
+            replace = 'INSERT OR REPLACE INTO {0} ({1}, data, generation) VALUES ({2}, ?, ?)'.format(
+                resource, ', '.join(columns), ', '.join('?' * len(columns)))
+
+            with connection:
+                for item in items:
+                    data = json.dumps(item, sort_keys=True)
+                    existing = connection.execute(select, (item['id'],)).fetchone()
+                    if existing is not None and existing['data'] == data:
+                        connection.execute(touch, (generation, item['id']))
+                        counts['unchanged'] += 1
+                        continue
+                    values = _EXTRACTORS[resource](item)
+                    connection.execute(replace, [values[column] for column in columns] + [data, generation])
+                    counts['updated' if existing is not None else 'added'] += 1
+
+                counts['removed'] = connection.execute(
+                    'DELETE FROM {0} WHERE generation != ?'.format(resource), (generation,)).rowcount
+                connection.execute('INSERT OR REPLACE INTO refreshes (resource, generation, refreshed_at) '
+                                   'VALUES (?, ?, ?)', (resource, generation, time.time()))
+            if counts['added'] or counts['updated'] or counts['removed']:
+                connection.execute('ANALYZE {0}'.format(resource))
+        return counts
+
+    def _one(self, query, parameters=()):
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()
+
+    def _all(self, query, parameters=()):
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+
+def _strict(fn):
+    """
+    Wrap a list method so a failed page raises instead of looking like the end of the listing
+
+    :param fn: List method returning :obj:`False` on failure
+    :return: Function
+    """
+    def strict(*args, **kwargs):
+        results = fn(*args, **kwargs)
+        if results is False:
+            raise HttpError('Could not fetch page {0} of {1}'.format(kwargs.get('page'), fn.__name__))
+        return results
+    return strict
+
+
+def _project(item):
+    namespace = item.get('namespace') or {}
+    owner = item.get('owner') or {}
+    return {
+        'id': item['id'], 'path': item.get('path'), 'path_with_namespace': item.get('path_with_namespace'),
+        'name': item.get('name'), 'namespace_id': namespace.get('id'),
+        'namespace_path': namespace.get('full_path') or namespace.get('path'), 'owner_id': owner.get('id'),
+        'owner_username': owner.get('username'), 'visibility': _visibility(item),
+        'archived': int(bool(item.get('archived'))), 'last_activity_at': _timestamp(item.get('last_activity_at')),
+    }
+
+
+def _group(item):
+    return {'id': item['id'], 'path': item.get('full_path') or item.get('path'), 'name': item.get('name'),
+            'visibility': _visibility(item)}
+
+
+def _user(item):
+    return {'id': item['id'], 'username': item.get('username'), 'name': item.get('name'),
+            'email': item.get('email'), 'state': item.get('state')}
+
+
+def _namespace(item):
+    return {'id': item['id'], 'path': item.get('full_path') or item.get('path'), 'name': item.get('name'),
+            'kind': item.get('kind'), 'owner_id': item.get('owner_id')}
+
+
+_EXTRACTORS = {'projects': _project, 'groups': _group, 'users': _user, 'namespaces': _namespace}
+_COLUMNS = {
+    'projects': ('id', 'path', 'path_with_namespace', 'name', 'namespace_id', 'namespace_path', 'owner_id',
+                 'owner_username', 'visibility', 'archived', 'last_activity_at'),
+    'groups': ('id', 'path', 'name', 'visibility'),
+    'users': ('id', 'username', 'name', 'email', 'state'),
+    'namespaces': ('id', 'path', 'name', 'kind', 'owner_id'),
+}
+
+
+def _visibility(item):
+    if item.get('visibility'):
+        return item['visibility']
+    if item.get('visibility_level') is not None:
+        return VISIBILITY_LEVELS.get(item['visibility_level'])
+    if 'public' in item:
+        return 'public' if item['public'] else 'private'
+    return None
+
+
+def _timestamp(value):
+    """
+    Sortable UTC form of a timestamp
+
+    :param value: Datetime or ISO 8601 string
+    :return: String such as ``2016-01-04 15:31:51.081000``, :obj:`None` for :obj:`None`
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        value = value.astimezone(_UTC).replace(tzinfo=None)
+    return parse_timestamp(value).strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _data(row):
+    return json.loads(row['data']) if row is not None else None
+
+
+class _Utc(datetime.tzinfo):
+    def utcoffset(self, dt):
+        return datetime.timedelta(0)
+
+    def tzname(self, dt):
+        return 'UTC'
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+
+_UTC = _Utc()
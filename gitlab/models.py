@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Compact resource classes for holding many API objects in memory
+
+Resources keep their fields in ``__slots__`` instead of a dictionary per object, strings taking few distinct
+values (states, usernames, branch names, labels...) are interned and identical nested objects, such as the author
+of many issues, are built once and shared, so resources should not be modified. Fields missing from a response
+are :obj:`None`, fields the class does not declare are kept aside and still readable. Resources can be indexed
+like the dictionaries they replace.
+
+>>> issues = list(Gitlab.getall(gitlab.getprojectissues, project_id=1, per_page=100, model=Issue))
+>>> issues[0].author.username == issues[0]['author']['username']
+True
+"""
+import six
+from six.moves import intern
+
+
+class Interner(object):
+    """
+    Tables shared by the resources built together, so equal strings and nested objects are stored once
+
+    :return: None
+    """
+    def __init__(self):
+        self.objects = {}
+        self.strings = {}
+
+    def string(self, value):
+        """
+        Interned copy of a string
+
+        Native strings go through :func:`intern`, which Python 2 refuses for unicode strings, so those are kept in a
+        table of the interner instead.
+
+        :param value: Any value, only strings are interned
+        :return: The value or its interned copy
+        """
+        if isinstance(value, str):
+            return intern(value)
+        if isinstance(value, six.text_type):
+            return self.strings.setdefault(value, value)
+        return value
+
+    def nested(self, cls, data):
+        """
+        Shared resource for a nested object
+
+        :param cls: :class:`Resource` subclass
+        :param data: Dictionary of the nested object
+        :return: Instance of `cls`, the same for equal dictionaries
+        """
+        try:
+            key = (cls, tuple(sorted(data.items())))
+            shared = self.objects.get(key)
+        except TypeError:
+            return cls.from_dict(data, self)
+
+        if shared is None:
+            shared = self.objects[key] = cls.from_dict(data, self)
+        return shared
+
+
+class _ResourceType(type):
+    def __init__(cls, name, bases, namespace):
+        super(_ResourceType, cls).__init__(name, bases, namespace)
+        cls._field_set = frozenset(cls.fields)
+
+
+@six.add_metaclass(_ResourceType)
+class Resource(object):
+    """
+    Base class of the resources
+
+    :param kwargs: Values of the fields
+    :return: None
+    """
+    __slots__ = ('_extra',)
+    fields = ()
+    nested = {}
+    interned = frozenset()
+
+    def __init__(self, **kwargs):
+        self._extra = None
+        for field in self.fields:
+            setattr(self, field, kwargs.pop(field, None))
+        if kwargs:
+            self._extra = kwargs
+
+    @classmethod
+    def from_dict(cls, data, interner=None):
+        """
+        Build a resource from a decoded response
+
+        :param data: Dictionary
+        :param interner: :class:`Interner` shared with the other resources built from the same listing
+        :return: Instance of the class
+        """
+        if interner is None:
+            interner = Interner()
+
+        resource = cls.__new__(cls)
+        resource._extra = None
+        for field in cls.fields:
+            value = data.get(field)
+            if value is not None:
+                value = resource._convert(field, value, interner)
+            setattr(resource, field, value)
+
+        if not cls._field_set.issuperset(data):
+            resource._extra = dict((key, value) for key, value in data.items() if key not in cls._field_set)
+        return resource
+
+    @classmethod
+    def from_list(cls, items, interner=None):
+        """
+        Build resources from a decoded listing, or any iterable of dictionaries
+
+        :param items: Iterable of dictionaries
+        :param interner: :class:`Interner` to share with other listings
+        :return: Generator of instances of the class
+        """
+        if interner is None:
+            interner = Interner()
+        for item in items:
+            yield cls.from_dict(item, interner)
+
+    def _convert(self, field, value, interner):
+        nested = self.nested.get(field)
+        if nested is not None and isinstance(value, dict):
+            return interner.nested(nested, value)
+        if isinstance(value, list):
+            return tuple(interner.string(item) for item in value)
+        if field in self.interned:
+            return interner.string(value)
+        return value
+
+    def to_dict(self):
+        """
+        Dictionary of the resource, fields missing from the response are :obj:`None`
+
+        :return: dict
+        """
+        data = dict(self._extra or {})
+        for field in self.fields:
+            value = getattr(self, field)
+            if isinstance(value, Resource):
+                value = value.to_dict()
+            elif isinstance(value, tuple):
+                value = list(value)
+            data[field] = value
+        return data
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key)
+        elif self._extra is not None and key in self._extra:
+            value = self._extra[key]
+        else:
+            raise KeyError(key)
+        return value.to_dict() if isinstance(value, Resource) else value
+
+    def __getattr__(self, name):
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(type(self).__name__, getattr(self, 'id', None))
+
+
+class User(Resource):
+    __slots__ = fields = ('id', 'username', 'name', 'state', 'email', 'avatar_url', 'web_url', 'created_at',
+                          'is_admin', 'bio', 'location', 'skype', 'linkedin', 'twitter', 'website_url')
+    interned = frozenset(['username', 'name', 'state', 'avatar_url', 'web_url'])
+
+
+class Member(Resource):
+    __slots__ = fields = ('id', 'username', 'name', 'state', 'avatar_url', 'web_url', 'access_level',
+                          'expires_at', 'created_at')
+    interned = frozenset(['username', 'name', 'state', 'avatar_url', 'web_url'])
+
+
+class Namespace(Resource):
+    __slots__ = fields = ('id', 'name', 'path', 'kind', 'full_path', 'owner_id', 'description', 'created_at',
+                          'updated_at')
+    interned = frozenset(['name', 'path', 'kind', 'full_path'])
+
+
+class Milestone(Resource):
+    __slots__ = fields = ('id', 'iid', 'project_id', 'title', 'description', 'state', 'due_date', 'created_at',
+                          'updated_at')
+    interned = frozenset(['title', 'state'])
+
+
+class Project(Resource):
+    __slots__ = fields = ('id', 'name', 'name_with_namespace', 'path', 'path_with_namespace', 'description',
+                          'default_branch', 'tag_list', 'public', 'archived', 'visibility_level', 'ssh_url_to_repo',
+                          'http_url_to_repo', 'web_url', 'owner', 'namespace', 'creator_id', 'created_at',
+                          'last_activity_at', 'star_count', 'forks_count', 'open_issues_count',
+                          'issues_enabled', 'merge_requests_enabled', 'wiki_enabled', 'builds_enabled',
+                          'snippets_enabled')
+    nested = {'owner': User, 'namespace': Namespace}
+    interned = frozenset(['default_branch'])
+
+
+class Issue(Resource):
+    __slots__ = fields = ('id', 'iid', 'project_id', 'title', 'description', 'state', 'created_at', 'updated_at',
+                          'labels', 'milestone', 'assignee', 'author', 'user_notes_count', 'upvotes', 'downvotes',
+                          'due_date', 'confidential', 'subscribed', 'web_url')
+    nested = {'milestone': Milestone, 'assignee': User, 'author': User}
+    interned = frozenset(['state'])
+
+
+class MergeRequest(Resource):
+    __slots__ = fields = ('id', 'iid', 'project_id', 'title', 'description', 'state', 'created_at', 'updated_at',
+                          'target_branch', 'source_branch', 'upvotes', 'downvotes', 'author', 'assignee',
+                          'source_project_id', 'target_project_id', 'labels', 'work_in_progress', 'milestone',
+                          'merge_when_build_succeeds', 'merge_status', 'sha', 'merge_commit_sha', 'subscribed',
+                          'user_notes_count', 'should_remove_source_branch', 'force_remove_source_branch',
+                          'web_url')
+    nested = {'milestone': Milestone, 'assignee': User, 'author': User}
+    interned = frozenset(['state', 'target_branch', 'source_branch', 'merge_status'])
+
+
+class Commit(Resource):
+    __slots__ = fields = ('id', 'short_id', 'title', 'message', 'author_name', 'author_email', 'authored_date',
+                          'committer_name', 'committer_email', 'committed_date', 'created_at', 'parent_ids')
+    interned = frozenset(['author_name', 'author_email', 'committer_name', 'committer_email'])
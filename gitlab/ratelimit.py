@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from six.moves.urllib.parse import urlparse
+
+from .meta import Meta
+
+
+class RateLimiter(object):
+    """
+    Token bucket throttling the requests sent to a Gitlab host
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per second, every request takes one token
+    and waits when none is left. With `adaptive`, the ``RateLimit-Remaining`` and ``RateLimit-Reset`` headers of
+    each response lower the rate so the remaining budget is spread evenly until the reset, without bursts, and
+    requests are held until the reset once it is spent. The limiter is thread safe; use :func:`for_host` to share
+    one between every client of a host.
+
+    >>> limiter = RateLimiter.for_host('https://gitlab.example.com', rate=10, burst=20)
+    >>> gitlab = Gitlab(host='https://gitlab.example.com', token='secret', rate_limit=limiter)
+
+    :param rate: Requests per second, not limited statically if :obj:`None`
+    :param burst: Number of requests that can be sent at once after a pause, defaults to `rate`
+    :param adaptive: Use :obj:`False` to ignore the rate limit headers of the server
+    :return: None
+    """
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate=None, burst=None, adaptive=True):
+        self.clock = time.time
+        self.sleep = time.sleep
+        self.adaptive = adaptive
+
+        self._lock = threading.Lock()
+        self._server_rate = None
+        self._server_rate_until = 0.0
+        self._blocked_until = 0.0
+        self.configure(rate, burst)
+
+    @classmethod
+    def for_host(cls, host, rate=None, burst=None, adaptive=True):
+        """
+        Get the limiter shared by every client of a host, creating it on first use
+
+        Passing `rate` or `burst` reconfigures an existing limiter.
+
+        :param host: Host or URL of the Gitlab server
+        :param rate: Requests per second
+        :param burst: Number of requests that can be sent at once after a pause
+        :param adaptive: Use :obj:`False` to ignore the rate limit headers of the server, only used on creation
+        :return: :class:`RateLimiter`
+        """
+        key = host_key(host)
+        with cls._registry_lock:
+            limiter = cls._registry.get(key)
+            if limiter is None:
+                limiter = cls._registry[key] = cls(rate=rate, burst=burst, adaptive=adaptive)
+            elif rate is not None or burst is not None:
+                limiter.configure(rate if rate is not None else limiter.rate,
+                                  burst if burst is not None else limiter.burst)
+        return limiter
+
+    def configure(self, rate=None, burst=None):
+        """
+        Change the static rate and burst, the bucket starts full
+
+        :param rate: Requests per second, not limited statically if :obj:`None`
+        :param burst: Number of requests that can be sent at once after a pause, defaults to `rate`
+        :return: None
+        """
+        with self._lock:
+            self.rate = rate
+            self.burst = max(1.0, float(burst if burst is not None else rate or 1))
+            self._tokens = self.burst
+            self._updated = self.clock()
+
+    @property
+    def current_rate(self):
+        """
+        Rate in force, the lowest of the static rate and the one derived from the server headers
+
+        :return: Requests per second or :obj:`None` if unlimited
+        """
+        rates = []
+        if self.rate is not None:
+            rates.append(self.rate)
+        if self._server_rate is not None and self.clock() < self._server_rate_until:
+            rates.append(self._server_rate)
+        return min(rates) if rates else None
+
+    def reserve(self):
+        """
+        Take a token and tell how long to wait before sending the request, without sleeping
+
+        :return: Seconds to wait
+        """
+        with self._lock:
+            now = self.clock()
+            rate = self.current_rate
+            wait = max(0.0, self._blocked_until - now)
+
+            if rate is not None:
+                burst = self.burst if rate == self.rate else 1.0
+                self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / rate)
+            self._updated = now
+        return wait
+
+    def acquire(self):
+        """
+        Wait until a request may be sent
+
+        :return: Seconds waited
+        """
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def update(self, headers):
+        """
+        Adapt to the rate limit headers of a response
+
+        :param headers: Response headers
+        :return: None
+        """
+        if not self.adaptive:
+            return
+
+        meta = Meta(headers)
+        if meta.ratelimit_remaining is None or meta.ratelimit_reset is None:
+            return
+
+        with self._lock:
+            seconds = meta.ratelimit_reset - self.clock()
+            if seconds <= 0:
+                return
+            if meta.ratelimit_remaining <= 0:
+                self._blocked_until = max(self._blocked_until, float(meta.ratelimit_reset))
+            else:
+                self._server_rate = meta.ratelimit_remaining / seconds
+                self._server_rate_until = float(meta.ratelimit_reset)
+
+
+def host_key(host):
+    """
+    Key identifying a host in the registry and on the transport
+
+    :param host: Host or URL
+    :return: Lower cased network location
+    """
+    if '://' not in host:
+        host = 'https://' + host
+    return urlparse(host).netloc.lower()
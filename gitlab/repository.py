@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import posixpath
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+
+from . import exceptions
+from .base import Base
+from .blobcache import git_blob_sha, sha_algorithm
+from .helper import format_string
+from .stream import Base64Content, is_stream, iter_bytes, json_body
+
+
+class Repository(Base):
+    def walk_tree(self, project_id, ref, path='', concurrency=8, per_page=100, pin=False):
+        """
+        Walk the repository tree recursively, listing up to `concurrency` directories at a time
+
+        Entries are yielded as the listing of their directory comes in, so siblings are not in a fixed order. Each
+        entry carries its ``path`` from the root of the repository.
+
+        >>> for entry in gitlab.walk_tree(1, 'master', concurrency=16, pin=True):
+        ...     if entry['type'] == 'blob':
+        ...         print(entry['path'])
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param path: Directory to start from, the root of the repository if empty
+        :param concurrency: Maximum number of directories listed at the same time
+        :param per_page: Entries requested per page of a directory listing
+        :param pin: Resolve `ref` to its commit SHA first, so the walk is not affected by pushes made meanwhile
+        :return: Generator of tree entries
+        :raise: HttpError: If a commit or a directory cannot be read
+        """
+        if pin:
+            ref = self._resolve_commit(project_id, ref)
+
+        directories = deque([path.strip('/')])
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while directories or running:
+                while directories and len(running) < concurrency:
+                    running.add(executor.submit(self._list_tree, project_id, ref, directories.popleft(), per_page))
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for entry in future.result():
+                        if entry['type'] == 'tree':
+                            directories.append(entry['path'])
+                        yield entry
+
+    def get_files(self, project_id, ref, paths, concurrency=8, pin=False):
+        """
+        Fetch many files of one ref at once
+
+        See :func:`iter_files`.
+
+        >>> files = gitlab.get_files(1, 'master', ['setup.py', 'docs/conf.py'], concurrency=16)
+        >>> files['setup.py']
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param paths: Paths of the files from the root of the repository
+        :param concurrency: Maximum number of requests made at the same time
+        :param pin: Resolve `ref` to its commit SHA first, so every file comes from the same commit
+        :return: Dictionary of raw contents by path, :obj:`None` for the paths that are not files at `ref`
+        """
+        return dict(self.iter_files(project_id, ref, paths, concurrency=concurrency, pin=pin))
+
+    def iter_files(self, project_id, ref, paths, concurrency=8, pin=False):
+        """
+        Fetch many files of one ref at once, yielding each as soon as it is downloaded
+
+        The blob SHA of every path is read from the tree listing of its directory, then each distinct blob is
+        downloaded once with :func:`gitlab.Gitlab.getrawblob`, so identical files cost a single download and no
+        base64 decoding is needed.
+
+        >>> for path, content in gitlab.iter_files(1, 'master', paths, concurrency=16):
+        ...     print(path, len(content or b''))
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param paths: Paths of the files from the root of the repository
+        :param concurrency: Maximum number of requests made at the same time
+        :param pin: Resolve `ref` to its commit SHA first, so every file comes from the same commit
+        :return: Generator of (path, raw content) tuples, the content is :obj:`None` for the paths that are not
+            files at `ref` or could not be downloaded
+        """
+        if pin:
+            ref = self._resolve_commit(project_id, ref)
+
+        blob_ids = self._blob_ids(project_id, ref, paths, concurrency)
+
+        blobs = {}
+        for path in sorted(set(path.strip('/') for path in paths)):
+            sha = blob_ids.get(path)
+            if sha is None:
+                yield path, None
+            else:
+                blobs.setdefault(sha, []).append(path)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            downloads = dict((executor.submit(self.getrawblob, project_id, sha), sha) for sha in blobs)
+            for future in as_completed(downloads):
+                content = future.result()
+                for path in blobs.pop(downloads.pop(future)):
+                    yield path, content if content is not False else None
+
+    def commit_files(self, project_id, branch, commit_message, actions, **kwargs):
+        """
+        Create, update, delete and move several files in a single commit
+
+        Contents are base64 encoded while the request body is sent, so file objects of any size can be committed
+        with flat memory use.
+
+        >>> gitlab.commit_files(1, 'master', 'Regenerate clients', [
+        ...     {'action': 'create', 'file_path': 'clients/users.py', 'content': open('build/users.py', 'rb')},
+        ...     {'action': 'update', 'file_path': 'README.md', 'content': u'# Clients'},
+        ...     {'action': 'move', 'file_path': 'docs/new.md', 'previous_path': 'docs/old.md'},
+        ...     {'action': 'delete', 'file_path': 'clients/legacy.py'},
+        ... ])
+
+        :param project_id: The ID of a project
+        :param branch: The name of the branch to commit to
+        :param commit_message: Commit message
+        :param actions: Iterable of dictionaries with the ``action`` (create, update, delete or move), the
+            ``file_path``, the ``previous_path`` of moves and the ``content`` of creations and updates as bytes,
+            text, a file object or an iterable of bytes. Content already base64 encoded is sent as is when the
+            action has ``'encoding': 'base64'``
+        :param kwargs: Other parameters of the API such as ``author_email`` and ``author_name``
+        :return: Dictionary of the commit or False
+        """
+        body = dict(kwargs, branch_name=branch, commit_message=commit_message,
+                    actions=(_commit_action(action) for action in actions))
+
+        request = self.session.post(
+            '{0}/projects/{1}/repository/commits'.format(self.api_url, format_string(project_id)),
+            data=json_body(body), headers=dict(self.headers, **{'Content-Type': 'application/json'}),
+            verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
+
+        return self.success_or_raise(request)
+
+    def sync_file(self, project_id, branch, file_path, content, commit_message, **kwargs):
+        """
+        Commit a file only if its content differs from the one on the branch
+
+        See :func:`sync_files`.
+
+        :param project_id: The ID of a project
+        :param branch: The name of the branch
+        :param file_path: Path of the file from the root of the repository
+        :param content: Content as bytes, text or a seekable binary file object
+        :param commit_message: Commit message
+        :param kwargs: Other arguments of :func:`sync_files`
+        :return: Dictionary of the report of :func:`sync_files`
+        """
+        return self.sync_files(project_id, branch, {file_path: content}, commit_message, **kwargs)
+
+    def sync_files(self, project_id, branch, files, commit_message, concurrency=8, dry_run=False, **kwargs):
+        """
+        Commit the files whose content differs from the one on the branch, in a single commit
+
+        The git blob SHA of each local content is compared with the one of the tree listing of its directory, so
+        unchanged files are neither downloaded nor uploaded and no commit is made when nothing changed.
+
+        >>> report = gitlab.sync_files(1, 'master', {'config/app.yml': rendered, 'VERSION': u'1.2.0'},
+        ...                            'Sync configuration')
+        >>> len(report['skipped']), len(report['created']) + len(report['updated'])
+
+        :param project_id: The ID of a project
+        :param branch: The name of the branch
+        :param files: Dictionary of contents by path, as bytes, text or seekable binary file objects
+        :param commit_message: Commit message
+        :param concurrency: Maximum number of directories listed at the same time
+        :param dry_run: Only report what would be written
+        :param kwargs: Other parameters of :func:`commit_files` such as ``author_email``
+        :return: Dictionary with the ``created``, ``updated`` and ``skipped`` paths and the ``commit`` made, which is
+            :obj:`None` when nothing was written and False if the commit failed
+        """
+        files = dict((path.strip('/'), content) for path, content in files.items())
+        blob_ids = self._blob_ids(project_id, branch, list(files), concurrency)
+
+        report = {'created': [], 'updated': [], 'skipped': [], 'commit': None}
+        actions = []
+        for path in sorted(files):
+            content = files[path]
+            remote = blob_ids.get(path)
+            if remote is None:
+                report['created'].append(path)
+                actions.append({'action': 'create', 'file_path': path, 'content': content})
+            elif _blob_sha(content, sha_algorithm(remote)) == remote:
+                report['skipped'].append(path)
+            else:
+                report['updated'].append(path)
+                actions.append({'action': 'update', 'file_path': path, 'content': content})
+
+        if actions and not dry_run:
+            report['commit'] = self.commit_files(project_id, branch, commit_message, actions, **kwargs)
+        return report
+
+    def _blob_ids(self, project_id, ref, paths, concurrency):
+        """
+        Blob SHAs of files, read from the tree listings of their directories
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param paths: Paths of the files
+        :param concurrency: Maximum number of directories listed at the same time
+        :return: Dictionary of blob SHAs by path, without the paths that are not files
+        """
+        directories = set(posixpath.dirname(path.strip('/')) for path in paths)
+
+        blob_ids = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for listing in executor.map(lambda directory: self._list_blobs(project_id, ref, directory),
+                                        sorted(directories)):
+                blob_ids.update(listing)
+        return blob_ids
+
+    def _upload_body(self, data, field='content', content_class=Base64Content):
+        """
+        Request body of an upload, streamed as JSON when its content is a file object or an iterator
+
+        :param data: Dictionary of the fields of the request
+        :param field: Name of the field holding the content
+        :param content_class: :class:`gitlab.stream.Base64Content` or :class:`gitlab.stream.TextContent`
+        :return: Tuple of the data and the headers to send
+        """
+        if not is_stream(data.get(field)):
+            return data, self.headers
+
+        data = dict(data, **{field: content_class(data[field])})
+        if content_class is Base64Content:
+            data['encoding'] = 'base64'
+        return json_body(data), dict(self.headers, **{'Content-Type': 'application/json'})
+
+    def _list_blobs(self, project_id, ref, path):
+        """
+        Blob SHAs of the files of one directory
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param path: Directory to list
+        :return: Dictionary of blob SHAs by path, empty if the directory does not exist
+        :raise: HttpError: If the directory cannot be read for another reason
+        """
+        entries = self._list_tree(project_id, ref, path, 100, missing_ok=True)
+        return dict((entry['path'], entry['id']) for entry in entries if entry['type'] == 'blob')
+
+    def _resolve_commit(self, project_id, ref):
+        """
+        SHA of the commit a ref points to
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :return: Commit SHA
+        :raise: HttpError: If the ref cannot be resolved
+        """
+        commit = self.getrepositorycommit(project_id, ref)
+        if not commit:
+            raise exceptions.HttpError('Could not resolve {0}'.format(ref))
+        return commit['id']
+
+    def _list_tree(self, project_id, ref, path, per_page, missing_ok=False):
+        """
+        Every entry of one directory, over as many pages as needed
+
+        Servers that do not paginate the tree ignore ``page`` and send every entry at once without pagination
+        headers, so the listing stops on a page without those headers, larger than `per_page` or repeating the
+        previous one.
+
+        :param project_id: The ID of a project
+        :param ref: The name of a repository branch or tag, or a commit SHA
+        :param path: Directory to list
+        :param per_page: Entries requested per page
+        :param missing_ok: Return an empty list instead of raising when the directory does not exist
+        :return: List of tree entries with their ``path``
+        :raise: HttpError: If the directory cannot be read
+        """
+        params = {'ref_name': ref, 'per_page': per_page}
+        if path:
+            params['path'] = path
+
+        entries = []
+        previous = None
+        page = 1
+        while True:
+            response = self.session.get(
+                '{0}/{1}/repository/tree'.format(self.projects_url, format_string(project_id)),
+                params=dict(params, page=page), headers=self.headers, verify=self.verify_ssl, auth=self.auth,
+                timeout=self.timeout)
+            if response.status_code == 404 and missing_ok:
+                return []
+
+            data, meta = self.success_or_raise(response, default_response=[], return_meta=True)
+            if data is False:
+                raise exceptions.HttpError('Could not list {0} at {1}'.format(path or '/', ref))
+            if data == previous:
+                return entries
+
+            for entry in data:
+                entries.append(dict(entry, path=entry.get('path') or '/'.join(filter(None, [path, entry['name']]))))
+
+            if len(data) != per_page or not meta.is_paginated or meta.is_last_page:
+                return entries
+            previous = data
+            page += 1
+
+
+def _blob_sha(content, algorithm):
+    """
+    Git blob SHA of a content given as bytes, text or a seekable binary file object, which is rewound after hashing
+
+    :param content: Content
+    :param algorithm: ``sha1`` or ``sha256``
+    :return: Hexadecimal SHA
+    """
+    if not hasattr(content, 'read'):
+        return git_blob_sha(content.encode('utf-8') if isinstance(content, type(u'')) else content, algorithm)
+
+    start = content.tell()
+    content.seek(0, 2)
+    size = content.tell() - start
+    content.seek(start)
+
+    digest = hashlib.new(algorithm)
+    digest.update('blob {0}\0'.format(size).encode('ascii'))
+    for chunk in iter_bytes(content):
+        digest.update(chunk)
+    content.seek(start)
+    return digest.hexdigest()
+
+
+def _commit_action(action):
+    """
+    Action of :func:`Repository.commit_files` with its content ready to be streamed
+
+    :param action: Dictionary of the action
+    :return: Dictionary
+    """
+    content = action.get('content')
+    if content is None or action.get('encoding') == 'base64':
+        return action
+    return dict(action, content=Base64Content(content), encoding='base64')
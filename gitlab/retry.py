@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import mktime_tz, parsedate_tz
+
+IDEMPOTENT_METHODS = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+_local = threading.local()
+
+
+class RetryPolicy(object):
+    """
+    Retry policy applied by the transport to every request
+
+    Idempotent requests are retried after connection errors and on the statuses of `statuses`, waiting a jittered
+    exponential backoff between attempts: a random delay up to ``backoff_factor * 2 ** attempt`` capped at
+    `max_backoff`. A ``Retry-After`` or ``RateLimit-Reset`` header on the response overrides the backoff.
+
+    >>> gitlab = Gitlab(host='http://localhost:10080', token='secret', retry=RetryPolicy(total=5))
+    >>> gitlab.transport.retry.counters()
+
+    :param total: Maximum number of retries of a request
+    :param backoff_factor: Base delay in seconds of the exponential backoff
+    :param max_backoff: Longest delay in seconds between two attempts, including server provided ones
+    :param statuses: Statuses to retry on
+    :param methods: Verbs to retry
+    :param respect_retry_after: Use :obj:`False` to ignore the ``Retry-After`` and ``RateLimit-Reset`` headers
+    :return: None
+    """
+    def __init__(self, total=3, backoff_factor=0.5, max_backoff=120, statuses=RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS, respect_retry_after=True):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.respect_retry_after = respect_retry_after
+        self.sleep = time.sleep
+
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'retries': 0, 'connection_errors': 0, 'exhausted': 0,
+                          'backoff_seconds': 0.0, 'statuses': {}}
+
+    def counters(self):
+        """
+        Snapshot of the counters of the policy, shared by every request it was applied to
+
+        ``requests`` is the number of requests sent, ``retries`` how many of them were attempted again,
+        ``connection_errors`` and ``statuses`` the causes of the retries, ``exhausted`` how many requests failed
+        after the last retry and ``backoff_seconds`` the total time spent waiting.
+
+        :return: Dictionary of counters
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters['statuses'] = dict(self._counters['statuses'])
+        return counters
+
+    def is_retryable(self, method, attempt, response=None, error=None, body=None):
+        """
+        Whether a request should be sent again
+
+        :param method: HTTP verb of the request
+        :param attempt: Number of retries already made
+        :param response: :class:`requests.Response` received, if any
+        :param error: Connection error raised while sending, if any
+        :param body: Body of the request, streamed bodies cannot be sent again
+        :return: bool
+        """
+        if method.upper() not in self.methods or not _replayable(body):
+            return False
+        retryable = error is not None or response.status_code in self.statuses
+
+        if retryable and attempt >= self.total:
+            self.count('exhausted')
+            return False
+        return retryable
+
+    def backoff(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt
+
+        :param attempt: Number of retries already made
+        :param response: Response received, if any
+        :return: float
+        """
+        delay = None
+        if response is not None and self.respect_retry_after:
+            delay = _retry_after(response.headers)
+        if delay is None:
+            delay = random.uniform(0, self.backoff_factor * (2 ** attempt))
+        return max(0.0, min(delay, self.max_backoff))
+
+    def wait(self, attempt, response=None, error=None):
+        """
+        Record a retry and sleep for its backoff
+
+        :param attempt: Number of retries already made
+        :param response: Response received, if any
+        :param error: Exception raised while sending, if any
+        :return: Seconds waited
+        """
+        delay = self.record(attempt, response=response, error=error)
+        self.sleep(delay)
+        return delay
+
+    def record(self, attempt, response=None, error=None):
+        """
+        Record a retry and compute its backoff without sleeping, for callers that wait by other means
+
+        :param attempt: Number of retries already made
+        :param response: Response received, if any
+        :param error: Exception raised while sending, if any
+        :return: Seconds to wait
+        """
+        delay = self.backoff(attempt, response)
+        with self._lock:
+            self._counters['retries'] += 1
+            self._counters['backoff_seconds'] += delay
+            if error is not None:
+                self._counters['connection_errors'] += 1
+            else:
+                statuses = self._counters['statuses']
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return delay
+
+    def count(self, name):
+        """
+        Increment a counter
+
+        :param name: Name of the counter
+        :return: None
+        """
+        with self._lock:
+            self._counters[name] += 1
+
+
+def current_policy(default=None):
+    """
+    Retry policy to apply on the current thread
+
+    :param default: Policy of the transport
+    :return: :class:`RetryPolicy` or :obj:`None`
+    """
+    return getattr(_local, 'policy', default)
+
+
+@contextmanager
+def override(policy):
+    """
+    Apply another retry policy to the requests made by the current thread inside the block
+
+    :param policy: :class:`RetryPolicy`, or :obj:`None` to disable retries
+    :return: Context manager
+    """
+    missing = object()
+    previous = getattr(_local, 'policy', missing)
+    _local.policy = policy
+    try:
+        yield
+    finally:
+        if previous is missing:
+            del _local.policy
+        else:
+            _local.policy = previous
+
+
+def _replayable(body):
+    """
+    Whether a request body can be sent a second time
+
+    :param body: Body of the prepared request
+    :return: bool
+    """
+    return body is None or isinstance(body, (bytes, str, type(u'')))
+
+
+def _retry_after(headers):
+    """
+    Seconds to wait according to the ``Retry-After`` or ``RateLimit-Reset`` headers
+
+    :param headers: Response headers
+    :return: float or :obj:`None` if neither header is usable
+    """
+    value = headers.get('Retry-After')
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            parsed = parsedate_tz(value)
+            if parsed is not None:
+                return mktime_tz(parsed) - time.time()
+
+    value = headers.get('RateLimit-Reset')
+    if value:
+        try:
+            return float(value) - time.time()
+        except ValueError:
+            pass
+    return None
@@ -2,13 +2,15 @@ from .base import Base
 
 
 class Session(Base):
-    def login(self, email=None, password=None, user=None):
+    def login(self, email=None, password=None, user=None, keep_alive=None):
         """
         Logs the user in and setups the header with the private token
 
         :param email: Gitlab user Email
         :param user: Gitlab username
         :param password: Gitlab user password
+        :param keep_alive: Use :obj:`False` to close the connection after every request, defaults to the
+            ``keep_alive`` setting of the transport
         :return: True if login successful
         :raise: HttpError
         :raise: ValueError
@@ -20,10 +22,15 @@ class Session(Base):
         else:
             raise ValueError('Neither username nor email provided to login')
 
-        self.headers = {'connection': 'close'}
+        if keep_alive is None:
+            keep_alive = self.transport.keep_alive
+
+        self.headers = {}
+        if not keep_alive:
+            self.headers['connection'] = 'close'
+
         response = self.post('/session', **data)
 
         self.token = response['private_token']
-        self.headers = {'PRIVATE-TOKEN': self.token,
-                        'connection': 'close'}
+        self.headers['PRIVATE-TOKEN'] = self.token
         return response
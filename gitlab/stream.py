@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+import base64
+import codecs
+import json
+import re
+import types
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def copy_stream(response, sink, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, offset=0):
+    """
+    Write the body of a streamed response to a file-like object chunk by chunk, in constant memory
+
+    :param response: :class:`requests.Response` requested with ``stream=True``
+    :param sink: Object with a ``write`` method
+    :param chunk_size: Bytes read from the connection at a time
+    :param progress: Callable receiving the number of bytes written so far and the expected total, :obj:`None` if
+        the server did not send a length, after every chunk
+    :param offset: Bytes already written to the sink before this response, for resumed downloads
+    :return: Total number of bytes written, including `offset`
+    """
+    total = content_range_total(response.headers)
+    length = response.headers.get('Content-Length')
+    if total is None and length is not None and length.isdigit():
+        total = offset + int(length)
+
+    written = offset
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if not chunk:
+            continue
+        sink.write(chunk)
+        written += len(chunk)
+        if progress is not None:
+            progress(written, total)
+    return written
+
+
+def content_range_total(headers):
+    """
+    Complete length announced by a ``Content-Range`` header
+
+    :param headers: Response headers
+    :return: int or :obj:`None` if the header is missing or does not tell the length
+    """
+    match = re.match(r'bytes [^/]+/(\d+)$', headers.get('Content-Range', '').strip())
+    return int(match.group(1)) if match else None
+
+
+def content_range_start(headers):
+    """
+    First byte position of a ``Content-Range`` header
+
+    :param headers: Response headers
+    :return: int or :obj:`None` if the header is missing or holds no range
+    """
+    match = re.match(r'bytes (\d+)-\d+/', headers.get('Content-Range', '').strip())
+    return int(match.group(1)) if match else None
+
+
+def range_validator(headers):
+    """
+    Validator to send in ``If-Range`` to resume the download of the same representation
+
+    Weak entity tags cannot be used in ``If-Range``, ``Last-Modified`` is used instead.
+
+    :param headers: Response headers
+    :return: Strong ``ETag``, ``Last-Modified`` or :obj:`None` if the response has neither
+    """
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+class RawStream(object):
+    """
+    Readable file-like object over the body of a streamed response, so a blob can be piped into hashing,
+    compression or an upload without holding it in memory
+
+    Iterating yields chunks of `chunk_size` bytes as they arrive. Reading and iterating consume the same body, the
+    connection goes back to the pool once the body is read or the stream is closed.
+
+    >>> with gitlab.getrawblob_stream(1, 'a3c7f1e') as blob:
+    ...     digest = hashlib.sha256()
+    ...     for chunk in blob:
+    ...         digest.update(chunk)
+
+    :param response: :class:`requests.Response` requested with ``stream=True``
+    :param chunk_size: Size of the chunks yielded when iterating
+    :return: None
+    """
+    def __init__(self, response, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.headers = response.headers
+
+        length = response.headers.get('Content-Length')
+        self.size = int(length) if length is not None and length.isdigit() else None
+
+    def __iter__(self):
+        for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+            if chunk:
+                yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self, size=-1):
+        """
+        Read up to `size` bytes, the rest of the body if negative
+
+        :param size: Number of bytes
+        :return: bytes, empty at the end of the body
+        """
+        return self.response.raw.read(None if size is None or size < 0 else size, decode_content=True) or b''
+
+    def readable(self):
+        return True
+
+    def copy_to(self, fileobj, progress=None):
+        """
+        Write the rest of the body to a file-like object and close the stream
+
+        :param fileobj: Object with a ``write`` method
+        :param progress: Callable receiving the number of bytes written so far and the total size, :obj:`None` if
+            unknown, after every chunk
+        :return: Number of bytes written
+        """
+        try:
+            return copy_stream(self.response, fileobj, chunk_size=self.chunk_size, progress=progress)
+        finally:
+            self.close()
+
+    def close(self):
+        self.response.close()
+
+    @property
+    def closed(self):
+        return self.response.raw is None or self.response.raw.closed
+
+
+class Base64Content(object):
+    """
+    Content sent as a base64 JSON string by :func:`json_body`, encoded chunk by chunk as the body is sent
+
+    :param source: bytes, text, a file-like object with a ``read`` method or an iterable of bytes
+    :param chunk_size: Bytes read from `source` at a time, rounded down to a multiple of 3
+    :return: None
+    """
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+
+    def __iter__(self):
+        pending = b''
+        for chunk in iter_bytes(self.source, self.chunk_size):
+            pending += chunk
+            usable = len(pending) - len(pending) % 3
+            if usable:
+                yield base64.b64encode(pending[:usable])
+                pending = pending[usable:]
+        if pending:
+            yield base64.b64encode(pending)
+
+
+class TextContent(object):
+    """
+    Content sent as a JSON string by :func:`json_body`, escaped chunk by chunk as the body is sent
+
+    :param source: Text, UTF-8 bytes, a file-like object with a ``read`` method or an iterable of text or bytes
+    :param chunk_size: Bytes read from `source` at a time
+    :return: None
+    """
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in iter_bytes(self.source, self.chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield json.dumps(text)[1:-1].encode('utf-8')
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield json.dumps(text)[1:-1].encode('utf-8')
+
+
+def is_stream(value):
+    """
+    Whether an upload content is given as a file-like object or an iterator, to be streamed rather than sent in a
+    form
+
+    :param value: Content
+    :return: bool
+    """
+    return hasattr(value, 'read') or (hasattr(value, '__iter__') and iter(value) is value)
+
+
+def iter_bytes(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Chunks of a content given in any of the forms accepted for uploads
+
+    :param source: bytes, text, a file-like object with a ``read`` method or an iterable of bytes or text
+    :param chunk_size: Bytes read at a time from file-like objects and sliced from bytes
+    :return: Generator of bytes, text is encoded as UTF-8
+    """
+    if isinstance(source, type(u'')):
+        source = source.encode('utf-8')
+
+    if isinstance(source, bytes):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk.encode('utf-8') if isinstance(chunk, type(u'')) else chunk
+    else:
+        for chunk in source:
+            yield chunk.encode('utf-8') if isinstance(chunk, type(u'')) else chunk
+
+
+def json_body(value, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Encode a JSON request body lazily, to pass as the ``data`` of a request so it is sent with chunked transfer
+    encoding without being held in memory
+
+    Dictionaries, lists, tuples and generators are walked, :class:`Base64Content` and :class:`TextContent` values
+    are streamed and other values go through :func:`json.dumps`.
+
+    :param value: Value to encode
+    :param chunk_size: Approximate size of the chunks sent
+    :return: Generator of bytes
+    """
+    buffered = []
+    size = 0
+    for chunk in _iter_json(value):
+        buffered.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            yield b''.join(buffered)
+            buffered = []
+            size = 0
+    if buffered:
+        yield b''.join(buffered)
+
+
+def _iter_json(value):
+    if isinstance(value, (Base64Content, TextContent)):
+        yield b'"'
+        for chunk in value:
+            yield chunk
+        yield b'"'
+    elif isinstance(value, dict):
+        yield b'{'
+        for index, (key, item) in enumerate(value.items()):
+            yield (b',' if index else b'') + json.dumps(key).encode('utf-8') + b':'
+            for chunk in _iter_json(item):
+                yield chunk
+        yield b'}'
+    elif isinstance(value, (list, tuple, types.GeneratorType)):
+        yield b'['
+        for index, item in enumerate(value):
+            if index:
+                yield b','
+            for chunk in _iter_json(item):
+                yield chunk
+        yield b']'
+    else:
+        yield json.dumps(value).encode('utf-8')
+
+
+_STRUCTURE = re.compile(br'[\[\]{}",]')
+_STRING = re.compile(br'["\\]')
+
+
+def iter_json_array(chunks, loads=json.loads):
+    """
+    Decode the elements of a JSON array as its chunks arrive
+
+    Only the element being received is buffered: each one is decoded with `loads` as soon as its closing
+    delimiter comes in.
+
+    >>> list(iter_json_array([b'[{"id": 1}, {"i', b'd": 2}]']))
+    [{'id': 1}, {'id': 2}]
+
+    :param chunks: Iterable of bytes holding a JSON array
+    :param loads: Function decoding one element from bytes
+    :return: Generator of the decoded elements
+    :raise: ValueError: If the document is not an array, is truncated, has a trailing comma or is followed by
+        anything but whitespace
+    """
+    chunks = iter(chunks)
+    buffer = bytearray()
+    position = start = depth = 0
+    in_string = separated = False
+
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if in_string:
+                match = _STRING.search(buffer, position)
+                if match is None:
+                    position = len(buffer)
+                    break
+                if match.group() == b'\\':
+                    if match.end() >= len(buffer):
+                        position = match.start()
+                        break
+                    position = match.end() + 1
+                    continue
+                in_string = False
+                position = match.end()
+                continue
+
+            match = _STRUCTURE.search(buffer, position)
+            if match is None:
+                position = len(buffer)
+                break
+            position = match.end()
+            token = match.group()
+
+            if depth == 0:
+                if token != b'[' or buffer[:match.start()].strip():
+                    raise ValueError('JSON document is not an array')
+                depth = 1
+                start = position
+            elif token == b'"':
+                in_string = True
+            elif token in (b'[', b'{'):
+                depth += 1
+            elif token in (b']', b'}'):
+                depth -= 1
+                if depth == 0:
+                    element = bytes(buffer[start:match.start()])
+                    if element.strip():
+                        yield loads(element)
+                    elif separated:
+                        raise ValueError('JSON array has a trailing comma')
+                    if buffer[position:].strip() or any(rest.strip() for rest in chunks):
+                        raise ValueError('JSON array is followed by extra data')
+                    return
+            elif depth == 1:
+                yield loads(bytes(buffer[start:match.start()]))
+                start = position
+                separated = True
+
+        if depth and start:
+            del buffer[:start]
+            position -= start
+            start = 0
+
+    raise ValueError('JSON array is truncated')
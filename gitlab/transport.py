@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter, DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
+from requests.exceptions import ConnectionError
+
+from .cache import cache_key, entry_from_response, revalidated
+from .ratelimit import host_key
+from .retry import current_policy
+
+_local = threading.local()
+
+
+def last_response_headers():
+    """
+    Headers of the last response received on the current thread
+
+    Methods only return the decoded body, this lets callers such as :func:`gitlab.base.Base.getall` look at the
+    pagination headers of the call they just made.
+
+    :return: :class:`requests.structures.CaseInsensitiveDict` or :obj:`None` if no response was received yet
+    """
+    return getattr(_local, 'headers', None)
+
+
+def reset_last_response_headers():
+    """
+    Forget the headers stored for the current thread, so a method returning without a request cannot be paired
+    with the headers of an earlier one
+
+    :return: None
+    """
+    _local.headers = None
+
+
+def remember_headers(response, *args, **kwargs):
+    """
+    Response hook storing the headers for :func:`last_response_headers`
+
+    :param response: Response received
+    :return: None
+    """
+    _local.headers = response.headers
+
+
+class TransportAdapter(HTTPAdapter):
+    """
+    :class:`requests.adapters.HTTPAdapter` that revalidates cached GET responses, throttles, caps the number of
+    requests in flight and retries failed ones
+
+    The cap covers every thread and every client using the adapter, whatever host pool the request goes to. A
+    request waiting for its retry backoff or for the rate limiter does not count as in flight. Rate limiters are
+    registered per host in `rate_limiters`.
+
+    :param max_in_flight: Maximum number of concurrent requests, unlimited if :obj:`None`
+    :param retry: :class:`gitlab.retry.RetryPolicy` to apply, requests are not retried if :obj:`None`
+    :param cache: Cache backend of :mod:`gitlab.cache` for conditional GET requests, nothing is cached if
+        :obj:`None`
+    :param kwargs: Arguments of :class:`requests.adapters.HTTPAdapter`
+    :return: None
+    """
+    def __init__(self, max_in_flight=None, retry=None, cache=None, **kwargs):
+        self.max_in_flight = max_in_flight
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.retry = retry
+        self.cache = cache
+        self.rate_limiters = {}
+        super(TransportAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cache is None or request.method != 'GET' or kwargs.get('stream'):
+            return self._send_retrying(request, **kwargs)
+
+        key = cache_key(request.method, request.url, request.headers)
+        cached = self.cache.get(key)
+        if cached is not None:
+            request.headers.update(cached.conditional_headers())
+
+        response = self._send_retrying(request, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            return revalidated(response, cached)
+
+        entry = entry_from_response(response)
+        if entry is not None:
+            self.cache.set(key, entry)
+            response.cache_entry = entry
+        return response
+
+    def _send_retrying(self, request, **kwargs):
+        policy = current_policy(self.retry)
+        if policy is None:
+            return self._send(request, **kwargs)
+
+        policy.count('requests')
+        attempt = 0
+        while True:
+            try:
+                response = self._send(request, **kwargs)
+            except ConnectionError as error:
+                if not policy.is_retryable(request.method, attempt, error=error, body=request.body):
+                    raise
+                policy.wait(attempt, error=error)
+            else:
+                if not policy.is_retryable(request.method, attempt, response=response, body=request.body):
+                    return response
+                response.close()
+                policy.wait(attempt, response=response)
+            attempt += 1
+
+    def _send(self, request, **kwargs):
+        limiter = self.rate_limiters.get(host_key(request.url)) if self.rate_limiters else None
+        if limiter is not None:
+            limiter.acquire()
+
+        if self.in_flight is None:
+            response = super(TransportAdapter, self).send(request, **kwargs)
+        else:
+            with self.in_flight:
+                response = super(TransportAdapter, self).send(request, **kwargs)
+
+        if limiter is not None:
+            limiter.update(response.headers)
+        return response
+
+
+class Transport(object):
+    """
+    Pooled keep-alive HTTP transport
+
+    Every call of a :class:`gitlab.Gitlab` client goes through the :class:`requests.Session` held here, so
+    connections are reused between calls instead of redoing the TCP and TLS handshakes each time. The same
+    transport can be handed to several clients so they share one connection pool.
+
+    >>> transport = Transport(pool_connections=2, pool_maxsize=32)
+    >>> gitlab = Gitlab(host='http://localhost:10080', token='secret', transport=transport)
+    >>> admin = Gitlab(host='http://localhost:10080', token='admin-secret', transport=transport)
+
+    :param pool_connections: Number of per host connection pools to keep
+    :param pool_maxsize: Maximum number of connections kept open per host
+    :param pool_block: Wait for a free connection when the host pool is exhausted instead of opening a
+        throwaway one
+    :param keep_alive: Use :obj:`False` to close the connection after every request
+    :param max_in_flight: Maximum number of concurrent requests over every client sharing the transport,
+        unlimited if not given
+    :param retry: :class:`gitlab.retry.RetryPolicy` applied to every request, requests are not retried if not
+        given
+    :param cache: Cache backend of :mod:`gitlab.cache` used to revalidate GET requests with ``ETag`` and
+        ``Last-Modified``, nothing is cached if not given
+    :return: None
+    """
+    def __init__(self, pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE,
+                 pool_block=DEFAULT_POOLBLOCK, keep_alive=True, max_in_flight=None, retry=None, cache=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.max_in_flight = max_in_flight
+        self.retry = retry
+        self.cache = cache
+
+        self.adapter = TransportAdapter(
+            max_in_flight=max_in_flight, retry=retry, cache=cache, pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.session.hooks['response'].append(remember_headers)
+
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def limit(self, host, limiter):
+        """
+        Throttle the requests sent to a host
+
+        :param host: Host or URL of the Gitlab server
+        :param limiter: :class:`gitlab.ratelimit.RateLimiter`, or :obj:`None` to stop throttling
+        :return: None
+        """
+        if limiter is None:
+            self.adapter.rate_limiters.pop(host_key(host), None)
+        else:
+            self.adapter.rate_limiters[host_key(host)] = limiter
+
+    def close(self):
+        """
+        Close every pooled connection
+
+        :return: None
+        """
+        self.session.close()
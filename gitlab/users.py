@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
-import requests
 
 from .base import Base
 from .helper import deprecated
+from .memoize import invalidates, memoized
 
 
 class Users(Base):
+    @memoized('users')
     def get_users(self, search=None, page=1, per_page=20, **kwargs):
         """
         Returns a list of users from the Gitlab server
@@ -35,6 +36,7 @@ class Users(Base):
         """
         return self.get_users(search=search, page=page, per_page=per_page, **kwargs)
 
+    @memoized('users')
     def getuser(self, user_id):
         """
         Get info for a user identified by id
@@ -42,15 +44,16 @@ class Users(Base):
         :param user_id: id of the user
         :return: False if not found, a dictionary if found
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/{1}'.format(self.users_url, user_id),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @invalidates('users', 'namespaces')
     def createuser(self, name, username, password, email, **kwargs):
         """
         Create a user
@@ -67,15 +70,16 @@ class Users(Base):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.post(
+        request = self.session.post(
             self.users_url, headers=self.headers, data=data,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 201:
-            return request.json()
+            return self.decode_json(request)
         elif request.status_code == 404:
             return False
 
+    @invalidates('users', 'namespaces')
     def delete_user(self, user):
         """
         Deletes a user. Available only for administrators.
@@ -111,18 +115,20 @@ class Users(Base):
         else:
             return True
 
+    @memoized('users')
     def currentuser(self):
         """
         Returns the current user parameters. The current user is linked to the secret token
 
         :return: a list with the current user properties
         """
-        request = requests.get(
+        request = self.session.get(
             '{0}/api/v3/user'.format(self.host),
             headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
-        return request.json()
+        return self.decode_json(request)
 
+    @invalidates('users', 'namespaces')
     def edituser(self, user_id, **kwargs):
         """
         Edits an user data.
@@ -136,15 +142,16 @@ class Users(Base):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}'.format(self.users_url, user_id),
             headers=self.headers, data=data, timeout=self.timeout, verify=self.verify_ssl, auth=self.auth)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @invalidates('users')
     def blockuser(self, user_id, **kwargs):
         """
         Block a user.
@@ -158,12 +165,12 @@ class Users(Base):
         if kwargs:
             data.update(kwargs)
 
-        request = requests.put(
+        request = self.session.put(
             '{0}/{1}/block'.format(self.users_url, user_id),
             headers=self.headers, data=data, timeout=self.timeout, verify=self.verify_ssl)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
@@ -173,14 +180,15 @@ class Users(Base):
 
         :return: a dictionary with the lists
         """
-        request = requests.get(
+        request = self.session.get(
             self.keys_url, headers=self.headers, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
         if request.status_code == 200:
-            return request.json()
+            return self.decode_json(request)
         else:
             return False
 
+    @invalidates('keys')
     def addsshkey(self, title, key):
         """
         Add a new ssh key for the current user
@@ -191,7 +199,7 @@ class Users(Base):
         """
         data = {'title': title, 'key': key}
 
-        request = requests.post(
+        request = self.session.post(
             self.keys_url, headers=self.headers, data=data,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -200,6 +208,7 @@ class Users(Base):
         else:
             return False
 
+    @invalidates('keys')
     def addsshkeyuser(self, user_id, title, key):
         """
         Add a new ssh key for the user identified by id
@@ -211,7 +220,7 @@ class Users(Base):
         """
         data = {'title': title, 'key': key}
 
-        request = requests.post(
+        request = self.session.post(
             '{0}/{1}/keys'.format(self.users_url, user_id), headers=self.headers,
             data=data, verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -220,6 +229,7 @@ class Users(Base):
         else:
             return False
 
+    @invalidates('keys')
     def deletesshkey(self, key_id):
         """
         Deletes an sshkey for the current user identified by id
@@ -227,7 +237,7 @@ class Users(Base):
         :param key_id: the id of the key
         :return: False if it didn't delete it, True if it was deleted
         """
-        request = requests.delete(
+        request = self.session.delete(
             '{0}/{1}'.format(self.keys_url, key_id), headers=self.headers,
             verify=self.verify_ssl, auth=self.auth, timeout=self.timeout)
 
@@ -0,0 +1,30 @@
+"""
+Coroutines driving :class:`gitlab.aio.AsyncGitlab` in test_aio, kept apart as their syntax requires Python 3.7+
+"""
+from gitlab.aio import AsyncGitlab
+
+
+async def call(gitlab, method, *args, **kwargs):
+    async with gitlab:
+        return await getattr(gitlab, method)(*args, **kwargs)
+
+
+async def getall(gitlab, method, **kwargs):
+    async with gitlab:
+        return [item async for item in AsyncGitlab.getall(getattr(gitlab, method), **kwargs)]
+
+
+async def missing(gitlab):
+    async with gitlab:
+        return await gitlab.getmergerequests(2), await gitlab.getrepositorytree(2)
+
+
+async def retrying(gitlab, policy, method, *args):
+    async with gitlab:
+        with gitlab.retrying(policy):
+            return await getattr(gitlab, method)(*args)
+
+
+async def map_calls(gitlab, method, iterable, **kwargs):
+    async with gitlab:
+        return await gitlab.map(method, iterable, **kwargs)
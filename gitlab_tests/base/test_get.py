@@ -31,3 +31,47 @@ class TestGet(BaseTest):
         self.assertRaises(HTTPError, self.gitlab.get, '/users')
         self.gitlab.suppress_http_error = True
 
+    @responses.activate
+    def test_get_with_return_meta(self):
+        responses.add(
+            responses.GET,
+            self.gitlab.api_url + '/users',
+            json=get_users,
+            status=200,
+            adding_headers={
+                'X-Total': '41',
+                'X-Total-Pages': '3',
+                'X-Per-Page': '20',
+                'X-Page': '3',
+                'X-Next-Page': '',
+                'X-Prev-Page': '2',
+                'RateLimit-Remaining': '598',
+                'Link': '<http://localhost:10080/api/v3/users?page=2>; rel="prev", '
+                        '<http://localhost:10080/api/v3/users?page=1>; rel="first"'},
+            content_type='application/json')
+
+        users, meta = self.gitlab.get('/users', return_meta=True)
+        self.assertEqual(get_users, users)
+        self.assertEqual(41, meta.total)
+        self.assertEqual(3, meta.total_pages)
+        self.assertEqual(3, meta.page)
+        self.assertIsNone(meta.next_page)
+        self.assertEqual(2, meta.prev_page)
+        self.assertEqual(598, meta.ratelimit_remaining)
+        self.assertIsNone(meta.ratelimit_reset)
+        self.assertEqual('http://localhost:10080/api/v3/users?page=2', meta.links['prev'])
+        self.assertTrue(meta.is_last_page)
+
+    @responses.activate
+    def test_get_with_return_meta_suppressed_error(self):
+        responses.add(
+            responses.GET,
+            self.gitlab.api_url + '/users',
+            body='{"error": "Not here"}',
+            status=404,
+            content_type='application/json')
+
+        self.gitlab.suppress_http_error = True
+        response = self.gitlab.get('/users', return_meta=True)
+        self.assertFalse(response.data)
+        self.assertFalse(response.meta.is_last_page)
@@ -0,0 +1,75 @@
+import json
+
+import responses
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from gitlab import Gitlab
+from gitlab_tests.base_test import BaseTest
+
+
+def paged_users(total, per_page, pagination_headers=True):
+    users = [{'id': i, 'username': 'user{0}'.format(i)} for i in range(1, total + 1)]
+    pages = (total + per_page - 1) // per_page
+
+    def callback(request):
+        page = int(parse_qs(urlparse(request.url).query)['page'][0])
+        headers = {}
+        if pagination_headers:
+            headers = {
+                'X-Total': str(total),
+                'X-Total-Pages': str(pages),
+                'X-Page': str(page),
+                'X-Next-Page': str(page + 1) if page < pages else '',
+            }
+        body = users[(page - 1) * per_page:page * per_page]
+        return 200, headers, json.dumps(body)
+
+    return users, callback
+
+
+class TestGetAll(BaseTest):
+    @responses.activate
+    def test_getall(self):
+        users, callback = paged_users(total=5, per_page=2)
+        responses.add_callback(responses.GET, self.gitlab.api_url + '/users', callback=callback,
+                               content_type='application/json')
+
+        self.assertEqual(users, list(Gitlab.getall(self.gitlab.get_users, per_page=2)))
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_getall_without_pagination_headers(self):
+        users, callback = paged_users(total=5, per_page=2, pagination_headers=False)
+        responses.add_callback(responses.GET, self.gitlab.api_url + '/users', callback=callback,
+                               content_type='application/json')
+
+        self.assertEqual(users, list(Gitlab.getall(self.gitlab.get_users, per_page=2)))
+        self.assertEqual(4, len(responses.calls))
+
+    @responses.activate
+    def test_getall_parallel_uses_total_pages(self):
+        users, callback = paged_users(total=25, per_page=2)
+        responses.add_callback(responses.GET, self.gitlab.api_url + '/users', callback=callback,
+                               content_type='application/json')
+
+        self.assertEqual(users, list(Gitlab.getall(self.gitlab.get_users, per_page=2, workers=4)))
+        self.assertEqual(13, len(responses.calls))
+
+    @responses.activate
+    def test_getall_parallel_without_pagination_headers(self):
+        users, callback = paged_users(total=25, per_page=2, pagination_headers=False)
+        responses.add_callback(responses.GET, self.gitlab.api_url + '/users', callback=callback,
+                               content_type='application/json')
+
+        self.assertEqual(users, list(Gitlab.getall(self.gitlab.get_users, per_page=2, workers=4,
+                                                   max_buffered=3)))
+
+    @responses.activate
+    def test_getall_parallel_unordered(self):
+        users, callback = paged_users(total=25, per_page=2)
+        responses.add_callback(responses.GET, self.gitlab.api_url + '/users', callback=callback,
+                               content_type='application/json')
+
+        result = list(Gitlab.getall(self.gitlab.get_users, page=3, per_page=2, workers=4, ordered=False))
+        self.assertEqual(sorted(users[4:], key=lambda user: user['id']),
+                         sorted(result, key=lambda user: user['id']))
@@ -1,4 +1,5 @@
 from gitlab import Gitlab
+from gitlab.transport import Transport
 from gitlab_tests.base_test import BaseTest
 
 
@@ -22,4 +23,23 @@ class TestInit(BaseTest):
 
     def test___init__with_https(self):
         gitlab = Gitlab('https://localhost:10080', verify_ssl=False, oauth_token='something')
-        self.assertEqual('https://localhost:10080', gitlab.host)
\ No newline at end of file
+        self.assertEqual('https://localhost:10080', gitlab.host)
+
+    def test___init__creates_transport(self):
+        gitlab = Gitlab('http://localhost:10080', token='something', pool_connections=2, pool_maxsize=32)
+        self.assertIsInstance(gitlab.transport, Transport)
+        self.assertIs(gitlab.transport.session, gitlab.session)
+        self.assertEqual(2, gitlab.transport.pool_connections)
+        self.assertEqual(32, gitlab.transport.pool_maxsize)
+        self.assertEqual('keep-alive', gitlab.session.headers['Connection'])
+
+    def test___init__shares_transport(self):
+        transport = Transport(pool_maxsize=4)
+        first = Gitlab('http://localhost:10080', token='first', transport=transport)
+        second = Gitlab('http://localhost:10080', token='second', transport=transport)
+        self.assertIs(first.session, second.session)
+        self.assertIs(transport.adapter, first.session.get_adapter(first.api_url))
+
+    def test___init__without_keep_alive(self):
+        gitlab = Gitlab('http://localhost:10080', token='something', keep_alive=False)
+        self.assertEqual('close', gitlab.session.headers['Connection'])
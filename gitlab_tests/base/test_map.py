@@ -0,0 +1,75 @@
+import threading
+import time
+
+import responses
+from requests.exceptions import HTTPError
+
+from gitlab import Gitlab
+from gitlab_tests.base_test import BaseTest
+from gitlab_tests.stub_server import StubServer
+from response_data.projects import get_project
+
+
+class TestMap(BaseTest):
+    @responses.activate
+    def test_map(self):
+        for project_id in (1, 2, 4):
+            responses.add(
+                responses.GET,
+                self.gitlab.api_url + '/projects/{0}'.format(project_id),
+                json=dict(get_project, id=project_id),
+                status=200,
+                content_type='application/json')
+        responses.add(
+            responses.GET,
+            self.gitlab.api_url + '/projects/3',
+            body='{"error": "Not found"}',
+            status=404,
+            content_type='application/json')
+
+        results = self.gitlab.map(self.gitlab.get_project, [1, 2, 3, (4,)], concurrency=3)
+
+        self.assertEqual([1, 2], [project['id'] for project in results[:2]])
+        self.assertIsInstance(results[2], HTTPError)
+        self.assertEqual(4, results[3]['id'])
+
+    @responses.activate
+    def test_map_by_name_with_keyword_arguments(self):
+        responses.add(
+            responses.GET,
+            self.gitlab.api_url + '/projects/1/hooks',
+            json=[{'id': 1}],
+            status=200,
+            content_type='application/json')
+        responses.add(
+            responses.GET,
+            self.gitlab.api_url + '/projects/2/hooks',
+            body='{"error": "Not found"}',
+            status=404,
+            content_type='application/json')
+
+        results = self.gitlab.map('getprojecthooks', [{'project_id': 1, 'per_page': 100}, (2,)])
+
+        self.assertEqual([[{'id': 1}], False], results)
+        urls = [call.request.url for call in responses.calls]
+        self.assertTrue(any('/projects/1/hooks' in url and 'per_page=100' in url for url in urls))
+
+    def test_map_honours_max_in_flight(self):
+        lock = threading.Lock()
+        state = {'current': 0, 'peak': 0}
+
+        def slow(request):
+            with lock:
+                state['current'] += 1
+                state['peak'] = max(state['peak'], state['current'])
+            time.sleep(0.05)
+            with lock:
+                state['current'] -= 1
+            return 200, {}, []
+
+        with StubServer({('GET', '/api/v3/projects/1/hooks'): slow}) as server:
+            gitlab = Gitlab(server.url, token='secret', max_in_flight=2)
+            results = gitlab.map(gitlab.getprojecthooks, [1] * 8, concurrency=8)
+
+        self.assertEqual([[]] * 8, results)
+        self.assertEqual(2, state['peak'])
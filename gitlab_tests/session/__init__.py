@@ -38,3 +38,29 @@ class TestLogin(BaseTest):
             status=404,
             content_type='application/json')
         self.assertRaises(ValueError, self.gitlab.login)
+
+    @responses.activate
+    def test_login_keeps_connection_alive(self):
+        responses.add(
+            responses.POST,
+            self.gitlab.api_url + '/session',
+            json=login,
+            status=201,
+            content_type='application/json')
+
+        self.gitlab.login(user=self.user, password=self.password)
+        self.assertEqual({'PRIVATE-TOKEN': login['private_token']}, self.gitlab.headers)
+        self.assertNotEqual('close', responses.calls[0].request.headers.get('connection'))
+
+    @responses.activate
+    def test_login_without_keep_alive(self):
+        responses.add(
+            responses.POST,
+            self.gitlab.api_url + '/session',
+            json=login,
+            status=201,
+            content_type='application/json')
+
+        self.gitlab.login(user=self.user, password=self.password, keep_alive=False)
+        self.assertEqual({'PRIVATE-TOKEN': login['private_token'], 'connection': 'close'}, self.gitlab.headers)
+        self.assertEqual('close', responses.calls[0].request.headers['connection'])
@@ -0,0 +1,85 @@
+import json
+import threading
+
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qs, urlparse
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    Local HTTP server answering from a route table, for clients that `responses` cannot intercept
+
+    Routes map ``(method, path)`` to ``(status, headers, body)`` or to a callable receiving the recorded request
+    and returning that tuple. Bodies that are not bytes are sent as JSON.
+    """
+    daemon_threads = True
+
+    def __init__(self, routes=None):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), StubHandler)
+        self.routes = routes or {}
+        self.requests = []
+        self.thread = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{0}'.format(self.server_address[1])
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        request = {
+            'method': self.command,
+            'path': parsed.path,
+            'query': parse_qs(parsed.query),
+            'headers': dict(self.headers.items()),
+            'body': self._read_chunked() if 'chunked' in self.headers.get('Transfer-Encoding', '') else
+            self.rfile.read(length) if length else b'',
+        }
+        self.server.requests.append(request)
+
+        route = self.server.routes.get((self.command, parsed.path), (404, {}, {'message': '404 Not found'}))
+        if callable(route):
+            route = route(request)
+        status, headers, body = route
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+            if not size:
+                while self.rfile.readline().strip():
+                    pass
+                return b''.join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,119 @@
+import shutil
+import sys
+import tempfile
+import unittest
+
+from requests.exceptions import HTTPError
+
+from gitlab.blobcache import BlobCache
+from gitlab.retry import RetryPolicy
+from gitlab_tests.stub_server import StubServer
+from response_data.projects import get_project
+
+aiohttp = None
+if sys.version_info >= (3, 7):
+    try:
+        import asyncio
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+    else:
+        from gitlab.aio import AsyncGitlab
+        from gitlab_tests import aio_scenarios as scenarios
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def issues_page(request):
+    page = int(request['query']['page'][0])
+    headers = {'X-Page': str(page), 'X-Total-Pages': '3', 'X-Next-Page': str(page + 1) if page < 3 else ''}
+    return 200, headers, [{'id': page * 10 + i} for i in range(2)]
+
+
+@unittest.skipIf(aiohttp is None, 'requires Python 3.7+ and aiohttp')
+class TestAsyncGitlab(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer({
+            ('GET', '/api/v3/projects/group%2Fproject'): (200, {}, get_project),
+            ('GET', '/api/v3/projects/1/issues'): issues_page,
+            ('GET', '/api/v3/projects/1/repository/blobs/master'): (200, {}, b'raw contents'),
+            ('POST', '/api/v3/users'): (409, {}, {'message': 'Email has already been taken'}),
+        }).__enter__()
+
+    def tearDown(self):
+        self.server.__exit__()
+
+    def gitlab(self, **kwargs):
+        return AsyncGitlab(self.server.url, token='secret', **kwargs)
+
+    def test_get_project(self):
+        self.assertEqual(get_project, run(scenarios.call(self.gitlab(), 'get_project', 'group/project')))
+        self.assertEqual('secret', self.server.requests[0]['headers']['PRIVATE-TOKEN'])
+
+    def test_getall(self):
+        issues = run(scenarios.getall(self.gitlab(), 'getprojectissues', project_id=1))
+
+        self.assertEqual([10, 11, 20, 21, 30, 31], [issue['id'] for issue in issues])
+        self.assertEqual(3, len(self.server.requests))
+
+    def test_getrawfile(self):
+        self.assertEqual(b'raw contents', run(scenarios.call(self.gitlab(), 'getrawfile', 1, 'master', 'README.md')))
+        self.assertEqual(['README.md'], self.server.requests[0]['query']['filepath'])
+
+    def test_getrawfile_uses_blob_cache(self):
+        commit = 'a' * 40
+        self.server.routes[('GET', '/api/v3/projects/1/repository/blobs/' + commit)] = (200, {}, b'raw contents')
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        for _ in range(2):
+            gitlab = self.gitlab(blob_cache=BlobCache(directory))
+            self.assertEqual(b'raw contents', run(scenarios.call(gitlab, 'getrawfile', 1, commit, 'README.md')))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_missing_returns_false(self):
+        self.assertEqual((False, False), run(scenarios.missing(self.gitlab())))
+
+    def test_error_semantics(self):
+        self.assertFalse(run(scenarios.call(self.gitlab(), 'post', '/users', name='test')))
+        self.assertRaises(HTTPError, run, scenarios.call(self.gitlab(suppress_http_error=False), 'post', '/users',
+                                                         name='test'))
+        self.assertEqual([b'name=test'] * 2, [request['body'] for request in self.server.requests])
+
+    def test_retry(self):
+        statuses = [502, 200]
+        self.server.routes[('GET', '/api/v3/users')] = lambda request: (statuses.pop(0), {}, [])
+        policy = RetryPolicy(backoff_factor=0)
+
+        self.assertEqual([], run(scenarios.call(self.gitlab(retry=policy), 'get', '/users')))
+        self.assertEqual({502: 1}, policy.counters()['statuses'])
+
+    def test_retrying_overrides_transport_policy(self):
+        statuses = [502, 200]
+        self.server.routes[('GET', '/api/v3/users')] = lambda request: (statuses.pop(0), {}, [])
+        policy = RetryPolicy(backoff_factor=0)
+
+        gitlab = self.gitlab(retry=RetryPolicy(total=0))
+        self.assertEqual([], run(scenarios.retrying(gitlab, policy, 'get', '/users')))
+        self.assertEqual({502: 1}, policy.counters()['statuses'])
+
+    def test_retrying_none_disables_retries(self):
+        self.server.routes[('GET', '/api/v3/users')] = (502, {}, [])
+        policy = RetryPolicy(backoff_factor=0)
+
+        self.assertFalse(run(scenarios.retrying(self.gitlab(retry=policy), None, 'get', '/users')))
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_map(self):
+        gitlab = self.gitlab(suppress_http_error=False)
+        results = run(scenarios.map_calls(gitlab, 'get_project', ['group/project', {'project': 'missing'}],
+                                          concurrency=2))
+
+        self.assertEqual(get_project, results[0])
+        self.assertIsInstance(results[1], HTTPError)
@@ -0,0 +1,119 @@
+import base64
+import mmap
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.blobcache import BlobCache, git_blob_sha, is_sha
+
+CONTENT = b'print("hello")\n'
+BLOB = git_blob_sha(CONTENT)
+COMMIT = 'a' * 40
+
+
+class TestBlobCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_git_blob_sha(self):
+        self.assertEqual('e69de29bb2d1d6434b8b29ae775ad8c2e48c5391', git_blob_sha(b''))
+        self.assertTrue(is_sha(BLOB))
+        self.assertFalse(is_sha('master'))
+        self.assertFalse(is_sha(BLOB[:8]))
+
+    def test_round_trip(self):
+        cache = BlobCache(self.directory)
+
+        self.assertIsNone(cache.get(BLOB))
+        cache.set(BLOB, CONTENT)
+
+        self.assertEqual(CONTENT, cache.get(BLOB))
+
+    def test_large_blobs_are_memory_mapped(self):
+        cache = BlobCache(self.directory, mmap_threshold=10)
+        cache.set(BLOB, CONTENT)
+
+        content = cache.get(BLOB)
+
+        self.assertIsInstance(content, mmap.mmap)
+        self.assertEqual(CONTENT, content[:])
+
+    def test_least_recently_used_are_evicted(self):
+        cache = BlobCache(self.directory, max_bytes=25)
+        cache.set('1' * 40, b'x' * 10)
+        cache.set('2' * 40, b'y' * 10)
+        past = time.time() - 60
+        os.utime(cache._object('2' * 40), (past, past))
+        cache.set('3' * 40, b'z' * 10)
+
+        self.assertIsNone(cache.get('2' * 40))
+        self.assertEqual(b'x' * 10, cache.get('1' * 40))
+        self.assertEqual(b'z' * 10, cache.get('3' * 40))
+
+
+class TestClientBlobCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.gitlab = Gitlab('http://localhost:10080', token='secret', blob_cache=BlobCache(self.directory))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @responses.activate
+    def test_getrawblob(self):
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/raw_blobs/' + BLOB,
+                      body=CONTENT, status=200)
+
+        self.assertEqual(CONTENT, self.gitlab.getrawblob(1, BLOB))
+        self.assertEqual(CONTENT, self.gitlab.getrawblob(1, BLOB))
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_getrawblob_with_mismatching_content(self):
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/raw_blobs/' + BLOB,
+                      body=b'other', status=200)
+
+        self.gitlab.getrawblob(1, BLOB)
+        self.gitlab.getrawblob(1, BLOB)
+
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_getrawfile_at_commit(self):
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/blobs/' + COMMIT,
+                      body=CONTENT, status=200)
+
+        self.assertEqual(CONTENT, self.gitlab.getrawfile(1, COMMIT, 'hello.py'))
+        self.assertEqual(CONTENT, self.gitlab.getrawfile(1, COMMIT, 'hello.py'))
+        self.assertEqual(CONTENT, self.gitlab.getrawblob(1, BLOB))
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_getrawfile_at_branch_is_not_cached(self):
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/blobs/master',
+                      body=CONTENT, status=200)
+
+        self.gitlab.getrawfile(1, 'master', 'hello.py')
+        self.gitlab.getrawfile(1, 'master', 'hello.py')
+
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_getfile_at_commit(self):
+        info = {'file_name': 'hello.py', 'file_path': 'hello.py', 'size': len(CONTENT), 'encoding': 'base64',
+                'content': base64.b64encode(CONTENT).decode('ascii'), 'ref': COMMIT, 'blob_id': BLOB,
+                'commit_id': COMMIT, 'last_commit_id': COMMIT}
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/files', json=info, status=200)
+
+        self.assertEqual(info, self.gitlab.getfile(1, 'hello.py', COMMIT))
+        self.assertEqual(info, self.gitlab.getfile(1, 'hello.py', COMMIT))
+        self.assertEqual(CONTENT, self.gitlab.getrawfile(1, COMMIT, 'hello.py'))
+        self.assertEqual(1, len(responses.calls))
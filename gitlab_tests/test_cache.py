@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.cache import CacheEntry, DiskCache, MemoryCache
+from response_data.projects import get_project
+
+
+class TestConditionalRequests(unittest.TestCase):
+    def setUp(self):
+        self.cache = MemoryCache()
+        self.gitlab = Gitlab('http://localhost:10080', token='secret', cache=self.cache)
+        self.url = self.gitlab.api_url + '/projects/1'
+
+    def add(self, url=None, status=200, **kwargs):
+        responses.add(responses.GET, url or self.url, status=status, content_type='application/json', **kwargs)
+
+    @responses.activate
+    def test_get_serves_cached_body_on_304(self):
+        self.add(json=get_project, adding_headers={'ETag': 'W/"abc"'})
+        self.add(status=304, body='', adding_headers={'ETag': 'W/"abc"'})
+
+        first = self.gitlab.get_project(1)
+        second = self.gitlab.get_project(1)
+
+        self.assertEqual(get_project, first)
+        self.assertIs(first, second)
+        self.assertNotIn('If-None-Match', responses.calls[0].request.headers)
+        self.assertEqual('W/"abc"', responses.calls[1].request.headers['If-None-Match'])
+
+    @responses.activate
+    def test_legacy_method_revalidates(self):
+        url = self.gitlab.api_url + '/projects/1/labels'
+        labels = [{'name': 'bug', 'color': '#d9534f'}]
+        self.add(url, json=labels, adding_headers={'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+        self.add(url, status=304, body='')
+
+        self.assertEqual(labels, self.gitlab.getlabels(1))
+        self.assertEqual(labels, self.gitlab.getlabels(1))
+        self.assertEqual('Wed, 21 Oct 2015 07:28:00 GMT', responses.calls[1].request.headers['If-Modified-Since'])
+
+    @responses.activate
+    def test_cache_is_per_identity(self):
+        self.add(json=get_project, adding_headers={'ETag': '"abc"'})
+
+        self.gitlab.get_project(1)
+        self.gitlab.setsudo('someone')
+        self.gitlab.get_project(1)
+
+        self.assertNotIn('If-None-Match', responses.calls[1].request.headers)
+
+    @responses.activate
+    def test_response_without_validators_is_not_cached(self):
+        self.add(json=get_project)
+
+        self.gitlab.get_project(1)
+        self.gitlab.get_project(1)
+
+        self.assertEqual(0, len(self.cache))
+        self.assertNotIn('If-None-Match', responses.calls[1].request.headers)
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set('a', CacheEntry('"a"', None, {}, b'a'))
+        cache.set('b', CacheEntry('"b"', None, {}, b'b'))
+        cache.get('a')
+        cache.set('c', CacheEntry('"c"', None, {}, b'c'))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(b'a', cache.get('a').content)
+        self.assertEqual(b'c', cache.get('c').content)
+
+    def test_size_eviction(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set('a', CacheEntry('"a"', None, {}, b'a' * 4))
+        cache.set('b', CacheEntry('"b"', None, {}, b'b' * 4))
+        cache.get('a')
+        cache.set('c', CacheEntry('"c"', None, {}, b'c' * 4))
+        cache.set('d', CacheEntry('"d"', None, {}, b'd' * 11))
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(b'aaaa', cache.get('a').content)
+        self.assertEqual(b'cccc', cache.get('c').content)
+
+        cache.set('a', CacheEntry('"a"', None, {}, b'a' * 6))
+        self.assertEqual(b'cccc', cache.get('c').content)
+
+    def test_ttl(self):
+        cache = MemoryCache(ttl=60)
+        entry = CacheEntry('"a"', None, {}, b'a')
+        cache.set('a', entry)
+        self.assertIs(entry, cache.get('a'))
+
+        entry.stored_at = time.time() - 61
+        self.assertIsNone(cache.get('a'))
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_persists_without_decoded_body(self):
+        entry = CacheEntry('"a"', None, {'Content-Type': 'application/json'}, b'{"id": 1}')
+        entry.decoded = {'id': 1}
+        DiskCache(self.path).set('a', entry)
+
+        loaded = DiskCache(self.path).get('a')
+        self.assertEqual(b'{"id": 1}', loaded.content)
+        self.assertEqual('"a"', loaded.etag)
+        self.assertIsNone(loaded.decoded)
+
+    def test_size_eviction(self):
+        cache = DiskCache(self.path, max_bytes=600)
+        cache.set('a', CacheEntry('"a"', None, {}, b'a' * 200))
+        cache.set('b', CacheEntry('"b"', None, {}, b'b' * 200))
+        cache.set('c', CacheEntry('"c"', None, {}, b'c' * 200))
+
+        self.assertIsNone(DiskCache(self.path).get('a'))
+        self.assertEqual(b'c' * 200, DiskCache(self.path).get('c').content)
@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import responses
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from gitlab.cli import load_checkpoint, main
+
+HOST = 'http://localhost:10080'
+ISSUES_URL = re.compile(re.escape(HOST + '/api/v3/projects/group%2Fproject/issues') + r'.*')
+ISSUES = [{'id': number, 'title': 'Issue {0}'.format(number)} for number in range(1, 8)]
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, 'issues.ndjson.gz')
+        self.checkpoint = os.path.join(self.directory, 'issues.checkpoint')
+        self.failing_page = None
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def issues(self, request):
+        query = parse_qs(urlparse(request.url).query)
+        page, per_page = int(query['page'][0]), int(query['per_page'][0])
+        if page == self.failing_page:
+            return 500, {}, json.dumps({'message': '500 Internal Server Error'})
+        return 200, {'Content-Type': 'application/json'}, json.dumps(ISSUES[(page - 1) * per_page:page * per_page])
+
+    def export(self, *options):
+        return main(['export', 'issues', '--project', 'group/project', '--host', HOST, '--token', 'secret',
+                     '--output', self.output, '--per-page', '2', '--retries', '0', '--checkpoint', self.checkpoint]
+                    + list(options))
+
+    def exported(self):
+        with gzip.open(self.output, 'rb') as handle:
+            return [json.loads(line.decode('utf-8')) for line in handle]
+
+    @responses.activate
+    def test_writes_compressed_ndjson(self):
+        responses.add_callback(responses.GET, ISSUES_URL, callback=self.issues)
+
+        self.assertEqual(0, self.export('--workers', '3'))
+
+        self.assertEqual(ISSUES, self.exported())
+        checkpoint = load_checkpoint(self.checkpoint)
+        self.assertTrue(checkpoint['done'])
+        self.assertEqual(4, checkpoint['page'])
+
+    @responses.activate
+    def test_resumes_after_failure(self):
+        responses.add_callback(responses.GET, ISSUES_URL, callback=self.issues)
+        self.failing_page = 3
+
+        self.assertEqual(1, self.export())
+        self.assertEqual(ISSUES[:4], self.exported())
+        self.assertEqual(2, load_checkpoint(self.checkpoint)['page'])
+
+        self.failing_page = None
+        calls = len(responses.calls)
+        self.assertEqual(0, self.export('--resume'))
+
+        self.assertEqual(ISSUES, self.exported())
+        pages = [parse_qs(urlparse(call.request.url).query)['page'][0] for call in responses.calls[calls:]]
+        self.assertEqual(['3', '4', '5'], pages)
+
+    @responses.activate
+    def test_complete_export_is_not_repeated(self):
+        responses.add_callback(responses.GET, ISSUES_URL, callback=self.issues)
+        self.export()
+        calls = len(responses.calls)
+
+        self.assertEqual(0, self.export('--resume'))
+
+        self.assertEqual(calls, len(responses.calls))
+        self.assertEqual(ISSUES, self.exported())
+
+    def test_project_is_required(self):
+        self.assertRaises(SystemExit, main, ['export', 'merge-requests', '--host', HOST])
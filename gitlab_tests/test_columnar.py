@@ -0,0 +1,130 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.columnar import COMMIT_SCHEMA, ISSUE_SCHEMA, Column, Schema, parse_timestamp, to_numpy, write_ipc, \
+    write_parquet
+from gitlab.models import Issue
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+AUTHOR = {'id': 5, 'username': 'jdoe', 'name': 'J Doe'}
+ISSUES = [
+    {'id': 1, 'iid': 1, 'project_id': 3, 'title': 'Crash', 'state': 'opened', 'labels': ['bug'],
+     'created_at': '2016-01-04T15:31:51.081Z', 'author': AUTHOR, 'assignee': None,
+     'milestone': {'id': 7, 'title': 'v1', 'due_date': '2016-02-01'}},
+    {'id': 2, 'iid': 2, 'project_id': 3, 'title': 'Typo', 'state': 'closed', 'labels': [],
+     'created_at': '2016-01-05T10:00:00.000+02:00', 'author': AUTHOR, 'assignee': AUTHOR, 'milestone': None},
+    {'id': 3, 'iid': 3, 'project_id': 3, 'title': 'Slow', 'state': 'opened', 'labels': ['perf', 'ux'],
+     'created_at': None, 'author': AUTHOR, 'assignee': None, 'milestone': None},
+]
+
+
+class TestSchema(unittest.TestCase):
+    def test_batches_flatten_nested_objects(self):
+        schema = ISSUE_SCHEMA.select('id', 'author_username', 'assignee_id', 'milestone_title', 'created_at')
+
+        batches = list(schema.batches(iter(ISSUES), batch_size=2))
+
+        self.assertEqual([2, 1], [len(batch['id']) for batch in batches])
+        self.assertEqual(['id', 'created_at', 'author_username', 'assignee_id', 'milestone_title'],
+                         list(batches[0]))
+        self.assertEqual(['jdoe', 'jdoe'], batches[0]['author_username'])
+        self.assertEqual([None, 5], batches[0]['assignee_id'])
+        self.assertEqual(['v1', None], batches[0]['milestone_title'])
+        self.assertEqual(datetime.datetime(2016, 1, 5, 8), batches[0]['created_at'][1])
+        self.assertEqual([None], batches[1]['created_at'])
+
+    def test_resources(self):
+        schema = Schema([Column('author', 'string', 'author.username'), Column('labels', 'list<string>')])
+
+        batch = next(schema.batches(Issue.from_list(ISSUES)))
+
+        self.assertEqual(['jdoe'] * 3, batch['author'])
+        self.assertEqual([['bug'], [], ['perf', 'ux']], batch['labels'])
+
+    def test_unknown_type_and_column(self):
+        self.assertRaises(ValueError, Column, 'id', 'uint8')
+        self.assertRaises(ValueError, ISSUE_SCHEMA.select, 'missing')
+
+    def test_parse_timestamp(self):
+        self.assertEqual(datetime.datetime(2016, 1, 4, 15, 31, 51, 81000), parse_timestamp('2016-01-04T15:31:51.081Z'))
+        self.assertEqual(datetime.datetime(2016, 1, 4, 17, 1), parse_timestamp('2016-01-04T15:31:00-01:30'))
+        self.assertEqual(datetime.datetime(2016, 1, 4), parse_timestamp('2016-01-04'))
+        self.assertRaises(ValueError, parse_timestamp, 'yesterday')
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestArrow(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @responses.activate
+    def test_write_parquet_from_getall(self):
+        gitlab = Gitlab('http://localhost:10080', token='secret')
+        url = gitlab.projects_url + '/3/issues'
+        responses.add(responses.GET, url, json=ISSUES[:2], status=200)
+        responses.add(responses.GET, url, json=ISSUES[2:], status=200)
+        responses.add(responses.GET, url, json=[], status=200)
+        path = os.path.join(self.directory, 'issues.parquet')
+
+        rows = write_parquet(Gitlab.getall(gitlab.getprojectissues, project_id=3, stream=True), path,
+                             ISSUE_SCHEMA, batch_size=2)
+
+        self.assertEqual(3, rows)
+        parquet = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(2, parquet.num_row_groups)
+        table = parquet.read()
+        self.assertEqual(list(ISSUE_SCHEMA.names), table.schema.names)
+        self.assertEqual(['jdoe'] * 3, table.column('author_username').to_pylist())
+        self.assertEqual([['bug'], [], ['perf', 'ux']], table.column('labels').to_pylist())
+        self.assertEqual(datetime.date(2016, 2, 1), table.column('milestone_due_date').to_pylist()[0])
+        self.assertIsNone(table.column('created_at').to_pylist()[2])
+
+    def test_write_ipc(self):
+        path = os.path.join(self.directory, 'commits.arrow')
+        commits = [{'id': 'a' * 40, 'title': 'Initial', 'committed_date': '2016-01-04T15:31:51.000+01:00',
+                    'parent_ids': []}]
+
+        self.assertEqual(1, write_ipc(commits, path, COMMIT_SCHEMA))
+
+        table = pyarrow.ipc.open_file(path).read_all()
+        self.assertEqual(['Initial'], table.column('title').to_pylist())
+        committed = table.column('committed_date').to_pylist()[0]
+        self.assertEqual(datetime.datetime(2016, 1, 4, 14, 31, 51), committed.replace(tzinfo=None))
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestNumpy(unittest.TestCase):
+    def test_to_numpy(self):
+        arrays = to_numpy(ISSUES, ISSUE_SCHEMA.select('id', 'assignee_id', 'created_at', 'labels'), batch_size=2)
+
+        self.assertEqual([1, 2, 3], arrays['id'].tolist())
+        self.assertEqual('int64', arrays['id'].dtype.name)
+        self.assertEqual([True, False, True], arrays['assignee_id'].mask.tolist())
+        self.assertEqual(5, arrays['assignee_id'][1])
+        self.assertEqual(numpy.datetime64('2016-01-04T15:31:51.081'), arrays['created_at'][0])
+        self.assertEqual(['perf', 'ux'], arrays['labels'][2])
+
+    def test_empty_listing(self):
+        arrays = to_numpy([], ISSUE_SCHEMA.select('id'))
+
+        self.assertEqual(0, len(arrays['id']))
@@ -0,0 +1,50 @@
+import json
+import unittest
+
+import mock
+import responses
+
+from gitlab import Gitlab
+from gitlab.jsondecode import load_backend
+
+
+class TestJsonDecode(unittest.TestCase):
+    def test_default_backend_decodes_bytes(self):
+        self.assertEqual({'name': u'caf\xe9'}, load_backend()(u'{"name": "caf\xe9"}'.encode('utf-8')))
+
+    def test_named_backend(self):
+        self.assertEqual({'id': 1}, load_backend('json')(b'{"id": 1}'))
+
+    def test_standard_library_before_python_3_6_decodes_text(self):
+        with mock.patch('gitlab.jsondecode.sys') as patched:
+            patched.version_info = (3, 5, 2)
+            loads = load_backend('json')
+
+        self.assertIsNot(json.loads, loads)
+        self.assertEqual({'name': u'caf\xe9'}, loads(u'{"name": "caf\xe9"}'.encode('utf-8')))
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, load_backend, 'yaml')
+
+    @responses.activate
+    def test_client_uses_backend(self):
+        calls = []
+
+        def loads(content):
+            calls.append(content)
+            return json.loads(content.decode('utf-8'))
+
+        gitlab = Gitlab('http://localhost:10080', token='secret', json_decoder=loads)
+        responses.add(responses.GET, gitlab.api_url + '/users/1', json={'id': 1}, status=200)
+        responses.add(responses.GET, gitlab.projects_url + '/1/labels', json=[{'name': 'bug'}], status=200)
+
+        self.assertEqual({'id': 1}, gitlab.getuser(1))
+        self.assertEqual([{'name': 'bug'}], gitlab.getlabels(1))
+        self.assertEqual([b'{"id": 1}', b'[{"name": "bug"}]'], calls)
+
+    @responses.activate
+    def test_invalid_body_uses_default_response(self):
+        gitlab = Gitlab('http://localhost:10080', token='secret', json_decoder='json')
+        responses.add(responses.GET, gitlab.api_url + '/users/1', body='not json', status=200)
+
+        self.assertEqual({}, gitlab.get('/users/1'))
@@ -0,0 +1,143 @@
+import time
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.memoize import Memoizer
+from response_data.projects import get_project
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret', memoize=True)
+        self.user_url = self.gitlab.users_url + '/1'
+        self.project_url = self.gitlab.projects_url + '/1'
+
+    @responses.activate
+    def test_lookup_is_memoized(self):
+        responses.add(responses.GET, self.user_url, json={'id': 1, 'name': 'first'}, status=200)
+
+        first = self.gitlab.getuser(1)
+        second = self.gitlab.getuser(1)
+
+        self.assertEqual({'id': 1, 'name': 'first'}, first)
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual({'hits': 1, 'misses': 1, 'invalidations': 0}, self.gitlab.memo.stats()['users'])
+
+    @responses.activate
+    def test_disabled_by_default(self):
+        gitlab = Gitlab('http://localhost:10080', token='secret')
+        responses.add(responses.GET, self.user_url, json={'id': 1}, status=200)
+
+        gitlab.getuser(1)
+        gitlab.getuser(1)
+
+        self.assertIsNone(gitlab.memo)
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_failures_are_not_memoized(self):
+        responses.add(responses.GET, self.user_url, json={'message': '404 Not found'}, status=404)
+
+        self.assertFalse(self.gitlab.getuser(1))
+        self.assertFalse(self.gitlab.getuser(1))
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_write_invalidates_resource(self):
+        responses.add(responses.GET, self.project_url, json=get_project, status=200)
+        responses.add(responses.PUT, self.project_url, json=get_project, status=200)
+
+        self.gitlab.get_project(1)
+        self.gitlab.editproject(1, description='changed')
+        self.gitlab.get_project(1)
+
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(1, self.gitlab.memo.stats()['projects']['invalidations'])
+
+    @responses.activate
+    def test_write_keeps_other_resources(self):
+        responses.add(responses.GET, self.project_url, json=get_project, status=200)
+        responses.add(responses.PUT, self.user_url, json={'id': 1}, status=200)
+
+        self.gitlab.get_project(1)
+        self.gitlab.edituser(1, name='changed')
+        self.gitlab.get_project(1)
+
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_callers_get_copies(self):
+        responses.add(responses.GET, self.project_url, json=get_project, status=200)
+
+        self.gitlab.get_project(1)['name'] = 'changed'
+        first = self.gitlab.get_project(1)
+        first['namespace']['name'] = 'changed'
+        second = self.gitlab.get_project(1)
+
+        self.assertEqual(get_project['name'], first['name'])
+        self.assertEqual(get_project['namespace']['name'], second['namespace']['name'])
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_paginated_calls_are_not_memoized(self):
+        url = self.gitlab.users_url
+        responses.add(responses.GET, url, json=[{'id': 1}], status=200,
+                      adding_headers={'X-Next-Page': '', 'X-Total-Pages': '1'})
+
+        self.gitlab.get_users(per_page=1)
+        users = list(Gitlab.getall(self.gitlab.get_users, per_page=1))
+        again = list(Gitlab.getall(self.gitlab.get_users, per_page=1))
+
+        self.assertEqual([{'id': 1}], users)
+        self.assertEqual(users, again)
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_memoized_per_sudo_user(self):
+        responses.add(responses.GET, self.user_url, json={'id': 1}, status=200)
+
+        self.gitlab.getuser(1)
+        self.gitlab.setsudo('someone')
+        self.gitlab.getuser(1)
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual('someone', responses.calls[1].request.headers['SUDO'])
+
+
+class TestMemoizer(unittest.TestCase):
+    def test_ttl_by_method_then_resource(self):
+        memo = Memoizer(ttl=100, ttls={'users': 0.01, 'get_project': 0.01})
+
+        memo.set('users', 'a', 'getuser', 1)
+        memo.set('projects', 'b', 'get_project', 2)
+        memo.set('projects', 'c', 'getprojects', 3)
+        time.sleep(0.02)
+
+        self.assertEqual((False, None), memo.get('users', 'a'))
+        self.assertEqual((False, None), memo.get('projects', 'b'))
+        self.assertEqual((True, 3), memo.get('projects', 'c'))
+
+    def test_least_recently_used_is_dropped(self):
+        memo = Memoizer(maxsize=2)
+
+        memo.set('users', 'a', 'getuser', 1)
+        memo.set('users', 'b', 'getuser', 2)
+        memo.get('users', 'a')
+        memo.set('users', 'c', 'getuser', 3)
+
+        self.assertEqual(2, len(memo))
+        self.assertEqual((False, None), memo.get('users', 'b'))
+        self.assertEqual((True, 1), memo.get('users', 'a'))
+
+    def test_invalidate_ident_keeps_other_lookups(self):
+        memo = Memoizer()
+
+        memo.set('users', 'one', 'getuser', 1, ident=1)
+        memo.set('users', 'two', 'getuser', 2, ident=2)
+        memo.set('users', 'all', 'get_users', [1, 2])
+
+        self.assertEqual(2, memo.invalidate('users', ident='1'))
+        self.assertEqual((True, 2), memo.get('users', 'two'))
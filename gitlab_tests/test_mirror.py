@@ -0,0 +1,126 @@
+import datetime
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+import responses
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from gitlab import Gitlab
+from gitlab.exceptions import HttpError
+from gitlab.mirror import Mirror
+
+HOST = 'http://localhost:10080'
+
+
+def project(id, path, namespace, owner, visibility_level=0, last_activity_at='2016-01-04T15:31:51.081Z'):
+    return {'id': id, 'path': path, 'path_with_namespace': '{0}/{1}'.format(namespace['path'], path),
+            'namespace': namespace, 'owner': owner, 'visibility_level': visibility_level, 'archived': False,
+            'last_activity_at': last_activity_at}
+
+
+JDOE = {'id': 5, 'username': 'jdoe', 'name': 'J Doe'}
+TOOLS = {'id': 2, 'path': 'tools', 'name': 'Tools', 'kind': 'group'}
+PERSONAL = {'id': 3, 'path': 'jdoe', 'name': 'jdoe', 'kind': 'user', 'owner_id': 5}
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.gitlab = Gitlab(HOST, token='secret')
+        self.mirror = Mirror(self.gitlab, os.path.join(self.directory, 'mirror.sqlite'), per_page=2)
+        self.listings = {
+            '/projects/owned': [
+                project(1, 'cli', TOOLS, JDOE, 20, '2016-03-01T10:00:00.000Z'),
+                project(2, 'notes', PERSONAL, JDOE, 0, '2016-01-01T10:00:00.000+02:00'),
+                project(3, 'web', TOOLS, None, 10, '2016-02-01T10:00:00.000Z'),
+            ],
+            '/groups/': [{'id': 2, 'path': 'tools', 'name': 'Tools', 'visibility_level': 20}],
+            '/users': [JDOE, {'id': 6, 'username': 'root', 'name': 'Administrator'}],
+            '/namespaces': [TOOLS, PERSONAL],
+        }
+        self.failing = None
+        responses.start()
+        responses.add_callback(responses.GET, re.compile(re.escape(HOST) + r'/api/v3/.*'), callback=self.listing)
+
+    def tearDown(self):
+        responses.stop()
+        responses.reset()
+        self.mirror.close()
+        shutil.rmtree(self.directory)
+
+    def listing(self, request):
+        url = urlparse(request.url)
+        path = url.path[len('/api/v3'):]
+        if path == self.failing:
+            return 500, {}, json.dumps({'message': '500 Internal Server Error'})
+        query = parse_qs(url.query)
+        page, per_page = int(query['page'][0]), int(query['per_page'][0])
+        return 200, {'Content-Type': 'application/json'}, json.dumps(
+            self.listings[path][(page - 1) * per_page:page * per_page])
+
+    def test_lookups(self):
+        report = self.mirror.refresh()
+
+        self.assertEqual(3, report['projects']['added'])
+        self.assertEqual('cli', self.mirror.project('tools/cli')['path'])
+        self.assertEqual('notes', self.mirror.project(2)['path'])
+        self.assertIsNone(self.mirror.project('tools/missing'))
+        self.assertEqual('Tools', self.mirror.group('tools')['name'])
+        self.assertEqual(6, self.mirror.user('root')['id'])
+        self.assertEqual('user', self.mirror.namespace('jdoe')['kind'])
+
+    def test_project_filters(self):
+        self.mirror.refresh()
+
+        def paths(**filters):
+            return [item['path_with_namespace'] for item in self.mirror.projects(**filters)]
+
+        self.assertEqual(['tools/cli', 'tools/web', 'jdoe/notes'], paths())
+        self.assertEqual(['tools/cli', 'jdoe/notes'], paths(owner='jdoe'))
+        self.assertEqual(['tools/cli', 'tools/web'], paths(namespace='tools'))
+        self.assertEqual(['jdoe/notes'], paths(namespace=3))
+        self.assertEqual(['tools/web'], paths(visibility='internal'))
+        self.assertEqual(['tools/cli', 'tools/web'], paths(active_since=datetime.datetime(2016, 1, 15)))
+        self.assertEqual(['jdoe/notes'], paths(active_before='2016-01-01T09:00:00Z'))
+        self.assertEqual(['tools/cli'], paths(limit=1))
+
+    def test_refresh_applies_differences(self):
+        self.mirror.refresh()
+        projects = self.listings['/projects/owned']
+        projects[0] = dict(projects[0], description='Command line')
+        del projects[1]
+
+        report = self.mirror.refresh(['projects'])
+
+        self.assertEqual({'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 1}, report['projects'])
+        self.assertEqual('Command line', self.mirror.project('tools/cli')['description'])
+        self.assertIsNone(self.mirror.project(2))
+
+    def test_failed_listing_keeps_mirror(self):
+        self.mirror.refresh()
+        self.failing = '/projects/owned'
+
+        self.assertRaises(HttpError, self.mirror.refresh, ['projects'])
+
+        self.assertEqual(3, len(self.mirror.projects()))
+
+    def test_max_age(self):
+        self.mirror.refresh()
+        calls = len(responses.calls)
+
+        self.assertEqual({}, self.mirror.refresh(max_age=3600))
+        self.assertEqual(calls, len(responses.calls))
+
+    def test_mirror_is_persistent(self):
+        self.mirror.refresh(['users'])
+        self.mirror.close()
+
+        self.mirror = Mirror(self.gitlab, os.path.join(self.directory, 'mirror.sqlite'))
+
+        self.assertEqual('J Doe', self.mirror.user(5)['name'])
+        self.assertIsNotNone(self.mirror.refreshed_at('users'))
+        self.assertIsNone(self.mirror.refreshed_at('projects'))
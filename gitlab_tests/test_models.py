@@ -0,0 +1,68 @@
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.models import Interner, Issue, Project, User
+
+ISSUE = {
+    'id': 1, 'iid': 1, 'project_id': 3, 'title': 'Crash', 'state': 'opened', 'labels': ['bug', 'ux'],
+    'author': {'id': 5, 'username': 'jdoe', 'name': 'J Doe', 'state': 'active'},
+    'milestone': None, 'assignee': None, 'epic': {'id': 9},
+}
+
+
+class TestResources(unittest.TestCase):
+    def test_fields_and_items(self):
+        issue = Issue.from_dict(ISSUE)
+
+        self.assertEqual('Crash', issue.title)
+        self.assertEqual('jdoe', issue.author.username)
+        self.assertEqual('jdoe', issue['author']['username'])
+        self.assertEqual(('bug', 'ux'), issue.labels)
+        self.assertIsNone(issue.milestone)
+        self.assertIsNone(issue.description)
+        self.assertEqual({'id': 9}, issue.epic)
+        self.assertEqual({'id': 9}, issue['epic'])
+        self.assertIsNone(issue.get('missing'))
+        self.assertRaises(KeyError, lambda: issue['missing'])
+        self.assertRaises(AttributeError, lambda: issue.missing)
+
+    def test_no_instance_dictionary(self):
+        self.assertFalse(hasattr(Issue.from_dict(ISSUE), '__dict__'))
+        self.assertFalse(hasattr(User(id=1), '__dict__'))
+
+    def test_nested_objects_are_shared(self):
+        interner = Interner()
+        first, second = Issue.from_list([ISSUE, dict(ISSUE, id=2)], interner)
+
+        self.assertIs(first.author, second.author)
+        self.assertIs(first.state, second.state)
+
+    def test_unicode_strings_are_shared(self):
+        interner = Interner()
+        first = interner.string(u''.join([u'caf', u'\xe9']))
+        second = interner.string(u''.join([u'ca', u'f\xe9']))
+
+        self.assertIs(first, second)
+        self.assertEqual(3, interner.string(3))
+
+    def test_to_dict(self):
+        data = Project.from_dict({'id': 1, 'namespace': {'id': 2, 'path': 'group'}, 'tag_list': ['a']}).to_dict()
+
+        self.assertEqual(2, data['namespace']['id'])
+        self.assertEqual(['a'], data['tag_list'])
+        self.assertIsNone(data['description'])
+
+    @responses.activate
+    def test_getall_with_model(self):
+        gitlab = Gitlab('http://localhost:10080', token='secret')
+        url = gitlab.projects_url + '/3/issues'
+        responses.add(responses.GET, url, json=[ISSUE, dict(ISSUE, id=2)], status=200)
+        responses.add(responses.GET, url, json=[], status=200)
+
+        issues = list(Gitlab.getall(gitlab.getprojectissues, project_id=3, model=Issue))
+
+        self.assertEqual([1, 2], [issue.id for issue in issues])
+        self.assertIsInstance(issues[0], Issue)
+        self.assertIs(issues[0].author, issues[1].author)
@@ -0,0 +1,94 @@
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.ratelimit import RateLimiter
+from response_data.users import get_users
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def limiter_with_clock(**kwargs):
+    clock = FakeClock()
+    limiter = RateLimiter(**kwargs)
+    limiter.clock = clock
+    limiter.sleep = clock.sleep
+    limiter.configure(limiter.rate, limiter.burst)
+    return limiter, clock
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_bucket(self):
+        limiter, clock = limiter_with_clock(rate=2, burst=2)
+
+        self.assertEqual([0, 0, 0.5, 1.0], [limiter.reserve() for _ in range(4)])
+        clock.now += 10
+        self.assertEqual([0, 0, 0.5], [limiter.reserve() for _ in range(3)])
+
+    def test_unlimited(self):
+        limiter, clock = limiter_with_clock()
+
+        self.assertEqual([0] * 5, [limiter.acquire() for _ in range(5)])
+
+    def test_adapts_to_server_headers(self):
+        limiter, clock = limiter_with_clock(rate=100)
+
+        limiter.update({'RateLimit-Remaining': '10', 'RateLimit-Reset': str(int(clock.now) + 100)})
+        self.assertEqual(0.1, limiter.current_rate)
+        self.assertEqual([0, 10.0], [limiter.acquire() for _ in range(2)])
+
+        clock.now += 100
+        self.assertEqual(100, limiter.current_rate)
+
+    def test_waits_for_reset_when_exhausted(self):
+        limiter, clock = limiter_with_clock()
+
+        limiter.update({'RateLimit-Remaining': '0', 'RateLimit-Reset': str(int(clock.now) + 30)})
+        self.assertEqual(30, limiter.acquire())
+        self.assertEqual(0, limiter.acquire())
+
+    def test_not_adaptive(self):
+        limiter, clock = limiter_with_clock(adaptive=False)
+
+        limiter.update({'RateLimit-Remaining': '0', 'RateLimit-Reset': str(int(clock.now) + 30)})
+        self.assertEqual(0, limiter.acquire())
+
+    def test_for_host(self):
+        limiter = RateLimiter.for_host('ratelimit.example.com', rate=5)
+
+        self.assertIs(limiter, RateLimiter.for_host('https://RATELIMIT.example.com/'))
+        self.assertIs(limiter, RateLimiter.for_host('https://ratelimit.example.com', rate=8))
+        self.assertEqual(8, limiter.rate)
+        self.assertIsNot(limiter, RateLimiter.for_host('other.example.com'))
+
+    def test_shared_between_clients(self):
+        first = Gitlab('http://shared.example.com', token='first', rate_limit=5)
+        second = Gitlab('http://shared.example.com', token='second', rate_limit=5)
+
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+        self.assertIs(first.rate_limiter, first.transport.adapter.rate_limiters['shared.example.com'])
+
+    @responses.activate
+    def test_throttles_legacy_methods(self):
+        limiter, clock = limiter_with_clock(rate=1)
+        gitlab = Gitlab('http://localhost:10080', token='secret', rate_limit=limiter)
+        responses.add(responses.GET, gitlab.api_url + '/users/1', json=get_users[0], status=200,
+                      adding_headers={'RateLimit-Remaining': '1', 'RateLimit-Reset': str(int(clock.now) + 20)})
+
+        gitlab.getuser(1)
+        gitlab.getuser(1)
+        gitlab.getuser(1)
+
+        self.assertEqual([20.0], clock.sleeps)
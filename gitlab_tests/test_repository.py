@@ -0,0 +1,264 @@
+import base64
+import io
+import json
+import re
+import threading
+import time
+import unittest
+
+import responses
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from gitlab import Gitlab
+from gitlab.blobcache import git_blob_sha
+from gitlab.exceptions import HttpError
+from gitlab.stream import Base64Content
+from gitlab_tests.stub_server import StubServer
+
+TREE = {
+    '': [{'name': 'README.md', 'type': 'blob', 'id': 'b1'}, {'name': 'docs', 'type': 'tree', 'id': 't1'},
+         {'name': 'gitlab', 'type': 'tree', 'id': 't2'}],
+    'docs': [{'name': 'index.rst', 'type': 'blob', 'id': 'b2'}],
+    'gitlab': [{'name': 'base.py', 'type': 'blob', 'id': 'b3'}, {'name': 'sub', 'type': 'tree', 'id': 't3'},
+               {'name': 'users.py', 'type': 'blob', 'id': 'b4'}],
+    'gitlab/sub': [],
+}
+
+
+class TestWalkTree(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.url = re.compile(re.escape(self.gitlab.projects_url + '/1/repository/tree') + r'.*')
+        self.lock = threading.Lock()
+        self.state = {'current': 0, 'peak': 0}
+
+    def tree(self, request):
+        query = parse_qs(urlparse(request.url).query)
+        path = query.get('path', [''])[0]
+        page = int(query['page'][0])
+        per_page = int(query['per_page'][0])
+
+        with self.lock:
+            self.state['current'] += 1
+            self.state['peak'] = max(self.state['peak'], self.state['current'])
+        time.sleep(0.02)
+        with self.lock:
+            self.state['current'] -= 1
+
+        if path not in TREE:
+            return 404, {}, json.dumps({'message': '404 Tree Not Found'})
+        entries = TREE[path][(page - 1) * per_page:page * per_page]
+        next_page = str(page + 1) if page * per_page < len(TREE[path]) else ''
+        return 200, {'Content-Type': 'application/json', 'X-Next-Page': next_page}, json.dumps(entries)
+
+    @responses.activate
+    def test_walks_every_directory(self):
+        responses.add_callback(responses.GET, self.url, callback=self.tree)
+
+        paths = sorted(entry['path'] for entry in self.gitlab.walk_tree(1, 'master', per_page=2))
+
+        self.assertEqual(['README.md', 'docs', 'docs/index.rst', 'gitlab', 'gitlab/base.py', 'gitlab/sub',
+                          'gitlab/users.py'], paths)
+        self.assertTrue(all('ref_name=master' in call.request.url for call in responses.calls))
+
+    @responses.activate
+    def test_lists_siblings_concurrently(self):
+        responses.add_callback(responses.GET, self.url, callback=self.tree)
+
+        list(self.gitlab.walk_tree(1, 'master', concurrency=2))
+
+        self.assertEqual(2, self.state['peak'])
+
+    @responses.activate
+    def test_starts_from_path(self):
+        responses.add_callback(responses.GET, self.url, callback=self.tree)
+
+        paths = sorted(entry['path'] for entry in self.gitlab.walk_tree(1, 'master', path='gitlab'))
+
+        self.assertEqual(['gitlab/base.py', 'gitlab/sub', 'gitlab/users.py'], paths)
+
+    @responses.activate
+    def test_pin_resolves_commit(self):
+        responses.add(responses.GET, self.gitlab.projects_url + '/1/repository/commits/master',
+                      json={'id': 'abc123'}, status=200)
+        responses.add_callback(responses.GET, self.url, callback=self.tree)
+
+        list(self.gitlab.walk_tree(1, 'master', pin=True))
+
+        self.assertTrue(all('ref_name=abc123' in call.request.url for call in responses.calls[1:]))
+
+    @responses.activate
+    def test_server_ignoring_pages(self):
+        for count, per_page in ((150, 100), (100, 100)):
+            entries = [{'name': 'file{0}'.format(index), 'type': 'blob', 'id': str(index)} for index in range(count)]
+            responses.reset()
+            responses.add(responses.GET, self.url, json=entries, status=200)
+
+            paths = [entry['path'] for entry in self.gitlab.walk_tree(1, 'master', per_page=per_page)]
+
+            self.assertEqual([entry['name'] for entry in entries], paths)
+            self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_missing_directory_raises(self):
+        responses.add_callback(responses.GET, self.url, callback=self.tree)
+
+        self.assertRaises(HttpError, list, self.gitlab.walk_tree(1, 'master', path='missing'))
+
+
+class TestGetFiles(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.tree_url = re.compile(re.escape(self.gitlab.projects_url + '/1/repository/tree') + r'.*')
+        self.blob_url = re.compile(re.escape(self.gitlab.projects_url + '/1/repository/raw_blobs/') + r'.*')
+        self.tree = {
+            '': [{'name': 'setup.py', 'type': 'blob', 'id': 'b1'}, {'name': 'a', 'type': 'tree', 'id': 't1'},
+                 {'name': 'LICENSE', 'type': 'blob', 'id': 'b2'}],
+            'a': [{'name': 'LICENSE', 'type': 'blob', 'id': 'b2'}, {'name': 'b', 'type': 'tree', 'id': 't2'}],
+        }
+        self.blobs = {'b1': b'setup()', 'b2': b'MIT'}
+
+    def list_tree(self, request):
+        path = parse_qs(urlparse(request.url).query).get('path', [''])[0]
+        if path not in self.tree:
+            return 404, {}, json.dumps({'message': '404 Tree Not Found'})
+        return 200, {'Content-Type': 'application/json'}, json.dumps(self.tree[path])
+
+    def raw_blob(self, request):
+        return 200, {}, self.blobs[request.url.rsplit('/', 1)[1]]
+
+    @responses.activate
+    def test_fetches_each_blob_once(self):
+        responses.add_callback(responses.GET, self.tree_url, callback=self.list_tree)
+        responses.add_callback(responses.GET, self.blob_url, callback=self.raw_blob)
+
+        files = self.gitlab.get_files(1, 'master', ['setup.py', 'LICENSE', '/a/LICENSE', 'a/b', 'missing/file'])
+
+        self.assertEqual({'setup.py': b'setup()', 'LICENSE': b'MIT', 'a/LICENSE': b'MIT', 'a/b': None,
+                          'missing/file': None}, files)
+        blob_calls = [call.request.url for call in responses.calls if '/raw_blobs/' in call.request.url]
+        self.assertEqual(2, len(blob_calls))
+
+    @responses.activate
+    def test_iter_files_streams_results(self):
+        responses.add_callback(responses.GET, self.tree_url, callback=self.list_tree)
+        responses.add_callback(responses.GET, self.blob_url, callback=self.raw_blob)
+
+        results = list(self.gitlab.iter_files(1, 'master', ['setup.py', 'a/LICENSE'], concurrency=2))
+
+        self.assertEqual([('a/LICENSE', b'MIT'), ('setup.py', b'setup()')], sorted(results))
+
+
+class TestCommitFiles(unittest.TestCase):
+    def test_streams_actions_in_one_commit(self):
+        def commit(request):
+            return 201, {}, {'id': 'abc123', 'message': 'Regenerate'}
+
+        routes = {('POST', '/api/v3/projects/group%2Fproject/repository/commits'): commit}
+        generated = b''.join(bytes(bytearray([index % 256])) for index in range(100000))
+        with StubServer(routes) as server:
+            gitlab = Gitlab(server.url, token='secret')
+            result = gitlab.commit_files('group/project', 'master', 'Regenerate', [
+                {'action': 'create', 'file_path': 'generated.bin', 'content': io.BytesIO(generated)},
+                {'action': 'update', 'file_path': 'README.md', 'content': u'caf\xe9'},
+                {'action': 'update', 'file_path': 'encoded.txt', 'content': 'aGk=', 'encoding': 'base64'},
+                {'action': 'move', 'file_path': 'new.md', 'previous_path': 'old.md'},
+                {'action': 'delete', 'file_path': 'legacy.py'},
+            ], author_name='Bot')
+
+        self.assertEqual('abc123', result['id'])
+        request = server.requests[0]
+        self.assertEqual('chunked', request['headers']['Transfer-Encoding'])
+        body = json.loads(request['body'].decode('utf-8'))
+        self.assertEqual('master', body['branch_name'])
+        self.assertEqual('Bot', body['author_name'])
+        actions = body['actions']
+        self.assertEqual(generated, base64.b64decode(actions[0]['content']))
+        self.assertEqual(u'caf\xe9'.encode('utf-8'), base64.b64decode(actions[1]['content']))
+        self.assertEqual('aGk=', actions[2]['content'])
+        self.assertEqual({'action': 'move', 'file_path': 'new.md', 'previous_path': 'old.md'}, actions[3])
+        self.assertEqual('base64', actions[0]['encoding'])
+
+
+class TestBase64Content(unittest.TestCase):
+    def test_encodes_in_chunks(self):
+        content = b'abcdefghij' * 7
+        for chunk_size in (3, 4, 10, 1000):
+            encoded = b''.join(Base64Content(io.BytesIO(content), chunk_size=chunk_size))
+            self.assertEqual(base64.b64encode(content), encoded)
+
+    def test_iterable_source(self):
+        self.assertEqual(base64.b64encode(b'abcde'), b''.join(Base64Content([b'ab', u'c', b'de'])))
+
+
+class TestSyncFiles(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.tree_url = re.compile(re.escape(self.gitlab.projects_url + '/1/repository/tree') + r'.*')
+        self.commits_url = self.gitlab.api_url + '/projects/1/repository/commits'
+        self.tree = {
+            '': [{'name': 'VERSION', 'type': 'blob', 'id': git_blob_sha(b'1.0\n')}],
+            'config': [{'name': 'app.yml', 'type': 'blob', 'id': git_blob_sha(b'debug: false\n')}],
+        }
+        self.committed = []
+
+    def list_tree(self, request):
+        path = parse_qs(urlparse(request.url).query).get('path', [''])[0]
+        if path not in self.tree:
+            return 404, {}, json.dumps({'message': '404 Tree Not Found'})
+        return 200, {'Content-Type': 'application/json'}, json.dumps(self.tree[path])
+
+    def commit(self, request):
+        self.committed.append(json.loads(b''.join(request.body).decode('utf-8')))
+        return 201, {'Content-Type': 'application/json'}, json.dumps({'id': 'abc123'})
+
+    @responses.activate
+    def test_only_changed_files_are_committed(self):
+        responses.add_callback(responses.GET, self.tree_url, callback=self.list_tree)
+        responses.add_callback(responses.POST, self.commits_url, callback=self.commit)
+
+        report = self.gitlab.sync_files(1, 'master', {
+            'VERSION': u'1.0\n',
+            'config/app.yml': io.BytesIO(b'debug: true\n'),
+            'config/new.yml': b'new: true\n',
+        }, 'Sync')
+
+        self.assertEqual(['VERSION'], report['skipped'])
+        self.assertEqual(['config/app.yml'], report['updated'])
+        self.assertEqual(['config/new.yml'], report['created'])
+        self.assertEqual({'id': 'abc123'}, report['commit'])
+        actions = self.committed[0]['actions']
+        self.assertEqual([('update', 'config/app.yml', b'debug: true\n'), ('create', 'config/new.yml', b'new: true\n')],
+                         [(action['action'], action['file_path'], base64.b64decode(action['content']))
+                          for action in actions])
+
+    @responses.activate
+    def test_nothing_to_commit(self):
+        responses.add_callback(responses.GET, self.tree_url, callback=self.list_tree)
+
+        report = self.gitlab.sync_file(1, 'master', 'config/app.yml', b'debug: false\n', 'Sync')
+
+        self.assertEqual({'created': [], 'updated': [], 'skipped': ['config/app.yml'], 'commit': None}, report)
+        self.assertFalse(any(call.request.method == 'POST' for call in responses.calls))
+
+    @responses.activate
+    def test_listing_failure_is_not_a_missing_directory(self):
+        def list_tree(request):
+            if 'path=config' in request.url:
+                return 503, {}, json.dumps({'message': '503 Service Unavailable'})
+            return self.list_tree(request)
+
+        responses.add_callback(responses.GET, self.tree_url, callback=list_tree)
+
+        self.assertRaises(HttpError, self.gitlab.sync_files, 1, 'master', {'config/app.yml': b'debug: true\n'}, 'Sync')
+        self.assertFalse(any(call.request.method == 'POST' for call in responses.calls))
+
+    @responses.activate
+    def test_dry_run(self):
+        responses.add_callback(responses.GET, self.tree_url, callback=self.list_tree)
+
+        report = self.gitlab.sync_files(1, 'master', {'VERSION': b'2.0\n'}, 'Sync', dry_run=True)
+
+        self.assertEqual(['VERSION'], report['updated'])
+        self.assertIsNone(report['commit'])
+        self.assertEqual([], self.committed)
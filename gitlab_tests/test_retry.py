@@ -0,0 +1,95 @@
+import time
+
+import responses
+from requests.exceptions import ConnectionError
+
+from gitlab import Gitlab
+from gitlab.retry import RetryPolicy
+from gitlab_tests.base_test import BaseTest
+from response_data.users import get_users
+
+
+class TestRetry(BaseTest):
+    def setUp(self):
+        super(TestRetry, self).setUp()
+        self.policy = RetryPolicy(total=2)
+        self.sleeps = []
+        self.policy.sleep = self.sleeps.append
+
+        self.gitlab = Gitlab(self.host, token='secret', retry=self.policy)
+
+    def add(self, method=responses.GET, status=200, headers=None, **kwargs):
+        if 'body' not in kwargs:
+            kwargs.setdefault('json', get_users)
+        responses.add(method, self.gitlab.api_url + '/users', status=status, adding_headers=headers,
+                      content_type='application/json', **kwargs)
+
+    @responses.activate
+    def test_retry_on_status(self):
+        self.add(status=502)
+        self.add()
+
+        self.assertEqual(get_users, self.gitlab.get('/users'))
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(1, len(self.sleeps))
+        self.assertTrue(0 <= self.sleeps[0] <= self.policy.backoff_factor)
+
+        counters = self.policy.counters()
+        self.assertEqual(1, counters['requests'])
+        self.assertEqual(1, counters['retries'])
+        self.assertEqual({502: 1}, counters['statuses'])
+
+    @responses.activate
+    def test_retry_after(self):
+        self.add(status=429, headers={'Retry-After': '7'})
+        self.add(status=503, headers={'RateLimit-Reset': str(int(time.time()) + 30)})
+        self.add()
+
+        self.assertEqual(get_users, self.gitlab.get('/users'))
+        self.assertEqual(7, self.sleeps[0])
+        self.assertTrue(28 <= self.sleeps[1] <= 30)
+
+    @responses.activate
+    def test_retry_connection_error(self):
+        self.add(body=ConnectionError('reset'))
+        self.add()
+
+        self.assertEqual(get_users, self.gitlab.get_users())
+        self.assertEqual(1, self.policy.counters()['connection_errors'])
+
+    @responses.activate
+    def test_retry_exhausted(self):
+        self.add(status=503)
+
+        self.assertFalse(self.gitlab.get('/users'))
+        self.assertEqual(3, len(responses.calls))
+        self.assertEqual(1, self.policy.counters()['exhausted'])
+
+    @responses.activate
+    def test_no_retry_for_post(self):
+        self.add(method=responses.POST, status=502)
+
+        self.assertFalse(self.gitlab.post('/users', name='test'))
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_retrying_override(self):
+        self.add(status=502)
+        self.add(status=502)
+        self.add()
+
+        with self.gitlab.retrying(None):
+            self.assertFalse(self.gitlab.get('/users'))
+
+        override = RetryPolicy(total=1)
+        override.sleep = self.sleeps.append
+        with self.gitlab.retrying(override):
+            self.assertEqual(get_users, self.gitlab.get('/users'))
+
+        self.assertEqual(1, override.counters()['retries'])
+        self.assertEqual(0, self.policy.counters()['retries'])
+
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(backoff_factor=10, max_backoff=15)
+        for attempt in range(6):
+            self.assertTrue(0 <= policy.backoff(attempt) <= 15)
@@ -0,0 +1,398 @@
+import base64
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import unittest
+
+import responses
+
+from gitlab import Gitlab
+from gitlab.exceptions import HttpError
+from gitlab.stream import TextContent, iter_json_array
+from gitlab_tests.stub_server import StubServer
+
+ARCHIVE = b'0123456789' * 1000
+
+
+class TestGetFileArchive(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.url = self.gitlab.projects_url + '/1/repository/archive'
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'archive.tar.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def ranged(self, request):
+        range_header = request.headers.get('Range')
+        if range_header is None or request.headers.get('If-Range') != '"v1"':
+            return 200, {'ETag': '"v1"'}, ARCHIVE
+        start = int(range_header[len('bytes='):-1])
+        if start >= len(ARCHIVE):
+            return 416, {'Content-Range': 'bytes */{0}'.format(len(ARCHIVE))}, b''
+        headers = {'ETag': '"v1"',
+                   'Content-Range': 'bytes {0}-{1}/{2}'.format(start, len(ARCHIVE) - 1, len(ARCHIVE))}
+        return 206, headers, ARCHIVE[start:]
+
+    def partial(self, content, validator=None):
+        with open(self.path, 'wb') as archive:
+            archive.write(content)
+        if validator is not None:
+            with open(self.path + '.validator', 'w') as handle:
+                handle.write(validator)
+
+    def saved(self):
+        with open(self.path, 'rb') as archive:
+            return archive.read()
+
+    @responses.activate
+    def test_streams_to_path_in_chunks(self):
+        responses.add(responses.GET, self.url, body=ARCHIVE, status=200, adding_headers={'Content-Length': '10000'})
+        progress = []
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, chunk_size=4096,
+                                                   progress=lambda done, total: progress.append((done, total))))
+
+        with open(self.path, 'rb') as archive:
+            self.assertEqual(ARCHIVE, archive.read())
+        self.assertEqual([4096, 8192, 10000], [done for done, _ in progress])
+        self.assertEqual(10000, progress[-1][1])
+
+    @responses.activate
+    def test_streams_to_file_object(self):
+        responses.add(responses.GET, self.url, body=ARCHIVE, status=200)
+        sink = io.BytesIO()
+
+        self.assertTrue(self.gitlab.getfilearchive(1, sink))
+
+        self.assertEqual(ARCHIVE, sink.getvalue())
+
+    @responses.activate
+    def test_uses_server_file_name(self):
+        responses.add(responses.GET, self.url, body=ARCHIVE, status=200,
+                      adding_headers={'content-disposition': 'attachment; filename="project.tar.gz"'})
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            self.assertTrue(self.gitlab.getfilearchive(1))
+        finally:
+            os.chdir(cwd)
+
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, 'project.tar.gz')))
+
+    @responses.activate
+    def test_resume_with_range(self):
+        responses.add_callback(responses.GET, self.url, callback=self.ranged)
+        self.partial(ARCHIVE[:3000], '"v1"')
+        progress = []
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True,
+                                                   progress=lambda done, total: progress.append((done, total))))
+
+        self.assertEqual('bytes=3000-', responses.calls[0].request.headers['Range'])
+        self.assertEqual('"v1"', responses.calls[0].request.headers['If-Range'])
+        self.assertEqual(ARCHIVE, self.saved())
+        self.assertEqual((10000, 10000), progress[-1])
+
+    @responses.activate
+    def test_resume_complete_file(self):
+        responses.add_callback(responses.GET, self.url, callback=self.ranged)
+        self.partial(ARCHIVE, '"v1"')
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True))
+
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_resume_changed_archive_rewrites(self):
+        responses.add_callback(responses.GET, self.url, callback=self.ranged)
+        self.partial(b'x' * 3000, '"v0"')
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True))
+
+        self.assertEqual(ARCHIVE, self.saved())
+        with open(self.path + '.validator') as handle:
+            self.assertEqual('"v1"', handle.read())
+
+    @responses.activate
+    def test_resume_without_validator_restarts(self):
+        responses.add_callback(responses.GET, self.url, callback=self.ranged)
+        self.partial(ARCHIVE[:3000])
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True))
+
+        self.assertNotIn('Range', responses.calls[0].request.headers)
+        self.assertEqual(ARCHIVE, self.saved())
+        self.assertTrue(os.path.isfile(self.path + '.validator'))
+
+    @responses.activate
+    def test_resume_with_unexpected_content_range_restarts(self):
+        def misplaced(request):
+            if 'Range' in request.headers:
+                return 206, {'ETag': '"v1"', 'Content-Range': 'bytes 0-9999/10000'}, ARCHIVE
+            return 200, {'ETag': '"v1"'}, ARCHIVE
+
+        responses.add_callback(responses.GET, self.url, callback=misplaced)
+        self.partial(ARCHIVE[:3000], '"v1"')
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True))
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(ARCHIVE, self.saved())
+
+    @responses.activate
+    def test_resume_without_range_support_rewrites(self):
+        responses.add(responses.GET, self.url, body=ARCHIVE, status=200)
+        with open(self.path, 'wb') as archive:
+            archive.write(b'stale')
+
+        self.assertTrue(self.gitlab.getfilearchive(1, self.path, resume=True))
+
+        with open(self.path, 'rb') as archive:
+            self.assertEqual(ARCHIVE, archive.read())
+
+    @responses.activate
+    def test_error_raises(self):
+        responses.add(responses.GET, self.url, json={'message': '404 Project Not Found'}, status=404)
+
+        self.assertRaises(HttpError, self.gitlab.getfilearchive, 1, self.path)
+
+
+class TestRawStream(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.blob_url = self.gitlab.projects_url + '/1/repository/raw_blobs/abc'
+        self.file_url = self.gitlab.projects_url + '/1/repository/blobs/master'
+
+    @responses.activate
+    def test_iterates_chunks(self):
+        responses.add(responses.GET, self.blob_url, body=ARCHIVE, status=200)
+
+        with self.gitlab.getrawblob_stream(1, 'abc', chunk_size=4096) as blob:
+            chunks = list(blob)
+
+        self.assertEqual([4096, 4096, 1808], [len(chunk) for chunk in chunks])
+        self.assertEqual(ARCHIVE, b''.join(chunks))
+
+    @responses.activate
+    def test_read(self):
+        responses.add(responses.GET, self.file_url, body=ARCHIVE, status=200)
+
+        raw = self.gitlab.getrawfile_stream(1, 'master', 'README.md')
+
+        self.assertEqual(ARCHIVE[:10], raw.read(10))
+        self.assertEqual(ARCHIVE[10:], raw.read())
+        self.assertEqual(b'', raw.read())
+        self.assertIn('filepath=README.md', responses.calls[0].request.url)
+
+    @responses.activate
+    def test_copy_to(self):
+        responses.add(responses.GET, self.blob_url, body=ARCHIVE, status=200)
+        sink = io.BytesIO()
+
+        self.assertEqual(10000, self.gitlab.getrawblob_stream(1, 'abc').copy_to(sink))
+        self.assertEqual(ARCHIVE, sink.getvalue())
+
+    @responses.activate
+    def test_error_returns_false(self):
+        responses.add(responses.GET, self.blob_url, json={'message': '404 Not Found'}, status=404)
+
+        self.assertFalse(self.gitlab.getrawblob_stream(1, 'abc'))
+
+
+class TestGetArchiveMembers(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.url = self.gitlab.projects_url + '/1/repository/archive'
+
+        files = {'README.md': b'readme', 'setup.py': b'setup()', 'gitlab/base.py': b'class Base'}
+        body = io.BytesIO()
+        with tarfile.open(fileobj=body, mode='w:gz') as archive:
+            directory = tarfile.TarInfo('project-master-abc')
+            directory.type = tarfile.DIRTYPE
+            archive.addfile(directory)
+            for path, content in sorted(files.items()):
+                info = tarfile.TarInfo('project-master-abc/' + path)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        self.archive = body.getvalue()
+
+    @responses.activate
+    def test_yields_files(self):
+        responses.add(responses.GET, self.url, body=self.archive, status=200)
+
+        members = [(path, fileobj.read()) for path, fileobj in self.gitlab.getarchivemembers(1, sha='abc')]
+
+        self.assertEqual([('README.md', b'readme'), ('gitlab/base.py', b'class Base'), ('setup.py', b'setup()')],
+                         members)
+        self.assertIn('sha=abc', responses.calls[0].request.url)
+
+    @responses.activate
+    def test_filters_by_glob(self):
+        responses.add(responses.GET, self.url, body=self.archive, status=200)
+
+        paths = [path for path, _ in self.gitlab.getarchivemembers(1, patterns=['*.py'])]
+
+        self.assertEqual(['gitlab/base.py', 'setup.py'], paths)
+
+    @responses.activate
+    def test_error_raises(self):
+        responses.add(responses.GET, self.url, json={'message': '404 Project Not Found'}, status=404)
+
+        self.assertRaises(HttpError, list, self.gitlab.getarchivemembers(1))
+
+
+class TestStreamingUploads(unittest.TestCase):
+    def setUp(self):
+        self.content = b''.join(bytes(bytearray([index % 256])) for index in range(200000))
+
+    def test_createfile_streams_file_object(self):
+        routes = {('POST', '/api/v3/projects/1/repository/files'): (201, {}, {'file_path': 'big.bin'})}
+        with StubServer(routes) as server:
+            gitlab = Gitlab(server.url, token='secret')
+            self.assertTrue(gitlab.createfile(1, 'big.bin', 'master', 'text', io.BytesIO(self.content), 'Add'))
+
+        request = server.requests[0]
+        body = json.loads(request['body'].decode('utf-8'))
+        self.assertEqual('chunked', request['headers']['Transfer-Encoding'])
+        self.assertEqual('application/json', request['headers']['Content-Type'])
+        self.assertEqual('base64', body['encoding'])
+        self.assertEqual(self.content, base64.b64decode(body['content']))
+        self.assertEqual('master', body['branch_name'])
+
+    def test_updatefile_streams_iterator(self):
+        routes = {('PUT', '/api/v3/projects/1/repository/files'): (200, {}, {'file_path': 'big.bin'})}
+        chunks = (self.content[start:start + 1000] for start in range(0, len(self.content), 1000))
+        with StubServer(routes) as server:
+            gitlab = Gitlab(server.url, token='secret')
+            self.assertTrue(gitlab.updatefile(1, 'big.bin', 'master', chunks, 'Update'))
+
+        body = json.loads(server.requests[0]['body'].decode('utf-8'))
+        self.assertEqual(self.content, base64.b64decode(body['content']))
+
+    def test_createsnippet_streams_text(self):
+        code = u'print("caf\xe9")\n' * 5000
+        routes = {('POST', '/api/v3/projects/1/snippets'): (201, {}, {'id': 3})}
+        with StubServer(routes) as server:
+            gitlab = Gitlab(server.url, token='secret')
+            source = io.BytesIO(code.encode('utf-8'))
+            self.assertEqual({'id': 3}, gitlab.createsnippet(1, 'title', 'file.py', source))
+
+        body = json.loads(server.requests[0]['body'].decode('utf-8'))
+        self.assertEqual(code, body['code'])
+        self.assertEqual(0, body['visibility_level'])
+
+    def test_text_content_keeps_split_characters(self):
+        encoded = u'\xe9\u20ac"\n'.encode('utf-8')
+        text = b''.join(TextContent(io.BytesIO(encoded), chunk_size=1)).decode('utf-8')
+
+        self.assertEqual(u'\xe9\u20ac"\n', json.loads(u'"' + text + u'"'))
+
+    @responses.activate
+    def test_plain_content_is_still_form_encoded(self):
+        url = 'http://localhost:10080/api/v3/projects/1/repository/files'
+        responses.add(responses.POST, url, json={}, status=201)
+
+        Gitlab('http://localhost:10080', token='secret').createfile(1, 'a.txt', 'master', 'text', 'hello', 'Add')
+
+        self.assertIn('content=hello', responses.calls[0].request.body)
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_any_chunking(self):
+        document = json.dumps([{'title': 'a, "quoted" ]} \\ title', 'labels': ['x', {'y': None}]}, 3, 'text', [],
+                               {}, u'caf\xe9']).encode('utf-8')
+        for size in (1, 2, 5, 64, 4096):
+            chunks = [document[start:start + size] for start in range(0, len(document), size)]
+            self.assertEqual(json.loads(document.decode('utf-8')), list(iter_json_array(chunks)))
+
+    def test_yields_before_the_end(self):
+        received = []
+
+        def chunks():
+            yield b'[{"id": 1},'
+            received.append('second chunk')
+            yield b' {"id": 2}]'
+
+        elements = iter_json_array(chunks())
+
+        self.assertEqual({'id': 1}, next(elements))
+        self.assertEqual([], received)
+        self.assertEqual([{'id': 2}], list(elements))
+
+    def test_invalid_documents(self):
+        self.assertRaises(ValueError, list, iter_json_array([b'{"message": "404 Not found"}']))
+        self.assertRaises(ValueError, list, iter_json_array([b'[{"id": 1}, {"id"']))
+        self.assertEqual([], list(iter_json_array([b' [ ] '])))
+
+    def test_trailing_comma(self):
+        self.assertRaises(ValueError, list, iter_json_array([b'[1,]']))
+        self.assertRaises(ValueError, list, iter_json_array([b'[{"id": 1},', b' ]']))
+        self.assertEqual([[1]], list(iter_json_array([b'[[1]]'])))
+
+    def test_extra_data(self):
+        self.assertRaises(ValueError, list, iter_json_array([b'[1] x']))
+        self.assertRaises(ValueError, list, iter_json_array([b'[1]', b' ', b'[2]']))
+        self.assertEqual([1], list(iter_json_array([b'[1]', b' \n'])))
+
+
+class TestStreamedListings(unittest.TestCase):
+    def setUp(self):
+        self.gitlab = Gitlab('http://localhost:10080', token='secret')
+        self.url = self.gitlab.projects_url + '/1/issues'
+
+    @responses.activate
+    def test_method_returns_generator(self):
+        responses.add(responses.GET, self.url, json=[{'id': 1}, {'id': 2}], status=200)
+
+        issues = self.gitlab.getprojectissues(1, stream=True)
+
+        self.assertNotIsInstance(issues, list)
+        self.assertEqual([{'id': 1}, {'id': 2}], list(issues))
+        self.assertNotIn('stream', responses.calls[0].request.url)
+
+    @responses.activate
+    def test_getall_with_stream(self):
+        responses.add(responses.GET, self.url, json=[{'id': 1}, {'id': 2}], status=200)
+        responses.add(responses.GET, self.url, json=[{'id': 3}], status=200)
+        responses.add(responses.GET, self.url, json=[], status=200)
+
+        issues = list(Gitlab.getall(self.gitlab.getprojectissues, project_id=1, per_page=2, stream=True))
+
+        self.assertEqual([1, 2, 3], [issue['id'] for issue in issues])
+        self.assertEqual(3, len(responses.calls))
+
+    @responses.activate
+    def test_error_returns_false(self):
+        responses.add(responses.GET, self.url, json={'message': '404 Project Not Found'}, status=404)
+
+        self.assertFalse(self.gitlab.getprojectissues(1, stream=True))
+
+    def test_errors_release_the_connection(self):
+        routes = {
+            ('GET', '/api/v3/projects/1/issues'): (500, {}, {'message': '500 Internal Server Error'}),
+            ('GET', '/api/v3/projects/1/merge_requests'): (500, {}, {'message': '500 Internal Server Error'}),
+            ('GET', '/api/v3/projects/1/repository/commits'): (500, {}, {'message': '500 Internal Server Error'}),
+            ('GET', '/api/v3/projects/1/issues/1'): (200, {}, {'id': 1}),
+        }
+        results = []
+        with StubServer(routes) as server:
+            gitlab = Gitlab(server.url, token='secret', pool_maxsize=1, pool_block=True)
+
+            def calls():
+                results.append(gitlab.getprojectissues(1, stream=True))
+                results.append(gitlab.getmergerequests(1, stream=True))
+                results.append(gitlab.getrepositorycommits(1, stream=True))
+                results.append(gitlab.getprojectissue(1, 1))
+
+            thread = threading.Thread(target=calls)
+            thread.daemon = True
+            thread.start()
+            thread.join(5)
+
+        self.assertEqual([False, False, False, {'id': 1}], results)
@@ -5,9 +5,13 @@ setup(
     name = "pyapi-gitlab",
     version = "7.8.6",
     packages = find_packages(),
-    install_requires = ['requests'],
+    install_requires = ['requests', 'futures; python_version < "3.2"'],
     extras_require = {
-        'markdown':  ["markdown"]
+        'markdown':  ["markdown"],
+        'async': ['aiohttp; python_version >= "3.7"'],
+        'fast-json': ["orjson"],
+        'arrow': ["pyarrow"],
+        'numpy': ["numpy"]
     },
     # metadata for upload to PyPI
     author = "Itxaka Serrano Garcia",